@@ -1,11 +1,22 @@
-from datetime import datetime
-from typing import Dict, Any
+from datetime import date, datetime
+from decimal import Decimal
+from importlib import import_module
+from typing import Dict, Any, Iterator, List, Tuple
 
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from adv.adv_repository.models import AdvModel
-from adv.adv_service.adv import Adv
+from adv.adv_repository.models import AdvDailySpendModel, AdvModel
+from adv.adv_service.adv import Adv, AdvRow
+from common.pagination import apply_keyset, split_page
+
+
+# insert ... on conflict диалекта; модуль диалекта загружает сам движок
+_UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+# Колонки adv, от которых зависит свод расходов adv_daily_spend
+_SPEND_COLUMNS = frozenset(("chanel", "product_id", "created_at", "cost"))
 
 
 class AdvRepository:
@@ -18,9 +29,15 @@ class AdvRepository:
                     возвращают модели БД
     """
 
+    EXPORT_COLUMNS = ("id", "name", "chanel", "cost", "created_at", "product_id")
+
     def __init__(self, session: Session):
         self.session = session
 
+    def _select_rows(self):
+        """SELECT колонок AdvRow без загрузки ORM-объектов."""
+        return select(*(getattr(AdvModel, column) for column in AdvRow.__slots__))
+
     def _get(self, id_: int) -> AdvModel | None:
         try:
             return self.session.query(AdvModel).filter(AdvModel.id == id_).first()
@@ -36,9 +53,9 @@ class AdvRepository:
         since: datetime | None,
         sort_order: str = "asc",
         **filters,
-    ):
+    ) -> List[AdvRow]:
         try:
-            query = self.session.query(AdvModel)
+            query = self._select_rows()
             if since is not None:
                 query = query.filter(AdvModel.created_at >= since)
             if filters:
@@ -56,16 +73,104 @@ class AdvRepository:
                 query = query.limit(limit)
             if offset is not None:
                 query = query.offset(offset)
-            ads = query.all()
-            return [Adv(**adv.dict()) for adv in ads]
+            return [AdvRow(*row) for row in self.session.execute(query)]
         except SQLAlchemyError as e:
             print(f"Error getting ads: {e}")
             return []
 
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort_field: str | None = None,
+        since: datetime | None = None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> Tuple[List[AdvRow], str | None]:
+        """Страница списка по курсору и курсор следующей страницы."""
+        try:
+            query = self._select_rows()
+            if since is not None:
+                query = query.filter(AdvModel.created_at >= since)
+            if filters:
+                query = query.filter_by(**filters)
+            query, sort_field, sort_order = apply_keyset(
+                query, AdvModel, sort_field, sort_order, cursor
+            )
+            records = [
+                AdvRow(*row) for row in self.session.execute(query.limit(limit + 1))
+            ]
+            return split_page(records, limit, sort_field, sort_order)
+        except SQLAlchemyError as e:
+            print(f"Error getting ads: {e}")
+            return [], None
+
+    def stream_rows(
+        self, batch_size: int = 1000, since: datetime | None = None, **filters
+    ) -> Iterator[Tuple]:
+        """
+        Построчно отдает кортежи EXPORT_COLUMNS без создания ORM-объектов.
+        Строки читаются с сервера пачками по batch_size.
+        """
+        query = select(*(getattr(AdvModel, column) for column in self.EXPORT_COLUMNS))
+        if since is not None:
+            query = query.where(AdvModel.created_at >= since)
+        query = (
+            query.filter_by(**filters)
+            .order_by(AdvModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in self.session.execute(query):
+            yield tuple(row)
+
+    def _add_spend(
+        self, chanel: str, product_id: int, day: date, cost: Decimal, count: int
+    ) -> None:
+        """Прибавляет cost и count к строке свода (chanel, product_id, day)."""
+        table = AdvDailySpendModel.__table__
+        key = {"chanel": chanel, "product_id": product_id, "day": day}
+        dialect = self.session.get_bind().dialect.name
+        if dialect in _UPSERT_DIALECTS:
+            upsert_insert = import_module(f"sqlalchemy.dialects.{dialect}").insert
+            statement = upsert_insert(table).values(
+                **key, total_cost=cost, ads_count=count
+            )
+            self.session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[table.c.chanel, table.c.product_id, table.c.day],
+                    set_={
+                        "total_cost": table.c.total_cost
+                        + statement.excluded.total_cost,
+                        "ads_count": table.c.ads_count + statement.excluded.ads_count,
+                    },
+                )
+            )
+            return
+        result = self.session.execute(
+            update(table)
+            .where(*(table.c[column] == value for column, value in key.items()))
+            .values(
+                total_cost=table.c.total_cost + cost,
+                ads_count=table.c.ads_count + count,
+            )
+        )
+        if result.rowcount == 0:
+            self.session.execute(
+                insert(table).values(**key, total_cost=cost, ads_count=count)
+            )
+
     def add(self, adv: Dict[str, Any]) -> Adv | None:
         try:
             record = AdvModel(**adv)
             self.session.add(record)
+            self.session.flush()
+            self._add_spend(
+                record.chanel,
+                record.product_id,
+                record.created_at.date(),
+                record.cost,
+                1,
+            )
             return Adv(**record.dict(), adv_=record)
 
         except SQLAlchemyError as e:
@@ -83,21 +188,127 @@ class AdvRepository:
             return None
 
     def update(self, id_: int, new_adv: dict[str, Any]) -> Adv | None:
+        """
+        Обновляет объявление через UPDATE ... RETURNING, None если не найдено.
+
+        Изменение без колонок свода (_SPEND_COLUMNS) - один запрос.
+        Иначе свод расходов требует прежних ключа и стоимости: SELECT ... FOR
+        UPDATE, UPDATE и одна-две правки свода, всего 3-4 запроса. Это плата
+        за согласованный в той же транзакции adv_daily_spend: RETURNING
+        в SQLite не отдает значения до изменения, а DML в CTE и триггеры
+        пришлось бы писать отдельно для каждой СУБД.
+        """
         try:
-            record = self._get(id_)
-            if record is None:
+            if not _SPEND_COLUMNS.intersection(new_adv):
+                record = self.session.scalars(
+                    update(AdvModel)
+                    .where(AdvModel.id == id_)
+                    .values(**new_adv, version=AdvModel.version + 1)
+                    .returning(AdvModel),
+                    execution_options={"synchronize_session": False},
+                ).first()
+                return Adv(**record.dict()) if record is not None else None
+            old = self.session.execute(
+                select(
+                    AdvModel.chanel,
+                    AdvModel.product_id,
+                    AdvModel.created_at,
+                    AdvModel.cost,
+                )
+                .where(AdvModel.id == id_)
+                .with_for_update()
+            ).first()
+            if old is None:
                 return None
-            for key, val in new_adv.items():
-                setattr(record, key, val)
+            record = self.session.scalars(
+                update(AdvModel)
+                .where(AdvModel.id == id_)
+                .values(**new_adv, version=AdvModel.version + 1)
+                .returning(AdvModel),
+                execution_options={"synchronize_session": False},
+            ).first()
+            old_key = (old.chanel, old.product_id, old.created_at.date())
+            new_key = (record.chanel, record.product_id, record.created_at.date())
+            if old_key == new_key:
+                if record.cost != old.cost:
+                    self._add_spend(*new_key, record.cost - old.cost, 0)
+            else:
+                self._add_spend(*old_key, -old.cost, -1)
+                self._add_spend(*new_key, record.cost, 1)
             return Adv(**record.dict())
         except SQLAlchemyError as e:
-            print(f"Error adding adv: {e}")
+            print(f"Error updating adv: {e}")
             return None
 
-    def delete(self, id_: int) -> None:
+    def delete(self, id_: int) -> Adv | None:
+        """Удаляет объявление одним DELETE ... RETURNING и возвращает удаленное."""
         try:
-            record = self._get(id_)
-            if record:
-                self.session.delete(record)
+            record = self.session.scalars(
+                delete(AdvModel).where(AdvModel.id == id_).returning(AdvModel),
+                execution_options={"synchronize_session": False},
+            ).first()
+            if record is None:
+                return None
+            self._add_spend(
+                record.chanel,
+                record.product_id,
+                record.created_at.date(),
+                -record.cost,
+                -1,
+            )
+            return Adv(**record.dict())
         except SQLAlchemyError as e:
             print(f"Error deleting adv: {e}")
+            return None
+
+    def get_spend_stats(
+        self,
+        chanel: str | None = None,
+        product_id: int | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Расходы по (chanel, product_id, day) из свода, без чтения таблицы adv."""
+        query = select(
+            AdvDailySpendModel.chanel,
+            AdvDailySpendModel.product_id,
+            AdvDailySpendModel.day,
+            AdvDailySpendModel.total_cost,
+            AdvDailySpendModel.ads_count,
+        ).where(AdvDailySpendModel.ads_count > 0)
+        if chanel is not None:
+            query = query.where(AdvDailySpendModel.chanel == chanel)
+        if product_id is not None:
+            query = query.where(AdvDailySpendModel.product_id == product_id)
+        if date_from is not None:
+            query = query.where(AdvDailySpendModel.day >= date_from)
+        if date_to is not None:
+            query = query.where(AdvDailySpendModel.day <= date_to)
+        query = query.order_by(
+            AdvDailySpendModel.day,
+            AdvDailySpendModel.chanel,
+            AdvDailySpendModel.product_id,
+        )
+        try:
+            return [dict(row._mapping) for row in self.session.execute(query)]
+        except SQLAlchemyError as e:
+            print(f"Error getting adv spend stats: {e}")
+            return []
+
+    def rebuild_spend_stats(self) -> int:
+        """Пересчитывает свод расходов по таблице adv, возвращает число строк свода."""
+        day = func.date(AdvModel.created_at)
+        self.session.execute(delete(AdvDailySpendModel))
+        self.session.execute(
+            insert(AdvDailySpendModel).from_select(
+                ["chanel", "product_id", "day", "total_cost", "ads_count"],
+                select(
+                    AdvModel.chanel,
+                    AdvModel.product_id,
+                    day,
+                    func.sum(AdvModel.cost),
+                    func.count(AdvModel.id),
+                ).group_by(AdvModel.chanel, AdvModel.product_id, day),
+            )
+        )
+        return self.session.scalar(select(func.count()).select_from(AdvDailySpendModel))
@@ -1,6 +1,6 @@
-from datetime import datetime, UTC
+from datetime import date, datetime, UTC
 from decimal import Decimal
-from sqlalchemy import String, Numeric, DateTime, Integer
+from sqlalchemy import String, Numeric, Date, DateTime, Integer
 
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -21,8 +21,14 @@ class AdvModel(Base):
     name: Mapped[str] = mapped_column(String(30), nullable=False)
     cost: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     chanel: Mapped[str] = mapped_column(String(30), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now(UTC))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(UTC)
+    )
     product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Увеличивается каждым UPDATE, по ней считаются ETag
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
 
     def __repr__(self) -> str:
         return f"Advertisement(id={self.id!r}, name={self.name!r}, cost={self.cost!r}, chanel={self.chanel!r}, created_at={self.created_at!r})"
@@ -35,6 +41,7 @@ class AdvModel(Base):
             "chanel": self.chanel,
             "created_at": self.created_at,
             "product_id": self.product_id,
+            "version": self.version,
         }
 
     def formatted_cost(self) -> str:
@@ -56,3 +63,32 @@ class AdvModel(Base):
         if not value:
             raise ValueError("Name must not be empty")
         return value
+
+
+class AdvDailySpendModel(Base):
+    """
+    Свод расходов на рекламу по (chanel, product_id, day).
+    Обновляется AdvRepository в той же транзакции, что и таблица adv.
+    """
+
+    __tablename__ = "adv_daily_spend"
+
+    chanel: Mapped[str] = mapped_column(String(30), primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    total_cost: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False, default=0
+    )
+    ads_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"AdvDailySpend(chanel={self.chanel!r}, product_id={self.product_id!r}, day={self.day!r}, total_cost={self.total_cost!r})"
+
+    def dict(self):
+        return {
+            "chanel": self.chanel,
+            "product_id": self.product_id,
+            "day": self.day,
+            "total_cost": str(self.total_cost),
+            "ads_count": self.ads_count,
+        }
@@ -1,22 +1,23 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from adv.web.config import BaseConfig
+from flask import current_app
 
 
 class UnitOfWork:
-    def __init__(self, engine=BaseConfig.SQLALCHEMY_DATABASE_URI):
-        self.session_maker = sessionmaker(bind=create_engine(engine))
+    """
+    Единица работы поверх сессии запроса.
+    Сессия берется из app.db_session и закрывается в teardown_appcontext.
+    """
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory
 
     def __enter__(self):
-        self.session = self.session_maker()
+        session_factory = self.session_factory or current_app.db_session
+        self.session = session_factory()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is not None:
             self.rollback()
-            self.session.close()
-        self.session.close()
 
     def commit(self):
         self.session.commit()
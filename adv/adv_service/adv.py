@@ -1,5 +1,7 @@
 class Adv:
-    def __init__(self, id, name, chanel, cost, created_at, product_id, adv_=None):
+    def __init__(
+        self, id, name, chanel, cost, created_at, product_id, version=None, adv_=None
+    ):
         self._adv = adv_
         self._id = id
         self.name = name
@@ -7,6 +9,7 @@ class Adv:
         self.cost = cost
         self._created_at = created_at
         self.product_id = product_id
+        self._version = version
 
     @property
     def id(self):
@@ -16,6 +19,10 @@ class Adv:
     def created_at(self):
         return self._created_at or self._adv.created_at
 
+    @property
+    def version(self):
+        return self._version or self._adv.version
+
     def dict(self):
         return {
             "id": self.id,
@@ -25,3 +32,30 @@ class Adv:
             "created_at": self.created_at,
             "product_id": self.product_id,
         }
+
+
+class AdvRow:
+    """
+    Компактная строка списка объявлений, заполняется прямо из кортежа колонок.
+    Только для чтения, схема ответа читает атрибуты без промежуточного dict.
+    """
+
+    __slots__ = ("id", "name", "chanel", "cost", "created_at", "product_id")
+
+    def __init__(self, id, name, chanel, cost, created_at, product_id):
+        self.id = id
+        self.name = name
+        self.chanel = chanel
+        self.cost = cost
+        self.created_at = created_at
+        self.product_id = product_id
+
+    def dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "chanel": self.chanel,
+            "cost": str(self.cost),
+            "created_at": self.created_at,
+            "product_id": self.product_id,
+        }
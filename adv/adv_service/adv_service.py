@@ -16,16 +16,15 @@ class AdvService:
         raise AdvNotNotFoundError(f"Advertisement with id {adv_id} is not found")
 
     def update_adv(self, adv_id, item):
-        adv = self.adv_repository.get(adv_id)
+        adv = self.adv_repository.update(adv_id, item)
         if adv is None:
             raise AdvNotNotFoundError(f"Advertisement with id {adv_id} is not found")
-        return self.adv_repository.update(adv_id, item)
+        return adv
 
     def delete_adv(self, adv_id):
-        adv = self.adv_repository.get(adv_id)
+        adv = self.adv_repository.delete(adv_id)
         if adv is None:
             raise AdvNotNotFoundError(f"Advertisement with id {adv_id} is not found")
-        self.adv_repository.delete(adv_id)
 
     def list_ads(self, **filters):
         limit = filters.pop("limit")
@@ -42,3 +41,28 @@ class AdvService:
             since=since,
             **filters,
         )
+
+    def list_ads_page(self, **filters):
+        limit = filters.pop("limit")
+        cursor = filters.pop("cursor", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+        since = filters.pop("since", None)
+
+        return self.adv_repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            since=since,
+            **filters,
+        )
+
+    def export_ads(self, batch_size=1000, **filters):
+        return self.adv_repository.stream_rows(batch_size=batch_size, **filters)
+
+    def get_spend_stats(self, **filters):
+        return self.adv_repository.get_spend_stats(**filters)
+
+    def rebuild_spend_stats(self):
+        return self.adv_repository.rebuild_spend_stats()
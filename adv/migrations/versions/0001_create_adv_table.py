@@ -0,0 +1,38 @@
+"""create adv table
+
+Исходная схема таблицы adv. Для БД, созданной ранее без миграций,
+выполните alembic stamp 0001.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "adv",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=30), nullable=False),
+        sa.Column("cost", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("chanel", sa.String(length=30), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("adv")
@@ -0,0 +1,48 @@
+"""create adv_daily_spend
+
+Свод расходов на рекламу по (chanel, product_id, day) для /ads/stats.
+Свод заполняется по уже существующим объявлениям, дальше его обновляет
+AdvRepository в той же транзакции, что и таблицу adv.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:05:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "adv_daily_spend",
+        sa.Column("chanel", sa.String(length=30), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total_cost", sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column("ads_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("chanel", "product_id", "day"),
+    )
+    op.create_index("ix_adv_daily_spend_day", "adv_daily_spend", ["day"])
+    op.execute(
+        """
+        INSERT INTO adv_daily_spend (chanel, product_id, day, total_cost, ads_count)
+        SELECT chanel, product_id, date(created_at), SUM(cost), COUNT(id)
+        FROM adv
+        GROUP BY chanel, product_id, date(created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_adv_daily_spend_day", table_name="adv_daily_spend")
+    op.drop_table("adv_daily_spend")
@@ -0,0 +1,33 @@
+"""add adv version
+
+Версия строки для ETag: начинается с 1 и увеличивается каждым UPDATE
+объявления. Существующие объявления получают версию 1.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:10:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("adv") as batch_op:
+        batch_op.add_column(
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("adv") as batch_op:
+        batch_op.drop_column("version")
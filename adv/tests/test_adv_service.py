@@ -3,6 +3,10 @@ from unittest.mock import MagicMock
 from decimal import Decimal
 from datetime import datetime, timedelta
 
+from sqlalchemy.orm import Session
+
+from adv.adv_repository.adv_repository import AdvRepository
+from adv.adv_repository.models import Base
 from adv.adv_service.adv import Adv
 from adv.adv_service.adv_service import AdvService
 from adv.adv_service.exeptions import AdvNotNotFoundError
@@ -106,12 +110,11 @@ def test_update_adv_updates_adv_if_found_and_returns_updated(
     Тестирует, что update_adv корректно обновляет объявление, если оно найдено,
     и возвращает обновленный объект.
     """
-    mock_adv_repository.get.return_value = adv_get
     mock_adv_repository.update.return_value = adv_update
 
     returned_adv = adv_service.update_adv(1, adv_update)
 
-    mock_adv_repository.get.assert_called_once_with(1)
+    mock_adv_repository.get.assert_not_called()
     mock_adv_repository.update.assert_called_once_with(1, adv_update)
     assert returned_adv == adv_update
 
@@ -122,13 +125,12 @@ def test_update_adv_raises_advnotfind_if_not_found(
     """
     Тестирует, что update_adv выбрасывает AdvNotNotFoundError, если объявление не найдено.
     """
-    mock_adv_repository.get.return_value = None
+    mock_adv_repository.update.return_value = None
 
     with pytest.raises(AdvNotNotFoundError) as e:
         adv_service.update_adv(999, adv_update)
 
-    mock_adv_repository.get.assert_called_once_with(999)
-    mock_adv_repository.update.assert_not_called()
+    mock_adv_repository.update.assert_called_once_with(999, adv_update)
     assert "Advertisement with id 999 is not found" in str(e.value)
 
 
@@ -136,11 +138,11 @@ def test_delete_adv_deletes_adv_if_found(adv_service, mock_adv_repository, adv_g
     """
     Тестирует, что delete_adv корректно удаляет объявление, если оно найдено.
     """
-    mock_adv_repository.get.return_value = adv_get
+    mock_adv_repository.delete.return_value = adv_get
 
     adv_service.delete_adv(1)
 
-    mock_adv_repository.get.assert_called_once_with(1)
+    mock_adv_repository.get.assert_not_called()
     mock_adv_repository.delete.assert_called_once_with(1)
 
 
@@ -148,13 +150,12 @@ def test_delete_adv_raises_advnotfind_if_not_found(adv_service, mock_adv_reposit
     """
     Тестирует, что delete_adv выбрасывает AdvNotNotFoundError, если объявление не найдено.
     """
-    mock_adv_repository.get.return_value = None
+    mock_adv_repository.delete.return_value = None
 
     with pytest.raises(AdvNotNotFoundError) as e:
         adv_service.delete_adv(999)
 
-    mock_adv_repository.get.assert_called_once_with(999)
-    mock_adv_repository.delete.assert_not_called()
+    mock_adv_repository.delete.assert_called_once_with(999)
     assert "Advertisement with id 999 is not found" in str(e.value)
 
 
@@ -206,3 +207,129 @@ def test_list_ads_calls_repository_with_correct_filters_and_returns_list(
     )
     assert len(result) == 1
     assert result[0] == adv_get
+
+
+def test_list_ads_page_passes_cursor_to_repository(
+    adv_service, mock_adv_repository, adv_get
+):
+    """
+    Тестирует, что list_ads_page передает курсор и фильтры в get_page репозитория.
+    """
+    mock_adv_repository.get_page.return_value = ([adv_get], "next-cursor")
+
+    result = adv_service.list_ads_page(
+        limit=10, cursor="cursor", sort_field="cost", sort_order="desc", chanel="VK"
+    )
+
+    mock_adv_repository.get_page.assert_called_once_with(
+        limit=10,
+        cursor="cursor",
+        sort_field="cost",
+        sort_order="desc",
+        since=None,
+        chanel="VK",
+    )
+    assert result == ([adv_get], "next-cursor")
+
+
+def test_get_spend_stats_reads_rollup(adv_service, mock_adv_repository):
+    """
+    Тестирует, что get_spend_stats берет данные из свода репозитория с фильтрами.
+    """
+    mock_adv_repository.get_spend_stats.return_value = []
+
+    result = adv_service.get_spend_stats(chanel="VK", date_from=datetime(2024, 1, 1))
+
+    mock_adv_repository.get_spend_stats.assert_called_once_with(
+        chanel="VK", date_from=datetime(2024, 1, 1)
+    )
+    mock_adv_repository.get_list.assert_not_called()
+    assert result == []
+
+
+@pytest.fixture
+def db_metadata():
+    """Схема сервиса для db_engine из common.pytest_fixtures."""
+    return Base.metadata
+
+
+@pytest.fixture
+def db_session(db_engine):
+    with Session(db_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def db_adv_service(db_session):
+    """AdvService поверх настоящего репозитория и SQLite."""
+    return AdvService(adv_repository=AdvRepository(db_session))
+
+
+@pytest.fixture
+def stored_adv_id(db_adv_service, db_session):
+    adv = db_adv_service.place_adv(
+        {"name": "Budget", "cost": Decimal("10.00"), "chanel": "VK", "product_id": 1}
+    )
+    db_session.commit()
+    return adv.id
+
+
+def test_place_adv_query_budget(db_adv_service, query_budget):
+    """Вставка объявления и свода расходов: INSERT и UPSERT."""
+    with query_budget(2):
+        db_adv_service.place_adv(
+            {
+                "name": "Budget",
+                "cost": Decimal("10.00"),
+                "chanel": "VK",
+                "product_id": 1,
+            }
+        )
+
+
+def test_get_adv_query_budget(db_adv_service, stored_adv_id, query_budget):
+    with query_budget(1):
+        db_adv_service.get_adv(stored_adv_id)
+
+
+def test_update_adv_without_spend_fields_query_budget(
+    db_adv_service, stored_adv_id, query_budget
+):
+    """Изменение, не задевающее свод расходов, - один UPDATE ... RETURNING."""
+    with query_budget(1):
+        updated = db_adv_service.update_adv(stored_adv_id, {"name": "Renamed"})
+    assert (updated.name, updated.version) == ("Renamed", 2)
+
+
+def test_update_adv_query_budget(db_adv_service, stored_adv_id, query_budget):
+    """
+    Чтение прежнего ключа, UPDATE и правка свода для той же группы:
+    свод расходов стоит двух запросов сверх UPDATE ... RETURNING.
+    """
+    with query_budget(3):
+        db_adv_service.update_adv(stored_adv_id, {"cost": Decimal("12.00")})
+
+
+def test_update_adv_moving_group_query_budget(
+    db_adv_service, stored_adv_id, query_budget
+):
+    """Смена канала правит две строки свода."""
+    with query_budget(4):
+        db_adv_service.update_adv(stored_adv_id, {"chanel": "TG"})
+
+
+def test_delete_adv_query_budget(db_adv_service, stored_adv_id, query_budget):
+    with query_budget(2):
+        db_adv_service.delete_adv(stored_adv_id)
+
+
+def test_list_ads_query_budget(db_adv_service, stored_adv_id, query_budget):
+    with query_budget(1):
+        db_adv_service.list_ads(limit=10)
+    with query_budget(1):
+        db_adv_service.list_ads_page(limit=10)
+
+
+def test_get_spend_stats_query_budget(db_adv_service, stored_adv_id, query_budget):
+    with query_budget(1):
+        db_adv_service.get_spend_stats()
@@ -1,6 +1,10 @@
+import json
+
 import pytest
-from adv.adv_repository.models import Base
+
+from adv.adv_repository.models import AdvDailySpendModel, Base
 from adv.web.app import create_app
+from common.query_budget import StatementRecorder
 
 
 @pytest.fixture(scope="session")
@@ -35,6 +39,13 @@ def setup_db(app_context):
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def statements(app_context, setup_db):
+    """Список SQL-запросов, выполненных движком во время теста."""
+    with StatementRecorder(app_context.db_engine) as recorder:
+        yield recorder.statements
+
+
 good_payload = {
     "name": "test_name",
     "chanel": "Google",
@@ -81,6 +92,15 @@ def test_get_adv_success(client, setup_db):
     assert getting_adv["product_id"] == good_payload["product_id"]
 
 
+def test_response_has_server_timing(client, setup_db):
+    created = client.post("/ads", json=good_payload)
+
+    response = client.get(f"/ads/{created.json['id']}")
+
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith('db;desc="1 queries";dur=')
+
+
 def test_update_adv_success(client, setup_db):
     post_response = client.post("/ads", json=good_payload)
     assert post_response.status_code == 201
@@ -121,3 +141,186 @@ def test_delete_ads_success(client, setup_db):
 
     get_response = client.get(f"/products/{post_response.json["id"]}")
     assert get_response.status_code == 404
+
+
+def test_pool_stats_counts_checkouts(app_instance, client, setup_db):
+    client.post("/ads", json=good_payload)
+    client.get("/ads")
+
+    response = client.get("/pool/stats")
+    assert response.status_code == 200
+    stats = response.json
+    assert stats["checkouts"] >= 1
+    assert stats["checkins"] <= stats["checkouts"]
+    assert stats["timeouts"] == 0
+    assert stats["pool_size"] == app_instance.config["SQLALCHEMY_POOL_SIZE"]
+
+
+def test_request_session_is_removed_on_teardown(app_instance, setup_db):
+    with app_instance.app_context():
+        session = app_instance.db_session()
+        assert app_instance.db_session() is session
+    with app_instance.app_context():
+        assert app_instance.db_session() is not session
+
+
+def test_export_ads_ndjson(client, setup_db):
+    client.post("/ads", json=good_payload)
+    client.post("/ads", json=updated_payload)
+
+    response = client.get("/ads/export?format=ndjson&chanel=YouTube")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in response.get_data(as_text=True).split()]
+    assert [record["name"] for record in records] == [updated_payload["name"]]
+    assert records[0]["cost"] == "222.11"
+
+
+def test_export_ads_csv(client, setup_db):
+    client.post("/ads", json=good_payload)
+
+    response = client.get("/ads/export")
+
+    assert response.status_code == 200
+    header, row = response.get_data(as_text=True).splitlines()
+    assert header == "id,name,chanel,cost,created_at,product_id"
+    assert row.split(",")[1:4] == ["test_name", "Google", "111.11"]
+
+
+def test_update_adv_statement_budget(client, statements):
+    created = client.post("/ads", json=good_payload).json
+    statements.clear()
+
+    response = client.put(f"/ads/{created["id"]}", json=updated_payload)
+
+    assert response.status_code == 200
+    assert [statement.split(" ", 2)[:2] for statement in statements] == [
+        ["SELECT", "adv.chanel,"],
+        ["UPDATE", "adv"],
+        ["INSERT", "INTO"],
+        ["INSERT", "INTO"],
+    ]
+    assert all("adv_daily_spend" in statement for statement in statements[2:])
+
+
+def test_update_missing_adv_runs_single_statement(client, statements):
+    response = client.put("/ads/999", json=updated_payload)
+
+    assert response.status_code == 404
+    assert len(statements) == 1
+
+
+def test_delete_adv_statement_budget(client, statements):
+    created = client.post("/ads", json=good_payload).json
+    statements.clear()
+
+    response = client.delete(f"/ads/{created["id"]}")
+    assert response.status_code == 204
+    assert len(statements) == 2
+    assert statements[0].startswith("DELETE FROM adv")
+    assert statements[1].startswith("INSERT INTO adv_daily_spend")
+
+    statements.clear()
+    missing = client.delete(f"/ads/{created["id"]}")
+    assert missing.status_code == 404
+    assert len(statements) == 1
+
+
+def test_list_ads_matches_single_adv_payload(client, setup_db):
+    created = client.post("/ads", json=good_payload).json
+
+    listed = client.get("/ads").json["ads"][0]
+
+    assert listed == client.get(f"/ads/{created["id"]}").json
+
+
+def test_compiled_serializer_returns_identical_bytes(app_instance, client, setup_db):
+    for i in range(12):
+        client.post("/ads", json={**good_payload, "cost": 100 + i / 3})
+    urls = ["/ads?limit=50", "/ads/3"]
+
+    compiled = [client.get(url).data for url in urls]
+    app_instance.config["ADV_COMPILED_SERIALIZER"] = False
+    try:
+        regular = [client.get(url).data for url in urls]
+    finally:
+        app_instance.config["ADV_COMPILED_SERIALIZER"] = True
+
+    assert compiled == regular
+
+
+def test_ads_stats_follow_writes(client, setup_db):
+    first = client.post("/ads", json=good_payload).json
+    client.post("/ads", json={**good_payload, "cost": 10})
+    other = client.post("/ads", json=updated_payload).json
+    day = first["created_at"][:10]
+
+    stats = client.get("/ads/stats").json["stats"]
+    assert stats == [
+        {
+            "chanel": "Google",
+            "product_id": 33,
+            "day": day,
+            "total_cost": "121.11",
+            "ads_count": 2,
+        },
+        {
+            "chanel": "YouTube",
+            "product_id": 11,
+            "day": day,
+            "total_cost": "222.11",
+            "ads_count": 1,
+        },
+    ]
+
+    client.put(f"/ads/{first["id"]}", json={**good_payload, "cost": 1.5})
+    client.delete(f"/ads/{other["id"]}")
+
+    stats = client.get("/ads/stats?chanel=Google").json["stats"]
+    assert [(row["total_cost"], row["ads_count"]) for row in stats] == [("11.50", 2)]
+    assert client.get("/ads/stats?chanel=YouTube").json["stats"] == []
+
+
+def test_backfill_ad_spend_rebuilds_rollup(app_instance, client, setup_db):
+    client.post("/ads", json=good_payload)
+    client.post("/ads", json=updated_payload)
+    expected = client.get("/ads/stats").json
+
+    app_instance.db_session().execute(AdvDailySpendModel.__table__.delete())
+    app_instance.db_session().commit()
+    assert client.get("/ads/stats").json["stats"] == []
+
+    result = app_instance.test_cli_runner().invoke(args=["backfill-ad-spend"])
+
+    assert "adv_daily_spend: 2 rows" in result.output
+    assert client.get("/ads/stats").json == expected
+
+
+def test_get_adv_etag_and_not_modified(client, setup_db):
+    created = client.post("/ads", json=good_payload).json
+    response = client.get(f"/ads/{created['id']}")
+    etag = response.headers["ETag"]
+
+    not_modified = client.get(f"/ads/{created['id']}", headers={"If-None-Match": etag})
+    client.put(f"/ads/{created['id']}", json={**good_payload, "cost": 1.5})
+    changed = client.get(f"/ads/{created['id']}", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert not_modified.data == b""
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json["cost"] == "1.50"
+
+
+def test_compiled_serializer_keeps_etag(app_instance, client, setup_db):
+    created = client.post("/ads", json=good_payload).json
+    etag = client.get(f"/ads/{created['id']}").headers["ETag"]
+    app_instance.config["ADV_COMPILED_SERIALIZER"] = True
+    try:
+        response = client.get(f"/ads/{created['id']}")
+    finally:
+        app_instance.config["ADV_COMPILED_SERIALIZER"] = False
+
+    assert response.headers["ETag"] == etag
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from adv.adv_repository.models import Base
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+# Объявления в базе, созданной до появления свода adv_daily_spend
+ADS = [
+    ("a", "10.50", "VK", "2025-01-01 09:00:00"),
+    ("b", "4.50", "VK", "2025-01-01 18:00:00"),
+    ("c", "7.00", "VK", "2025-01-02 10:00:00"),
+    ("d", "1.00", "TG", "2025-01-01 10:00:00"),
+]
+
+
+def alembic_config(url):
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def test_daily_spend_is_backfilled_from_existing_ads(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO adv (name, cost, chanel, created_at, product_id) "
+                "VALUES (:name, :cost, :chanel, :created_at, 1)"
+            ),
+            [
+                {"name": name, "cost": cost, "chanel": chanel, "created_at": created_at}
+                for name, cost, chanel, created_at in ADS
+            ],
+        )
+
+    command.upgrade(config, "0002")
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT chanel, day, total_cost, ads_count FROM adv_daily_spend "
+                "ORDER BY chanel, day"
+            )
+        ).all()
+    engine.dispose()
+    assert [tuple(row) for row in rows] == [
+        ("TG", "2025-01-01", 1, 1),
+        ("VK", "2025-01-01", 15, 2),
+        ("VK", "2025-01-02", 7, 1),
+    ]
+
+
+def test_existing_ads_get_version_one(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = alembic_config(url)
+    command.upgrade(config, "0002")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO adv (name, cost, chanel, created_at, product_id) "
+                "VALUES ('a', 1, 'VK', '2025-01-01 09:00:00', 1)"
+            )
+        )
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        versions = connection.execute(text("SELECT version FROM adv")).scalars()
+        assert versions.all() == [1]
+    engine.dispose()
+
+
+def test_migrations_match_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "head")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    engine.dispose()
+    assert diff == []
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from adv.web.pool_stats import InstrumentedQueuePool, PoolStats
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Фикстура, предоставляющая движок с пулом из одного соединения без overflow."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.01,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_counts_overflow_and_timeouts(engine):
+    stats = PoolStats().attach(engine)
+
+    first = engine.connect()
+    second = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    snapshot = stats.dict()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["checkins"] == 2
+    assert snapshot["overflow_checkouts"] == 1
+    assert snapshot["peak_checked_out"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checked_out"] == 0
+
+
+def test_pool_stats_survive_dispose(engine):
+    stats = PoolStats().attach(engine)
+    engine.dispose()
+
+    first = engine.connect()
+    second = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    assert stats.dict()["timeouts"] == 1
@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from marshmallow import Schema, fields, post_dump
+
+from adv.adv_service.adv import AdvRow
+from adv.web.api.schemas import GetAdsSchema, GetAdvSchema
+from adv.web.api.serializers import compile_dumper
+
+
+@pytest.fixture
+def ads():
+    """Фикстура объявлений в виде строк, словарей и с пустыми значениями."""
+    return [
+        AdvRow(
+            id=1,
+            name="Adv row",
+            chanel="VK",
+            cost=Decimal("10.5"),
+            created_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            product_id=7,
+        ),
+        {
+            "id": 2,
+            "name": "Adv dict",
+            "chanel": "TG",
+            "cost": "1.005",
+            "created_at": datetime(2024, 5, 2),
+            "product_id": 8,
+        },
+        {"id": 3, "name": "Adv partial", "chanel": "VK", "cost": 2.675},
+        AdvRow(
+            id=4,
+            name="Adv none",
+            chanel="Google",
+            cost=Decimal("3"),
+            created_at=None,
+            product_id=None,
+        ),
+    ]
+
+
+def test_compiled_adv_dump_matches_marshmallow(ads):
+    """Тест скомпилированный дамп объявления совпадает с GetAdvSchema.dump."""
+    dump = compile_dumper(GetAdvSchema)
+
+    for adv in ads:
+        assert dump(adv) == GetAdvSchema().dump(adv)
+
+
+def test_compiled_ads_dump_matches_marshmallow(ads):
+    """Тест скомпилированный дамп списка совпадает с GetAdsSchema.dump."""
+    payload = {"ads": ads, "next_cursor": None}
+
+    assert compile_dumper(GetAdsSchema)(payload) == GetAdsSchema().dump(payload)
+
+
+def test_compiled_dump_falls_back_for_other_fields_and_hooks():
+    """Тест поля без быстрого пути и схемы с хуками сериализуются marshmallow."""
+
+    class OtherSchema(Schema):
+        active = fields.Boolean(data_key="isActive")
+        title = fields.Str(attribute="name", dump_default="untitled")
+        created = fields.DateTime(format="%Y-%m-%d")
+
+    class HookedSchema(Schema):
+        name = fields.Str()
+
+        @post_dump
+        def upper(self, data, **kwargs):
+            return {key: value.upper() for key, value in data.items()}
+
+    for obj in ({"active": 1, "created": datetime(2024, 1, 2)}, {"name": "x"}):
+        assert compile_dumper(OtherSchema)(obj) == OtherSchema().dump(obj)
+    assert compile_dumper(HookedSchema)({"name": "x"}) == {"name": "X"}
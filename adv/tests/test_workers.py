@@ -0,0 +1,46 @@
+import pytest
+
+from adv.adv_repository.models import Base
+from adv.web.api.api import COMPILED_SCHEMAS
+from adv.web.api.serializers import compile_dumper
+from adv.web.app import create_app, warm_up
+from common.forked_workers import run_forked_workers
+
+
+@pytest.fixture
+def app():
+    app = create_app("testing")
+    Base.metadata.create_all(bind=app.db_engine)
+    yield app
+    Base.metadata.drop_all(bind=app.db_engine)
+    app.db_engine.dispose()
+
+
+def test_forked_workers_do_not_share_pooled_connections(app):
+    """Движок, созданный в create_app до fork, сбрасывает пул в воркерах."""
+    client = app.test_client()
+    payload = {"name": "shared", "chanel": "Google", "cost": 1, "product_id": 1}
+    assert client.post("/ads", json=payload).status_code == 201
+
+    def get_ads():
+        response = client.get("/ads")
+        assert response.status_code == 200, response.status_code
+
+    reports = run_forked_workers(app.db_engine, get_ads)
+
+    assert len({report["pid"] for report in reports}) == 3
+    for report in reports:
+        assert report["requests"] == 80
+        assert report["errors"] == []
+        assert report["shared_connections"] == 0
+
+
+def test_warm_up_compiles_serializers_and_closes_parent_pool(app):
+    compile_dumper.cache_clear()
+    with app.db_engine.connect():
+        pass
+
+    warm_up(app)
+
+    assert compile_dumper.cache_info().currsize == len(COMPILED_SCHEMAS)
+    assert app.db_engine.pool.checkedin() == 0
@@ -1,4 +1,4 @@
-from flask import abort
+from flask import Response, abort, current_app, request, stream_with_context
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask_smorest.error_handler import ErrorSchema
@@ -8,14 +8,38 @@ from adv.adv_repository.unit_fo_work import UnitOfWork
 from adv.adv_service.adv_service import AdvService
 from adv.adv_service.exeptions import AdvNotNotFoundError
 from adv.web.api.schemas import (
+    AdSpendStatsParameters,
+    AdSpendStatsSchema,
     GetAdsSchema,
     CreateAdvSchema,
     GetAdvSchema,
     GetAdsParameters,
+    ExportAdsParameters,
 )
+from adv.web.api.serializers import compile_dumper
+from common.etag import etag_matches, resource_etag
+from common.export import EXPORT_FORMATS, buffered, export_lines
+from common.pagination import InvalidCursorError
 
 blueprint = Blueprint("adv", __name__, description="Advertisement API")
 
+# Схемы ответов respond, их планы сериализации компилируются при прогреве
+COMPILED_SCHEMAS = (GetAdsSchema, GetAdvSchema, AdSpendStatsSchema)
+
+
+def respond(schema_class, result, headers=None):
+    """
+    В режиме ADV_COMPILED_SERIALIZER сериализует ответ скомпилированным
+    планом схемы, иначе оставляет дамп flask-smorest.
+    """
+    if current_app.config["ADV_COMPILED_SERIALIZER"]:
+        response = current_app.json.response(compile_dumper(schema_class)(result))
+        response.headers.update(headers or {})
+        return response
+    if headers:
+        return result, headers
+    return result
+
 
 @blueprint.route("/ads")
 class Ads(MethodView):
@@ -25,8 +49,17 @@ class Ads(MethodView):
         with UnitOfWork() as unit_of_work:
             repo = AdvRepository(unit_of_work.session)
             adv_service = AdvService(repo)
-            all_ads = adv_service.list_ads(**parameters)
-        return {"ads": [adv.dict() for adv in all_ads]}
+            if parameters.get("offset"):
+                parameters.pop("cursor", None)
+                all_ads = adv_service.list_ads(**parameters)
+                next_cursor = None
+            else:
+                parameters.pop("offset", None)
+                try:
+                    all_ads, next_cursor = adv_service.list_ads_page(**parameters)
+                except InvalidCursorError as e:
+                    abort(400, description=str(e))
+        return respond(GetAdsSchema, {"ads": all_ads, "next_cursor": next_cursor})
 
     @blueprint.arguments(CreateAdvSchema)
     @blueprint.response(status_code=201, schema=GetAdvSchema)
@@ -40,9 +73,51 @@ class Ads(MethodView):
         return return_payload
 
 
+@blueprint.route("/ads/export")
+class AdsExport(MethodView):
+    @blueprint.arguments(ExportAdsParameters, location="query")
+    def get(self, parameters):
+        """Потоковая выгрузка объявлений, объем памяти не зависит от числа строк."""
+        export_format = parameters.pop("format")
+
+        def rows():
+            with UnitOfWork() as unit_of_work:
+                repo = AdvRepository(unit_of_work.session)
+                adv_service = AdvService(repo)
+                yield from buffered(
+                    export_lines(
+                        export_format,
+                        repo.EXPORT_COLUMNS,
+                        adv_service.export_ads(**parameters),
+                    )
+                )
+
+        return Response(
+            stream_with_context(rows()),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="ads.{export_format}"'
+            },
+        )
+
+
+@blueprint.route("/ads/stats")
+class AdsStats(MethodView):
+    @blueprint.arguments(AdSpendStatsParameters, location="query")
+    @blueprint.response(status_code=200, schema=AdSpendStatsSchema)
+    def get(self, parameters):
+        """Расходы по каналу, продукту и дню из свода adv_daily_spend."""
+        with UnitOfWork() as unit_of_work:
+            repo = AdvRepository(unit_of_work.session)
+            adv_service = AdvService(repo)
+            stats = adv_service.get_spend_stats(**parameters)
+        return respond(AdSpendStatsSchema, {"stats": stats})
+
+
 @blueprint.route("/ads/<adv_id>")
 class Adv(MethodView):
     @blueprint.response(status_code=200, schema=GetAdvSchema)
+    @blueprint.alt_response(status_code=304, description="Not Modified")
     @blueprint.alt_response(status_code=404, schema=ErrorSchema)
     def get(self, adv_id):
         try:
@@ -50,7 +125,10 @@ class Adv(MethodView):
                 repo = AdvRepository(unit_of_work.session)
                 adv_service = AdvService(repo)
                 result = adv_service.get_adv(adv_id)
-            return result.dict()
+            etag = resource_etag(result.id, result.version)
+            if etag_matches(request.headers.get("If-None-Match"), etag):
+                return Response(status=304, headers={"ETag": etag})
+            return respond(GetAdvSchema, result.dict(), {"ETag": etag})
 
         except AdvNotNotFoundError:
             abort(404, description=f"Advertisement with ID='{adv_id}' not found")
@@ -26,6 +26,7 @@ class GetAdsSchema(Schema):
         unknown = EXCLUDE
 
     ads = fields.List(fields.Nested(GetAdvSchema), required=True)
+    next_cursor = fields.Str(allow_none=True)
 
 
 class GetAdsParameters(Schema):
@@ -39,3 +40,36 @@ class GetAdsParameters(Schema):
         load_default="asc", validate=validate.OneOf(["asc", "desc"])
     )
     since = fields.DateTime(format="iso")
+    cursor = fields.Str()
+
+
+class ExportAdsParameters(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    format = fields.Str(load_default="csv", validate=validate.OneOf(["csv", "ndjson"]))
+    chanel = fields.Str()
+    product_id = fields.Int()
+    since = fields.DateTime(format="iso")
+
+
+class AdSpendSchema(Schema):
+    chanel = fields.Str(required=True)
+    product_id = fields.Integer(required=True)
+    day = fields.Date(required=True)
+    total_cost = fields.Decimal(places=2, as_string=True, required=True)
+    ads_count = fields.Integer(required=True)
+
+
+class AdSpendStatsSchema(Schema):
+    stats = fields.List(fields.Nested(AdSpendSchema), required=True)
+
+
+class AdSpendStatsParameters(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    chanel = fields.Str()
+    product_id = fields.Int()
+    date_from = fields.Date()
+    date_to = fields.Date()
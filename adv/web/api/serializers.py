@@ -0,0 +1,127 @@
+"""
+Скомпилированная сериализация ответов по схемам marshmallow.
+
+compile_dumper один раз разбирает схему в план полей: ключ ответа,
+атрибут объекта и функцию преобразования значения. Для Int, Str,
+Decimal, DateTime, Date и Nested преобразование повторяет marshmallow без
+вызова Field.serialize, остальные поля сериализуются самим marshmallow.
+Результат совпадает с Schema.dump.
+"""
+
+import decimal
+from functools import lru_cache
+from typing import Any, Callable
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import get_value
+
+
+def _accessor(obj: Any) -> Callable[[str, Any], Any]:
+    """Функция чтения атрибута, выбранная один раз на объект, как в get_value."""
+    if type(obj) is dict:
+        return obj.get
+    if not hasattr(obj, "__getitem__"):
+        return lambda attr, default: getattr(obj, attr, default)
+    return lambda attr, default: get_value(obj, attr, default)
+
+
+def _int(field: fields.Integer) -> Callable:
+    if field.as_string:
+        return lambda value: str(int(value))
+    return int
+
+
+def _decimal(field: fields.Decimal) -> Callable:
+    places, rounding, as_string = field.places, field.rounding, field.as_string
+    allow_nan = field.allow_nan
+
+    def convert(value):
+        num = decimal.Decimal(str(value))
+        if allow_nan and num.is_nan():
+            num = decimal.Decimal("NaN")
+        elif places is not None and num.is_finite():
+            num = num.quantize(places, rounding=rounding)
+        return format(num, "f") if as_string else num
+
+    return convert
+
+
+def _temporal(field: fields.DateTime | fields.Date) -> Callable:
+    data_format = field.format or field.DEFAULT_FORMAT
+    format_func = field.SERIALIZATION_FUNCS.get(data_format)
+    if format_func is not None:
+        return format_func
+    return lambda value: value.strftime(data_format)
+
+
+def _nested(field: fields.Nested) -> Callable | None:
+    schema = field.schema
+    dump = _compile(schema)
+    if schema.many or field.many:
+        return lambda value: [dump(item) for item in value]
+    return dump
+
+
+def _list(field: fields.List) -> Callable | None:
+    inner = _converter(field.inner)
+    if inner is None:
+        return None
+    return lambda value: [None if item is None else inner(item) for item in value]
+
+
+def _converter(field: fields.Field) -> Callable | None:
+    """Быстрое преобразование значения поля или None, если его нет."""
+    field_type = type(field)
+    if field_type is fields.Integer:
+        return _int(field)
+    if field_type is fields.String:
+        return str
+    if field_type is fields.Decimal:
+        return _decimal(field)
+    if field_type is fields.DateTime or field_type is fields.Date:
+        return _temporal(field)
+    if field_type is fields.Nested:
+        return _nested(field)
+    if field_type is fields.List:
+        return _list(field)
+    return None
+
+
+def _compile(schema: Schema) -> Callable[[Any], dict]:
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        return lambda obj: schema.dump(obj, many=False)
+
+    plan = []
+    for name, field in schema.dump_fields.items():
+        key = field.data_key if field.data_key is not None else name
+        attr = field.attribute if field.attribute is not None else name
+        convert = _converter(field) if "." not in attr else None
+        plan.append((key, name, attr, field, convert))
+
+    def dump(obj):
+        get = _accessor(obj)
+        result = {}
+        for key, name, attr, field, convert in plan:
+            if convert is None:
+                value = field.serialize(name, obj, accessor=schema.get_attribute)
+                if value is missing:
+                    continue
+                result[key] = value
+                continue
+            value = get(attr, missing)
+            if value is missing:
+                default = field.dump_default
+                value = default() if callable(default) else default
+                if value is missing:
+                    continue
+            result[key] = None if value is None else convert(value)
+        return result
+
+    return dump
+
+
+@lru_cache(maxsize=None)
+def compile_dumper(schema_class: type[Schema]) -> Callable[[Any], dict]:
+    """Возвращает функцию obj -> dict, эквивалентную schema_class().dump(obj)."""
+    return _compile(schema_class())
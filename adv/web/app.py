@@ -5,12 +5,42 @@
 import os
 
 from dotenv import load_dotenv
-from flask import Flask
+from flask import Flask, jsonify
+from flask.globals import app_ctx
 from flask_smorest import Api
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
 
-from adv.web.api.api import blueprint
+from adv.web.api.api import COMPILED_SCHEMAS, blueprint
+from adv.web.api.serializers import compile_dumper
+from adv.web.commands import backfill_ad_spend
 from adv.web.config import config_by_name
+from adv.web.pool_stats import InstrumentedQueuePool, PoolStats
+from common.database import reset_pool_after_fork
+from common.instrumentation import instrument_engine, instrument_flask
+
+
+def _engine_options(config) -> dict:
+    options = {
+        "echo": config.get("SQLALCHEMY_ECHO", False),
+        "pool_recycle": config["SQLALCHEMY_POOL_RECYCLE"],
+    }
+    url = make_url(config["SQLALCHEMY_DATABASE_URL"])
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config["SQLALCHEMY_POOL_SIZE"],
+        max_overflow=config["SQLALCHEMY_MAX_OVERFLOW"],
+        pool_timeout=config["SQLALCHEMY_POOL_TIMEOUT"],
+    )
+    return options
+
+
+def _app_ctx_id() -> int:
+    """Ключ сессии: одна сессия на контекст приложения (запрос)."""
+    return id(app_ctx._get_current_object())
 
 
 def create_app(config_name=None):
@@ -30,9 +60,23 @@ def create_app(config_name=None):
 
     engine = create_engine(
         app.config["SQLALCHEMY_DATABASE_URL"],
+        **_engine_options(app.config),
     )
 
-    app.db_engine = engine
+    app.db_engine = reset_pool_after_fork(instrument_engine(engine))
+    app.pool_stats = PoolStats().attach(engine)
+    app.db_session = scoped_session(sessionmaker(bind=engine), scopefunc=_app_ctx_id)
+
+    @app.teardown_appcontext
+    def remove_db_session(exception=None):
+        app.db_session.remove()
+
+    @app.get("/pool/stats")
+    def pool_stats():
+        return jsonify(app.pool_stats.dict())
+
+    app.cli.add_command(backfill_ad_spend)
+    instrument_flask(app, service="adv")
 
     adv_api = Api(app)
 
@@ -40,6 +84,18 @@ def create_app(config_name=None):
     return app
 
 
+def warm_up(app: Flask) -> None:
+    """
+    Прогрев мастер-процесса перед fork воркеров: планы сериализации
+    ответов компилируются один раз и наследуются воркерами. Соединения
+    мастера закрываются, воркеры открывают свои.
+    """
+    if app.config["ADV_COMPILED_SERIALIZER"]:
+        for schema_class in COMPILED_SCHEMAS:
+            compile_dumper(schema_class)
+    app.db_engine.dispose()
+
+
 if __name__ == "__main__":
     app = create_app()
     app.run(debug=app.config["DEBUG"])
@@ -0,0 +1,21 @@
+"""
+Команды Flask CLI сервиса Advertisement
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from adv.adv_repository.adv_repository import AdvRepository
+from adv.adv_repository.unit_fo_work import UnitOfWork
+from adv.adv_service.adv_service import AdvService
+
+
+@click.command("backfill-ad-spend")
+@with_appcontext
+def backfill_ad_spend():
+    """Пересчитывает свод расходов adv_daily_spend по таблице adv."""
+    with UnitOfWork() as unit_of_work:
+        adv_service = AdvService(AdvRepository(unit_of_work.session))
+        rows = adv_service.rebuild_spend_stats()
+        unit_of_work.commit()
+    click.echo(f"adv_daily_spend: {rows} rows")
@@ -27,6 +27,10 @@ class BaseConfig:
     SQLALCHEMY_POOL_TIMEOUT = int(os.environ.get("SQLALCHEMY_POOL_TIMEOUT", 30))
     SQLALCHEMY_POOL_RECYCLE = int(os.environ.get("SQLALCHEMY_POOL_RECYCLE", 3600))
 
+    ADV_COMPILED_SERIALIZER = (
+        os.environ.get("ADV_COMPILED_SERIALIZER", "True").lower() == "true"
+    )
+
 
 class ProductionConfig(BaseConfig):
     SECRET_KEY = os.environ.get("SECRET_KEY")
@@ -0,0 +1,29 @@
+"""
+Запуск Advertisement несколькими воркерами gunicorn.
+
+Приложение создается в мастер-процессе и прогревается до fork
+(warm_up): воркеры наследуют конфигурацию, блюпринты и скомпилированные
+планы сериализации. Движок приложения сбрасывает пул после fork без
+закрытия соединений мастера (common.database.reset_pool_after_fork).
+
+Запуск: FLASK_ENV=production gunicorn -c python:adv.web.gunicorn_conf
+Число воркеров - WEB_CONCURRENCY, потоков в воркере - GUNICORN_THREADS,
+адрес - BIND.
+"""
+
+import os
+
+from common.workers import default_bind, default_workers
+
+wsgi_app = "adv.web.app:create_app()"
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+bind = default_bind()
+workers = default_workers()
+preload_app = True
+
+
+def when_ready(server):
+    from adv.web.app import warm_up
+
+    warm_up(server.app.wsgi())
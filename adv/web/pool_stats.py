@@ -0,0 +1,89 @@
+"""
+Счетчики пула соединений Advertisement.
+
+Используются для подбора SQLALCHEMY_POOL_SIZE и SQLALCHEMY_MAX_OVERFLOW
+под нагрузку: сколько соединений выдано, сколько из них пришлось на
+overflow и сколько запросов не дождались соединения за POOL_TIMEOUT.
+"""
+
+import threading
+
+from sqlalchemy import event, exc, Engine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+    def attach(self, engine: Engine) -> "PoolStats":
+        self._engine = engine
+        engine.pool.stats = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        pool = self._engine.pool
+        checked_out = pool.checkedout() if isinstance(pool, QueuePool) else 0
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            if isinstance(pool, QueuePool) and checked_out > pool.size():
+                self.overflow_checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def dict(self):
+        pool = self._engine.pool
+        snapshot = {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "peak_checked_out": self.peak_checked_out,
+        }
+        if isinstance(pool, QueuePool):
+            snapshot.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return snapshot
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool, который сообщает о таймаутах ожидания соединения в PoolStats."""
+
+    stats: PoolStats | None = None
+
+    def connect(self):
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_timeout()
+            raise
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
@@ -0,0 +1 @@
+"""Аналитика воронки продукт -> объявление -> лид поверх снимков трех сервисов"""
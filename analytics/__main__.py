@@ -0,0 +1,57 @@
+"""
+Отчет воронки по снимкам БД трех сервисов.
+
+Запуск: python -m analytics --product-db URL --adv-db URL --lead-db URL [--by-chanel]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from sqlalchemy import create_engine
+
+from analytics.funnel import chanel_report, funnel_report
+from analytics.snapshot import load_ads, load_leads, load_products
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--product-db", default=os.environ.get("PRODUCT_DATABASE_URL"))
+    parser.add_argument("--adv-db", default=os.environ.get("ADV_DATABASE_URL"))
+    parser.add_argument("--lead-db", default=os.environ.get("LEAD_DATABASE_URL"))
+    parser.add_argument("--by-chanel", action="store_true")
+    args = parser.parse_args()
+    if not (args.product_db and args.adv_db and args.lead_db):
+        parser.error("database URLs for product, adv and lead are required")
+
+    started = time.perf_counter()
+    products = load_products(create_engine(args.product_db))
+    ads = load_ads(create_engine(args.adv_db))
+    leads = load_leads(create_engine(args.lead_db))
+    loaded = time.perf_counter()
+    report = funnel_report(products, ads, leads)
+    if args.by_chanel:
+        report = chanel_report(report)
+    finished = time.perf_counter()
+
+    for row in report.rows():
+        print(json.dumps(row, ensure_ascii=False))
+    print(
+        json.dumps(
+            {
+                "products": len(products.id),
+                "ads": len(ads.id),
+                "leads": len(leads.adv_id),
+                "orphan_ads": report.orphan_ads,
+                "orphan_leads": report.orphan_leads,
+                "orphan_ad_leads": report.orphan_ad_leads,
+                "load_seconds": round(loaded - started, 3),
+                "report_seconds": round(finished - loaded, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
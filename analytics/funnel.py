@@ -0,0 +1,139 @@
+"""
+Векторизованная воронка продукт -> объявление -> лид.
+
+Лиды соединяются с объявлениями, а объявления с продуктами через
+сортированные ключи и np.searchsorted, суммы по группам копятся
+np.add.at в целочисленном аккумуляторе. Деньги остаются в целых центах
+до расчета CPL.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from analytics.snapshot import AdsSnapshot, LeadsSnapshot, ProductsSnapshot
+
+
+@dataclass(frozen=True)
+class FunnelReport:
+    """
+    Показатели воронки по группам. Для отчета по каналам product_id равен None.
+    orphan_leads и orphan_ads считают строки, ссылающиеся на отсутствующие записи,
+    orphan_ad_leads - лиды объявлений из orphan_ads. Каждый лид попадает
+    ровно в одно из leads, orphan_leads и orphan_ad_leads.
+    """
+
+    product_id: np.ndarray | None
+    chanel: np.ndarray
+    ads: np.ndarray
+    spend_cents: np.ndarray
+    leads: np.ndarray
+    active_leads: np.ndarray
+    orphan_leads: int = 0
+    orphan_ads: int = 0
+    orphan_ad_leads: int = 0
+
+    @property
+    def cpl_cents(self) -> np.ndarray:
+        """Стоимость лида в центах, NaN для групп без лидов."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.leads > 0, self.spend_cents / self.leads, np.nan)
+
+    @property
+    def active_ratio(self) -> np.ndarray:
+        """Доля активных лидов, NaN для групп без лидов."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.leads > 0, self.active_leads / self.leads, np.nan)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        cpl_cents, active_ratio = self.cpl_cents, self.active_ratio
+        rows = []
+        for position in range(len(self.chanel)):
+            row = {
+                "chanel": str(self.chanel[position]),
+                "ads": int(self.ads[position]),
+                "spend_cents": int(self.spend_cents[position]),
+                "leads": int(self.leads[position]),
+                "active_leads": int(self.active_leads[position]),
+                "cpl_cents": _optional(cpl_cents[position]),
+                "active_ratio": _optional(active_ratio[position]),
+            }
+            if self.product_id is not None:
+                row = {"product_id": int(self.product_id[position]), **row}
+            rows.append(row)
+        return rows
+
+
+def _optional(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def lookup(
+    sorted_keys: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Позиции values в отсортированном sorted_keys и маска найденных значений.
+    Для ненайденных значений позиция не определена.
+    """
+    positions = np.searchsorted(sorted_keys, values)
+    positions[positions == len(sorted_keys)] = 0
+    if len(sorted_keys) == 0:
+        return positions, np.zeros(len(values), dtype=bool)
+    return positions, sorted_keys[positions] == values
+
+
+def _group_sum(groups: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    # bincount с weights складывает во float64 и теряет центы выше 2**53
+    totals = np.zeros(size, dtype=np.int64)
+    np.add.at(totals, groups, weights)
+    return totals
+
+
+def funnel_report(
+    products: ProductsSnapshot, ads: AdsSnapshot, leads: LeadsSnapshot
+) -> FunnelReport:
+    """Расходы, лиды, CPL и доля активных лидов по (product_id, chanel)."""
+    ad_order = np.argsort(ads.id, kind="stable")
+    positions, lead_found = lookup(ads.id[ad_order], leads.adv_id)
+    lead_ad = ad_order[positions[lead_found]]
+    leads_per_ad = np.bincount(lead_ad, minlength=len(ads.id))
+    active_per_ad = np.bincount(
+        lead_ad[leads.is_active[lead_found]], minlength=len(ads.id)
+    )
+
+    product_ids = np.sort(products.id)
+    product_position, ad_found = lookup(product_ids, ads.product_id)
+    chanel_count = max(len(ads.chanels), 1)
+    keys = product_position[ad_found] * chanel_count + ads.chanel_code[ad_found]
+    group_keys, groups = np.unique(keys, return_inverse=True)
+    size = len(group_keys)
+
+    return FunnelReport(
+        product_id=product_ids[group_keys // chanel_count],
+        chanel=np.array(ads.chanels, dtype=object)[group_keys % chanel_count],
+        ads=np.bincount(groups, minlength=size),
+        spend_cents=_group_sum(groups, ads.cost_cents[ad_found], size),
+        leads=_group_sum(groups, leads_per_ad[ad_found], size),
+        active_leads=_group_sum(groups, active_per_ad[ad_found], size),
+        orphan_leads=int(len(leads.adv_id) - lead_found.sum()),
+        orphan_ads=int(len(ads.id) - ad_found.sum()),
+        orphan_ad_leads=int(leads_per_ad[~ad_found].sum()),
+    )
+
+
+def chanel_report(report: FunnelReport) -> FunnelReport:
+    """Сворачивает отчет по (product_id, chanel) до итогов по каналам."""
+    chanels, groups = np.unique(report.chanel.astype(str), return_inverse=True)
+    size = len(chanels)
+    return FunnelReport(
+        product_id=None,
+        chanel=chanels.astype(object),
+        ads=_group_sum(groups, report.ads, size),
+        spend_cents=_group_sum(groups, report.spend_cents, size),
+        leads=_group_sum(groups, report.leads, size),
+        active_leads=_group_sum(groups, report.active_leads, size),
+        orphan_leads=report.orphan_leads,
+        orphan_ads=report.orphan_ads,
+        orphan_ad_leads=report.orphan_ad_leads,
+    )
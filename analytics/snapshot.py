@@ -0,0 +1,93 @@
+"""
+Колоночные снимки таблиц product, adv и lead в массивах NumPy.
+
+Денежные значения переводятся в целые центы на стороне БД, строки читаются
+пачками через серверный курсор без создания ORM-объектов и Decimal.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import Engine, Integer, cast, func, select
+
+from adv.adv_repository.models import AdvModel
+from lead.lead_repository.models import LeadModel
+from product.product_repository.models import ProductModel
+
+
+@dataclass(frozen=True)
+class ProductsSnapshot:
+    id: np.ndarray
+    price_cents: np.ndarray
+
+
+@dataclass(frozen=True)
+class AdsSnapshot:
+    id: np.ndarray
+    product_id: np.ndarray
+    chanel_code: np.ndarray
+    cost_cents: np.ndarray
+    chanels: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class LeadsSnapshot:
+    adv_id: np.ndarray
+    is_active: np.ndarray
+
+
+def _cents(column):
+    return cast(func.round(column * 100), Integer)
+
+
+def _read_columns(engine: Engine, query, dtypes, batch_size: int) -> list[np.ndarray]:
+    """Читает результат query в массивы dtypes, пачками по batch_size строк."""
+    chunks = [[] for _ in dtypes]
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for partition in result.partitions():
+            for position, column in enumerate(zip(*partition)):
+                chunks[position].append(np.array(column, dtype=dtypes[position]))
+    return [
+        np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        for parts, dtype in zip(chunks, dtypes)
+    ]
+
+
+def load_products(engine: Engine, batch_size: int = 100_000) -> ProductsSnapshot:
+    id_, price_cents = _read_columns(
+        engine,
+        select(ProductModel.id, _cents(ProductModel.price)),
+        (np.int64, np.int64),
+        batch_size,
+    )
+    return ProductsSnapshot(id=id_, price_cents=price_cents)
+
+
+def load_ads(engine: Engine, batch_size: int = 100_000) -> AdsSnapshot:
+    id_, product_id, chanel, cost_cents = _read_columns(
+        engine,
+        select(
+            AdvModel.id, AdvModel.product_id, AdvModel.chanel, _cents(AdvModel.cost)
+        ),
+        (np.int64, np.int64, object, np.int64),
+        batch_size,
+    )
+    chanels, chanel_code = np.unique(chanel.astype(str), return_inverse=True)
+    return AdsSnapshot(
+        id=id_,
+        product_id=product_id,
+        chanel_code=chanel_code.astype(np.int32),
+        cost_cents=cost_cents,
+        chanels=tuple(str(chanel) for chanel in chanels),
+    )
+
+
+def load_leads(engine: Engine, batch_size: int = 100_000) -> LeadsSnapshot:
+    adv_id, is_active = _read_columns(
+        engine,
+        select(LeadModel.adv_id, LeadModel.is_active),
+        (np.int64, np.bool_),
+        batch_size,
+    )
+    return LeadsSnapshot(adv_id=adv_id, is_active=is_active)
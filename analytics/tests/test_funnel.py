@@ -0,0 +1,196 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+
+from adv.adv_repository.models import AdvModel, Base as AdvBase
+from analytics.funnel import chanel_report, funnel_report
+from analytics.snapshot import (
+    AdsSnapshot,
+    LeadsSnapshot,
+    ProductsSnapshot,
+    load_ads,
+    load_leads,
+    load_products,
+)
+from lead.lead_repository.models import Base as LeadBase, LeadModel
+from product.product_repository.models import Base as ProductBase, ProductModel
+
+
+@pytest.fixture
+def snapshots():
+    """Фикстура снимков: 2 продукта, 4 объявления, лиды и ссылки в никуда."""
+    products = ProductsSnapshot(
+        id=np.array([20, 10]), price_cents=np.array([1500, 999])
+    )
+    ads = AdsSnapshot(
+        id=np.array([4, 1, 3, 2, 5]),
+        product_id=np.array([20, 10, 10, 10, 99]),
+        chanel_code=np.array([1, 0, 1, 0, 0], dtype=np.int32),
+        cost_cents=np.array([700, 1000, 300, 2000, 50]),
+        chanels=("Google", "VK"),
+    )
+    leads = LeadsSnapshot(
+        adv_id=np.array([1, 1, 2, 3, 3, 3, 5, 42]),
+        is_active=np.array([True, False, True, False, False, True, True, True]),
+    )
+    return products, ads, leads
+
+
+def test_funnel_report_by_product_and_chanel(snapshots):
+    """Тест funnel_report считает расходы, лиды, CPL и долю активных по группам."""
+    report = funnel_report(*snapshots)
+
+    assert report.rows() == [
+        {
+            "product_id": 10,
+            "chanel": "Google",
+            "ads": 2,
+            "spend_cents": 3000,
+            "leads": 3,
+            "active_leads": 2,
+            "cpl_cents": 1000.0,
+            "active_ratio": pytest.approx(2 / 3),
+        },
+        {
+            "product_id": 10,
+            "chanel": "VK",
+            "ads": 1,
+            "spend_cents": 300,
+            "leads": 3,
+            "active_leads": 1,
+            "cpl_cents": 100.0,
+            "active_ratio": pytest.approx(1 / 3),
+        },
+        {
+            "product_id": 20,
+            "chanel": "VK",
+            "ads": 1,
+            "spend_cents": 700,
+            "leads": 0,
+            "active_leads": 0,
+            "cpl_cents": None,
+            "active_ratio": None,
+        },
+    ]
+    assert report.orphan_leads == 1
+    assert report.orphan_ads == 1
+    assert report.orphan_ad_leads == 1
+
+
+def test_every_lead_is_counted_once(snapshots):
+    """Тест лиды без объявления и лиды объявлений без продукта не теряются."""
+    products, ads, leads = snapshots
+    for report in (
+        funnel_report(products, ads, leads),
+        chanel_report(funnel_report(products, ads, leads)),
+    ):
+        counted = report.leads.sum() + report.orphan_leads + report.orphan_ad_leads
+        assert counted == len(leads.adv_id)
+
+
+def test_funnel_report_sums_cents_exactly_above_float_precision():
+    """Тест суммы в центах считаются в целых числах и не округляются до float64."""
+    report = funnel_report(
+        ProductsSnapshot(id=np.array([1]), price_cents=np.array([100])),
+        AdsSnapshot(
+            id=np.array([1, 2]),
+            product_id=np.array([1, 1]),
+            chanel_code=np.array([0, 0], dtype=np.int32),
+            cost_cents=np.array([2**53 + 1, 1], dtype=np.int64),
+            chanels=("VK",),
+        ),
+        LeadsSnapshot(adv_id=np.array([1]), is_active=np.array([True])),
+    )
+
+    assert report.rows()[0]["spend_cents"] == 2**53 + 2
+    assert chanel_report(report).rows()[0]["spend_cents"] == 2**53 + 2
+
+
+def test_chanel_report_sums_groups(snapshots):
+    """Тест chanel_report сворачивает группы до итогов по каналам."""
+    rows = chanel_report(funnel_report(*snapshots)).rows()
+
+    assert [(row["chanel"], row["spend_cents"], row["leads"]) for row in rows] == [
+        ("Google", 3000, 3),
+        ("VK", 1000, 3),
+    ]
+    assert "product_id" not in rows[0]
+
+
+def test_funnel_report_handles_empty_snapshots():
+    """Тест пустые снимки дают пустой отчет, а не ошибку."""
+    empty = np.array([], dtype=np.int64)
+    report = funnel_report(
+        ProductsSnapshot(id=empty, price_cents=empty),
+        AdsSnapshot(
+            id=empty,
+            product_id=empty,
+            chanel_code=np.array([], dtype=np.int32),
+            cost_cents=empty,
+            chanels=(),
+        ),
+        LeadsSnapshot(adv_id=np.array([3]), is_active=np.array([True])),
+    )
+
+    assert report.rows() == []
+    assert report.orphan_leads == 1
+
+
+def test_snapshots_load_cents_from_databases():
+    """Тест загрузчики читают таблицы сервисов в массивы с ценами в центах."""
+    product_engine = create_engine("sqlite://")
+    adv_engine = create_engine("sqlite://")
+    lead_engine = create_engine("sqlite://")
+    ProductBase.metadata.create_all(product_engine)
+    AdvBase.metadata.create_all(adv_engine)
+    LeadBase.metadata.create_all(lead_engine)
+    with product_engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(), [{"name": "p", "price": Decimal("9.99")}]
+        )
+    with adv_engine.begin() as connection:
+        connection.execute(
+            AdvModel.__table__.insert(),
+            [
+                {
+                    "name": name,
+                    "chanel": chanel,
+                    "cost": cost,
+                    "product_id": 1,
+                    "created_at": datetime(2024, 1, 1),
+                }
+                for name, chanel, cost in (
+                    ("a", "VK", Decimal("0.29")),
+                    ("b", "Google", Decimal("12.35")),
+                )
+            ],
+        )
+    with lead_engine.begin() as connection:
+        connection.execute(
+            LeadModel.__table__.insert(),
+            [
+                {
+                    "name": "l",
+                    "first_name": "l",
+                    "phone": "1",
+                    "email": "l@example.com",
+                    "adv_id": 2,
+                    "is_active": True,
+                }
+            ],
+        )
+
+    products = load_products(product_engine, batch_size=1)
+    ads = load_ads(adv_engine, batch_size=1)
+    leads = load_leads(lead_engine)
+
+    assert products.price_cents.tolist() == [999]
+    assert ads.cost_cents.tolist() == [29, 1235]
+    assert ads.chanels == ("Google", "VK")
+    assert ads.chanel_code.tolist() == [1, 0]
+    assert leads.adv_id.tolist() == [2]
+    assert leads.is_active.tolist() == [True]
+    assert funnel_report(products, ads, leads).rows()[0]["cpl_cents"] == 1235.0
@@ -0,0 +1,5 @@
+"""
+Бенчмарки сервисов SRM.
+
+Каждый модуль запускается отдельно: python -m benchmarks.<module>
+"""
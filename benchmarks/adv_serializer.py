@@ -0,0 +1,66 @@
+"""
+Сериализация ответа GET /ads: GetAdsSchema.dump против compile_dumper.
+
+Запуск: python -m benchmarks.adv_serializer [--items 50] [--iterations 2000]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from adv.adv_service.adv import AdvRow
+from adv.web.api.schemas import GetAdsSchema
+from adv.web.api.serializers import compile_dumper
+
+
+def make_page(items: int) -> dict:
+    started = datetime(2024, 1, 1, 9, 30, 0, 123456)
+    return {
+        "ads": [
+            AdvRow(
+                id=i,
+                name=f"adv_{i}",
+                chanel="VK",
+                cost=Decimal(i) + Decimal("0.99"),
+                created_at=started + timedelta(minutes=i),
+                product_id=i % 10,
+            )
+            for i in range(items)
+        ],
+        "next_cursor": "eyJpZCI6IDUwfQ==",
+    }
+
+
+def time_per_call(dump, page: dict, iterations: int) -> float:
+    dump(page)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        dump(page)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = make_page(args.items)
+    schema = GetAdsSchema()
+    compiled = compile_dumper(GetAdsSchema)
+    assert compiled(page) == schema.dump(page)
+
+    results = {
+        "marshmallow dump": time_per_call(schema.dump, page, args.iterations),
+        "compiled plan": time_per_call(compiled, page, args.iterations),
+    }
+    print(f"Сериализация страницы из {args.items} объявлений")
+    print(f"{'mode':<24}{'us/op':>10}{'speedup':>10}")
+    baseline = results["marshmallow dump"]
+    for name, value in results.items():
+        print(f"{name:<24}{value:>10.1f}{baseline / value:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Воронка продукт -> объявление -> лид: funnel_report на NumPy против цикла Python.
+
+Снимки генерируются в памяти, чтобы измерять только расчет отчета.
+
+Запуск: python -m benchmarks.funnel [--leads 2000000] [--ads 50000] [--products 1000]
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from analytics.funnel import funnel_report
+from analytics.snapshot import AdsSnapshot, LeadsSnapshot, ProductsSnapshot
+
+CHANELS = ("Google", "TG", "VK", "Yandex", "YouTube")
+
+
+def make_snapshots(products: int, ads: int, leads: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    product_ids = rng.permutation(products) + 1
+    ad_ids = rng.permutation(ads) + 1
+    return (
+        ProductsSnapshot(
+            id=product_ids, price_cents=rng.integers(100, 100_000, products)
+        ),
+        AdsSnapshot(
+            id=ad_ids,
+            product_id=rng.integers(1, products + 1, ads),
+            chanel_code=rng.integers(0, len(CHANELS), ads).astype(np.int32),
+            cost_cents=rng.integers(100, 1_000_000, ads),
+            chanels=CHANELS,
+        ),
+        LeadsSnapshot(
+            adv_id=rng.integers(1, ads + 1, leads),
+            is_active=rng.random(leads) < 0.3,
+        ),
+    )
+
+
+def naive_report(products, ads, leads) -> dict:
+    """Тот же отчет словарями и циклом по строкам."""
+    product_ids = set(products.id.tolist())
+    ad_group = {}
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for ad_id, product_id, chanel_code, cost in zip(
+        ads.id.tolist(),
+        ads.product_id.tolist(),
+        ads.chanel_code.tolist(),
+        ads.cost_cents.tolist(),
+    ):
+        if product_id not in product_ids:
+            continue
+        key = (product_id, ads.chanels[chanel_code])
+        ad_group[ad_id] = key
+        totals[key][0] += 1
+        totals[key][1] += cost
+    for adv_id, is_active in zip(leads.adv_id.tolist(), leads.is_active.tolist()):
+        key = ad_group.get(adv_id)
+        if key is None:
+            continue
+        totals[key][2] += 1
+        totals[key][3] += is_active
+    return dict(sorted(totals.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--ads", type=int, default=50_000)
+    parser.add_argument("--leads", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    snapshots = make_snapshots(args.products, args.ads, args.leads)
+
+    started = time.perf_counter()
+    report = funnel_report(*snapshots)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = naive_report(*snapshots)
+    naive = time.perf_counter() - started
+
+    actual = {
+        (row["product_id"], row["chanel"]): [
+            row["ads"],
+            row["spend_cents"],
+            row["leads"],
+            row["active_leads"],
+        ]
+        for row in report.rows()
+    }
+    assert actual == expected, "отчеты различаются"
+
+    print(
+        f"{args.products} продуктов, {args.ads} объявлений, {args.leads} лидов, "
+        f"{len(expected)} групп"
+    )
+    print(f"{'mode':<16}{'seconds':>10}{'speedup':>10}")
+    print(f"{'python loop':<16}{naive:>10.3f}{1:>10.1f}")
+    print(f"{'numpy':<16}{vectorized:>10.3f}{naive / vectorized:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
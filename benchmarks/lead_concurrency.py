@@ -0,0 +1,158 @@
+"""
+Задержка /leads/list/ при 500 одновременных клиентах, пока в обработке
+находится один медленный запрос к БД.
+
+Сравниваются три сценария:
+    no slow request      - фон без медленного запроса;
+    slow async query     - медленный запрос через AsyncSession (новый путь);
+    slow blocking query  - тот же запрос синхронным движком прямо на IOLoop,
+                           как выполнялись обработчики до перехода на asyncio.
+
+Запуск: python -m benchmarks.lead_concurrency [--clients 500] [--rows 1000]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'lead_bench.db'}"
+)
+
+import tornado.web  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from tornado.httpclient import AsyncHTTPClient  # noqa: E402
+from tornado.httpserver import HTTPServer  # noqa: E402
+from tornado.netutil import bind_sockets  # noqa: E402
+
+from benchmarks.utils import print_table, summarize  # noqa: E402
+from lead.lead_repository.async_unit_of_work import AsyncUnitOfWork  # noqa: E402
+from lead.lead_repository.models import Base, LeadModel  # noqa: E402
+from lead.lead_settings.app_settings import get_settings  # noqa: E402
+from lead.web.routers import routers  # noqa: E402
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+    "WHERE x < :n) SELECT count(*) FROM c"
+)
+
+
+class SlowAsync(tornado.web.RequestHandler):
+    async def get(self):
+        async with AsyncUnitOfWork() as unit_of_work:
+            result = await unit_of_work.session.execute(
+                SLOW_QUERY, {"n": self.application.settings["slow_n"]}
+            )
+        self.write({"count": result.scalar()})
+
+
+class SlowBlocking(tornado.web.RequestHandler):
+    def get(self):
+        with self.application.settings["sync_engine"].connect() as connection:
+            result = connection.execute(
+                SLOW_QUERY, {"n": self.application.settings["slow_n"]}
+            )
+            self.write({"count": result.scalar()})
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            LeadModel.__table__.insert(),
+            [
+                {
+                    "name": f"lead_{i}",
+                    "first_name": f"first_{i}",
+                    "phone": f"+7999{i:07d}",
+                    "email": f"lead_{i}@example.com",
+                    "adv_id": i % 10,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+async def run_scenario(base_url: str, clients: int, slow_path: str | None) -> dict:
+    http_client = AsyncHTTPClient(force_instance=True, max_clients=clients + 1)
+    slow = None
+    if slow_path is not None:
+        slow = asyncio.ensure_future(
+            http_client.fetch(base_url + slow_path, request_timeout=600)
+        )
+        await asyncio.sleep(0.05)
+
+    async def one():
+        started = time.perf_counter()
+        await http_client.fetch(base_url + "/leads/list/", request_timeout=600)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    if slow is not None:
+        await slow
+    http_client.close()
+    return summarize(list(latencies), elapsed)
+
+
+def serve(sockets, slow_n: int) -> None:
+    """Сервер работает в отдельном процессе, чтобы клиенты не делили с ним IOLoop."""
+    sync_engine = create_engine(get_settings().database_url)
+    application = tornado.web.Application(
+        routers + [(r"/slow/async", SlowAsync), (r"/slow/blocking", SlowBlocking)],
+        slow_n=slow_n,
+        sync_engine=sync_engine,
+    )
+
+    async def run():
+        server = HTTPServer(application)
+        server.add_sockets(sockets)
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def main_async(args, base_url: str) -> None:
+    results = {
+        "no slow request": await run_scenario(base_url, args.clients, None),
+        "slow async query": await run_scenario(base_url, args.clients, "/slow/async"),
+        "slow blocking query": await run_scenario(
+            base_url, args.clients, "/slow/blocking"
+        ),
+    }
+    print_table(f"GET /leads/list/, {args.clients} concurrent clients", results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--slow-n", type=int, default=8_000_000)
+    args = parser.parse_args()
+
+    sync_engine = create_engine(get_settings().database_url)
+    seed(sync_engine, args.rows)
+    sync_engine.dispose()
+
+    sockets = bind_sockets(0, "127.0.0.1", family=socket.AF_INET)
+    server = multiprocessing.get_context("fork").Process(
+        target=serve, args=(sockets, args.slow_n), daemon=True
+    )
+    server.start()
+    try:
+        base_url = f"http://127.0.0.1:{sockets[0].getsockname()[1]}"
+        asyncio.run(main_async(args, base_url))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
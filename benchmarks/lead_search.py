@@ -0,0 +1,150 @@
+"""
+Задержка поиска лидов по подстроке: FTS5-индекс lead_search против
+полного просмотра таблицы через LIKE по name, first_name, email и phone.
+
+Таблица заполняется один раз и переиспользуется, пока число строк
+совпадает с --rows.
+
+Запуск: python -m benchmarks.lead_search [--rows 1000000] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{Path(tempfile.gettempdir()) / 'lead_search_bench.db'}",
+)
+
+from sqlalchemy import create_engine, func, or_, select  # noqa: E402
+
+from benchmarks.utils import print_table, summarize  # noqa: E402
+from lead.lead_repository.async_lead_repository import (  # noqa: E402
+    SEARCH_COLUMNS,
+    AsyncLeadRepository,
+)
+from lead.lead_repository.async_unit_of_work import (  # noqa: E402
+    AsyncUnitOfWork,
+    dispose_async_engine,
+)
+from lead.lead_repository.models import Base, LeadModel  # noqa: E402
+from lead.lead_service.lead import LeadRow  # noqa: E402
+from lead.lead_settings.app_settings import get_settings  # noqa: E402
+
+FIRST_NAMES = ("Ivan", "Petr", "Anna", "Maria", "Oleg", "Olga", "Sergey", "Elena")
+LAST_NAMES = ("Ivanov", "Petrov", "Sidorov", "Smirnov", "Kuznetsov", "Popov")
+
+
+def seed(rows: int, batch_size: int = 50_000) -> None:
+    engine = create_engine(get_settings().database_url)
+    with engine.connect() as connection:
+        Base.metadata.create_all(connection)
+        connection.commit()
+        if connection.scalar(select(func.count(LeadModel.id))) == rows:
+            engine.dispose()
+            return
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for start in range(0, rows, batch_size):
+            connection.execute(
+                LeadModel.__table__.insert(),
+                [
+                    {
+                        "name": f"{LAST_NAMES[i % 6]}{i}",
+                        "first_name": FIRST_NAMES[i % 8],
+                        "phone": f"+7999{i:07d}",
+                        "email": f"{FIRST_NAMES[i % 8].lower()}.{i}@example.com",
+                        "adv_id": i % 100,
+                    }
+                    for i in range(start, min(start + batch_size, rows))
+                ],
+            )
+    print(f"seeded {rows} leads in {time.perf_counter() - started:.1f}s")
+    engine.dispose()
+
+
+def queries(rows: int, count: int) -> list[str]:
+    rng = random.Random(1)
+    result = []
+    for _ in range(count):
+        i = rng.randrange(rows)
+        result.append(
+            rng.choice(
+                (
+                    f"{LAST_NAMES[i % 6]}{i}"[:-1].lower(),
+                    f"{i:07d}"[-5:],
+                    f"{FIRST_NAMES[i % 8].lower()}.{i}@",
+                )
+            )
+        )
+    return result
+
+
+async def scan(session, query: str, limit: int) -> list[LeadRow]:
+    """Поиск без индекса: LIKE '%query%' по всем колонкам."""
+    rows = (
+        AsyncLeadRepository(session)
+        ._select_rows()
+        .where(
+            or_(
+                *(
+                    getattr(LeadModel, column).icontains(query, autoescape=True)
+                    for column in SEARCH_COLUMNS
+                )
+            )
+        )
+        .limit(limit)
+    )
+    return [LeadRow(*row) for row in await session.execute(rows)]
+
+
+async def measure(search, terms: list[str]) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    async with AsyncUnitOfWork() as unit_of_work:
+        for term in terms:
+            request_started = time.perf_counter()
+            await search(unit_of_work.session, term)
+            latencies.append(time.perf_counter() - request_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(rows: int, requests: int, limit: int) -> dict[str, dict]:
+    terms = queries(rows, requests)
+
+    async def fts(session, term):
+        return await AsyncLeadRepository(session).search(term, limit=limit)
+
+    async def like(session, term):
+        return await scan(session, term, limit)
+
+    try:
+        return {
+            "fts5 trigram": await measure(fts, terms),
+            "like scan": await measure(like, terms[: max(1, requests // 10)]),
+        }
+    finally:
+        await dispose_async_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    results = asyncio.run(run(args.rows, args.requests, args.limit))
+    print_table(f"/leads/search, {args.rows} лидов, limit={args.limit}", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Сериализация списка продуктов: ORM-объекты + pydantic против строк ProductRow.
+
+Обе ветки читают одни и те же строки и строят одинаковый JSON. Для каждой
+ветки печатается процессорное время и пик памяти по tracemalloc.
+
+Запуск: python -m benchmarks.list_serialization [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.utils import configure_product_env
+
+configure_product_env("product_list_bench.db")
+
+from product.product_repository.engine import get_engine  # noqa: E402
+from product.product_repository.models import Base, ProductModel  # noqa: E402
+from product.product_repository.product_repository import (  # noqa: E402
+    ProductRepository,
+)
+from product.product_repository.unit_of_work import UnitOfWork  # noqa: E402
+from product.product_service.products import Product  # noqa: E402
+from product.web.api.schemas import ProductResponse  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [{"name": f"product_{i}", "price": i + 0.99} for i in range(rows)],
+        )
+
+
+def orm_path(rows: int) -> bytes:
+    """Прежний путь: ORM -> dict -> Product -> dict -> pydantic -> JSON."""
+    with UnitOfWork() as unit_of_work:
+        records = (
+            unit_of_work.session.query(ProductModel)
+            .order_by(ProductModel.id)
+            .limit(rows)
+            .all()
+        )
+        products = [Product(**record.dict()) for record in records]
+    response = ProductResponse.model_validate(
+        {"products": [product.dict() for product in products], "next_cursor": None}
+    )
+    return response.model_dump_json().encode()
+
+
+def row_path(rows: int) -> bytes:
+    """Быстрый путь: кортежи колонок -> ProductRow -> JSON."""
+    with UnitOfWork() as unit_of_work:
+        products = ProductRepository(unit_of_work.session).get_list(
+            limit=rows, offset=0, sort_field="id"
+        )
+    return json.dumps(
+        {"products": [product.dict() for product in products], "next_cursor": None}
+    ).encode()
+
+
+def measure(path, rows: int, repeat: int) -> dict:
+    path(rows)
+    cpu_times = []
+    for _ in range(repeat):
+        started = time.process_time()
+        path(rows)
+        cpu_times.append(time.process_time() - started)
+
+    tracemalloc.start()
+    body = path(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cpu_ms": statistics.median(cpu_times) * 1000,
+        "peak_kb": peak / 1024,
+        "body": body,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    results = {
+        "ORM + pydantic": measure(orm_path, args.rows, args.repeat),
+        "ProductRow": measure(row_path, args.rows, args.repeat),
+    }
+    assert len(json.loads(results["ProductRow"]["body"])["products"]) == args.rows
+    assert json.loads(results["ORM + pydantic"]["body"]) == json.loads(
+        results["ProductRow"]["body"]
+    ), "ветки вернули разный JSON"
+
+    print(f"Сериализация {args.rows} продуктов, медиана из {args.repeat}")
+    print(f"{'mode':<24}{'cpu ms':>10}{'peak KB':>12}")
+    for name, row in results.items():
+        print(f"{name:<24}{row['cpu_ms']:>10.1f}{row['peak_kb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
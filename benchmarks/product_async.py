@@ -0,0 +1,149 @@
+"""
+Пропускная способность Product с синхронными и асинхронными обработчиками.
+
+Для каждого режима (PRODUCT_ASYNC_DB=false/true) запускается отдельный
+процесс uvicorn, затем 50, 200 и 1000 одновременных клиентов читают
+GET /products/{name} и GET /products. Синхронные обработчики ограничены
+пулом потоков FastAPI (40 потоков), асинхронные - только пулом соединений.
+
+Запуск: python -m benchmarks.product_async [--clients 50 200 1000] [--requests 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import configure_product_env, summarize
+
+configure_product_env("product_async_bench.db")
+
+import httpx  # noqa: E402
+
+from product.product_repository.engine import dispose_engine, get_engine  # noqa: E402
+from product.product_repository.models import Base, ProductModel  # noqa: E402
+
+MODES = {"sync": "false", "async": "true"}
+
+
+def seed(rows: int) -> None:
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [{"name": f"product_{i}", "price": i + 0.99} for i in range(rows)],
+        )
+    dispose_engine()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "PRODUCT_ASYNC_DB": MODES[mode]}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "product.web.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--backlog",
+            "4096",
+            # Под перегрузкой таймер keep-alive закрывал бы ждущие соединения
+            "--timeout-keep-alive",
+            "120",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/cache/stats", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+async def run_clients(base_url: str, path, clients: int, requests: int) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+
+        async def one_client():
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(path())
+                assert response.status_code == 200, response.status_code
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return summarize([latency for result in results for latency in result], elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=5, help="запросов на клиента")
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    endpoints = {
+        "GET /products/{name}": lambda: f"/products/product_{random.randrange(args.rows)}",
+        "GET /products?limit=50": lambda: "/products?limit=50",
+    }
+
+    results = {}
+    for mode in MODES:
+        port = free_port()
+        server = start_server(mode, port)
+        try:
+            for title, path in endpoints.items():
+                for clients in args.clients:
+                    results[(title, clients, mode)] = asyncio.run(
+                        run_clients(
+                            f"http://127.0.0.1:{port}", path, clients, args.requests
+                        )
+                    )
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(
+        f"{'endpoint':<24}{'clients':>8}{'sync rps':>10}{'async rps':>11}"
+        f"{'sync p95':>10}{'async p95':>11}"
+    )
+    for title in endpoints:
+        for clients in args.clients:
+            sync, async_ = (
+                results[(title, clients, "sync")],
+                results[(title, clients, "async")],
+            )
+            print(
+                f"{title:<24}{clients:>8}{sync['rps']:>10.1f}{async_['rps']:>11.1f}"
+                f"{sync['p95_ms']:>10.1f}{async_['p95_ms']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Чтение GET /products/{product_name} с кэшем ProductCache и без него.
+
+Запуск: python -m benchmarks.product_cache [--requests 2000] [--rows 1000]
+"""
+
+import argparse
+import random
+
+from benchmarks.utils import configure_product_env, print_table, run_sequential
+
+configure_product_env()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from product.product_repository.engine import get_engine  # noqa: E402
+from product.product_repository.models import Base, ProductModel  # noqa: E402
+from product.product_service.cache import ProductCache  # noqa: E402
+from product.web.api import api  # noqa: E402
+from product.web.main import app  # noqa: E402
+
+
+def seed(rows: int) -> None:
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [{"name": f"product_{i}", "price": i + 0.99} for i in range(rows)],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument(
+        "--hot", type=int, default=100, help="число популярных продуктов"
+    )
+    args = parser.parse_args()
+
+    seed(args.rows)
+    client = TestClient(app)
+    rng = random.Random(1)
+
+    def call():
+        name = f"product_{rng.randrange(args.hot)}"
+        assert client.get(f"/products/{name}").status_code == 200
+
+    results = {}
+    api.product_cache = None
+    results["no cache"] = run_sequential(call, args.requests)
+    api.product_cache = ProductCache(maxsize=args.hot * 2, ttl=60)
+    results["ProductCache"] = run_sequential(call, args.requests)
+
+    print_table(f"GET /products/{{name}}, {args.requests} requests", results)
+    print("cache stats:", api.product_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Сравнение UnitOfWork с движком на каждый запрос и общего движка процесса.
+
+Запуск: python -m benchmarks.product_engine [--requests 500] [--rows 50]
+"""
+
+import argparse
+
+from benchmarks.utils import configure_product_env, print_table, run_sequential
+
+configure_product_env()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from product.product_repository.engine import get_engine  # noqa: E402
+from product.product_repository.models import Base, ProductModel  # noqa: E402
+from product.product_repository.unit_of_work import UnitOfWork  # noqa: E402
+from product.settings.bd_settings import settings  # noqa: E402
+from product.web.api import api  # noqa: E402
+from product.web.main import app  # noqa: E402
+
+
+class PerRequestEngineUnitOfWork(UnitOfWork):
+    """Прежнее поведение: новый движок и пул на каждый запрос."""
+
+    def __init__(self):
+        self.session_maker = sessionmaker(bind=create_engine(settings.DATABASE_URL))
+
+
+def seed(rows: int) -> None:
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [{"name": f"product_{i}", "price": i + 0.99} for i in range(rows)],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    client = TestClient(app)
+
+    def call():
+        assert client.get("/products").status_code == 200
+
+    results = {}
+    api.UnitOfWork = PerRequestEngineUnitOfWork
+    results["engine per request"] = run_sequential(call, args.requests)
+    api.UnitOfWork = UnitOfWork
+    results["shared engine"] = run_sequential(call, args.requests)
+
+    print_table(f"GET /products, {args.requests} requests", results)
+
+
+if __name__ == "__main__":
+    main()
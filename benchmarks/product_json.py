@@ -0,0 +1,112 @@
+"""
+Кодирование ответов сервиса Product: стандартный путь FastAPI против
+FastJSONResponse (PRODUCT_FAST_JSON).
+
+Сначала измеряется только сериализация страницы из 50 продуктов, затем
+полные запросы GET /products?limit=50 и GET /products/{name}.
+
+Запуск: python -m benchmarks.product_json [--iterations 2000] [--requests 500]
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import configure_product_env, print_table, run_sequential
+
+configure_product_env("product_json_bench.db")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from product.product_repository.engine import get_engine  # noqa: E402
+from product.product_repository.models import Base, ProductModel  # noqa: E402
+from product.product_repository.product_repository import (  # noqa: E402
+    ProductRepository,
+)
+from product.product_repository.unit_of_work import UnitOfWork  # noqa: E402
+from product.settings.app_settings import settings  # noqa: E402
+from product.web import responses  # noqa: E402
+from product.web.api.schemas import ProductResponse  # noqa: E402
+from product.web.main import app  # noqa: E402
+
+PAGE_SIZE = 50
+
+
+def seed(rows: int) -> None:
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [{"name": f"product_{i}", "price": i + 0.99} for i in range(rows)],
+        )
+
+
+def load_page() -> dict:
+    with UnitOfWork() as unit_of_work:
+        products, next_cursor = ProductRepository(unit_of_work.session).get_page(
+            limit=PAGE_SIZE
+        )
+    return {
+        "products": [product.dict() for product in products],
+        "next_cursor": next_cursor,
+    }
+
+
+def fastapi_render(content: dict) -> bytes:
+    """То же, что делает FastAPI для response_model: валидация + jsonable_encoder."""
+    validated = ProductResponse.model_validate(content)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def time_per_call(render, content: dict, iterations: int) -> float:
+    render(content)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(content)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    content = load_page()
+
+    renders = {"response_model": fastapi_render}
+    if responses.orjson is not None:
+        renders["FastJSONResponse orjson"] = responses.dumps
+    renders["FastJSONResponse json"] = responses.dumps_stdlib
+    print(f"Сериализация страницы из {PAGE_SIZE} продуктов")
+    print(f"{'mode':<28}{'us/op':>10}")
+    for name, render in renders.items():
+        print(f"{name:<28}{time_per_call(render, content, args.iterations):>10.1f}")
+
+    client = TestClient(app)
+    endpoints = {
+        f"/products?limit={PAGE_SIZE}": f"/products?limit={PAGE_SIZE}",
+        "/products/{name}": "/products/product_7",
+    }
+    for title, url in endpoints.items():
+
+        def call():
+            assert client.get(url).status_code == 200
+
+        results = {}
+        for fast in (False, True):
+            settings.PRODUCT_FAST_JSON = fast
+            mode = "FastJSONResponse" if fast else "response_model"
+            results[mode] = run_sequential(call, args.requests)
+        print()
+        print_table(f"GET {title}, {args.requests} requests", results)
+    settings.PRODUCT_FAST_JSON = False
+
+
+if __name__ == "__main__":
+    main()
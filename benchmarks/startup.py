@@ -0,0 +1,231 @@
+"""
+Холодный старт точек входа трех сервисов с проверкой бюджета.
+
+Для каждого сервиса в отдельных процессах измеряется:
+    import_ms         - сумма собственного времени всех импортов по
+                        python -X importtime при импорте точки входа;
+    first_response_ms - время от запуска процесса сервера до первого
+                        ответа 200 на эндпоинт со списком из БД.
+
+Каждое измерение повторяется --runs раз, в таблицу и сравнение с
+бюджетом идет медиана. Бюджет задается в JSON (по умолчанию
+benchmarks/startup_budget.json): {"product": {"import_ms": ..., ...}}.
+Если хотя бы одна медиана превышает бюджет, команда завершается с кодом 1.
+С --top выводятся самые тяжелые импорты точки входа.
+
+Запуск: python -m benchmarks.startup [--runs 5] [--services product adv lead]
+        [--budget benchmarks/startup_budget.json] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.utils import configure_product_env
+
+configure_product_env("startup_product.db")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+BUDGET_PATH = Path(__file__).parent / "startup_budget.json"
+START_TIMEOUT = 60
+POLL_INTERVAL = 0.005
+
+# Точка входа, модели для создания таблиц, команда запуска сервера и
+# эндпоинт первого запроса
+SERVICES = {
+    "product": {
+        "entry": "product.web.main",
+        "models": "product.product_repository.models",
+        "command": lambda port: [
+            "-m",
+            "uvicorn",
+            "product.web.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        "path": "/products?limit=10",
+    },
+    "adv": {
+        "entry": "adv.web.app",
+        "models": "adv.adv_repository.models",
+        "command": lambda port: [
+            "-c",
+            "from adv.web.app import create_app; "
+            f"create_app('production').run(port={port})",
+        ],
+        "path": "/ads",
+    },
+    "lead": {
+        "entry": "lead.app",
+        "models": "lead.lead_repository.models",
+        "command": lambda port: ["-m", "lead.app"],
+        "path": "/leads/list/",
+    },
+}
+
+
+def service_env(service: str, port: int) -> dict:
+    database = Path(tempfile.gettempdir()) / f"startup_{service}.db"
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "PORT": str(port),
+        "LEAD_CACHE_BACKEND": "memory",
+    }
+
+
+def create_tables(service: str) -> None:
+    """Пустые таблицы сервиса: первый запрос не должен падать на схеме."""
+    models = __import__(SERVICES[service]["models"], fromlist=["Base"])
+    engine = create_engine(service_env(service, 0)["DATABASE_URL"])
+    models.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+
+def parse_importtime(output: str, entry: str) -> tuple[float, list[tuple[float, str]]]:
+    """Сумма self-времени импортов и (cumulative, модуль) прямых импортов точки входа."""
+    total_us = 0
+    pending, children = [], []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        total_us += int(self_us)
+        # Строки идут после вложенных импортов: уровень 1 копится до
+        # строки своего модуля верхнего уровня
+        if not name.startswith("   "):
+            if name.strip() == entry:
+                children = pending
+            pending = []
+        elif not name.startswith("     "):
+            pending.append((int(cumulative_us) / 1000, name.strip()))
+    return total_us / 1000, children
+
+
+def measure_import(service: str) -> tuple[float, list[tuple[float, str]]]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {SERVICES[service]['entry']}",
+        ],
+        env=service_env(service, 0),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{service} import failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr, SERVICES[service]["entry"])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(service: str) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{SERVICES[service]['path']}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, *SERVICES[service]["command"](port)],
+        env=service_env(service, port),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < START_TIMEOUT:
+            try:
+                response = httpx.get(url, timeout=START_TIMEOUT)
+            except httpx.TransportError:
+                if server.poll() is not None:
+                    raise RuntimeError(
+                        f"{service} server exited with {server.returncode}"
+                    )
+                time.sleep(POLL_INTERVAL)
+                continue
+            if response.status_code != 200:
+                raise RuntimeError(f"{service} GET {url}: {response.status_code}")
+            return (time.perf_counter() - started) * 1000
+        raise RuntimeError(f"{service} server did not respond in {START_TIMEOUT}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def check_budget(results: dict, budget: dict) -> list[str]:
+    """Строки с превышениями бюджета."""
+    exceeded = []
+    for service, metrics in results.items():
+        for metric, value in metrics.items():
+            limit = budget.get(service, {}).get(metric)
+            if limit is not None and value > limit:
+                exceeded.append(
+                    f"{service} {metric}: {value:.0f} ms > budget {limit:.0f} ms"
+                )
+    return exceeded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--services", nargs="+", choices=SERVICES, default=list(SERVICES)
+    )
+    parser.add_argument("--budget", default=str(BUDGET_PATH))
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+    budget = json.loads(Path(args.budget).read_text())
+
+    results = {}
+    for service in args.services:
+        create_tables(service)
+        imports = [measure_import(service) for _ in range(args.runs)]
+        first_responses = [measure_first_response(service) for _ in range(args.runs)]
+        results[service] = {
+            "import_ms": statistics.median(total for total, _ in imports),
+            "first_response_ms": statistics.median(first_responses),
+        }
+        if args.top:
+            print(f"{service}: самые тяжелые импорты {SERVICES[service]['entry']}")
+            for cumulative, name in sorted(imports[-1][1], reverse=True)[: args.top]:
+                print(f"    {cumulative:>8.1f} ms  {name}")
+
+    print(
+        f"{'service':<10}{'import ms':>12}{'budget':>10}"
+        f"{'first resp ms':>16}{'budget':>10}"
+    )
+    for service, metrics in results.items():
+        limits = budget.get(service, {})
+        print(
+            f"{service:<10}{metrics['import_ms']:>12.0f}"
+            f"{limits.get('import_ms', float('nan')):>10.0f}"
+            f"{metrics['first_response_ms']:>16.0f}"
+            f"{limits.get('first_response_ms', float('nan')):>10.0f}"
+        )
+
+    exceeded = check_budget(results, budget)
+    for line in exceeded:
+        print(f"Бюджет превышен: {line}")
+    if exceeded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
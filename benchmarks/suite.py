@@ -0,0 +1,356 @@
+"""
+Нагрузочный набор для трех сервисов на заполненных базах.
+
+Для каждого размера --rows сервисы по очереди запускаются в отдельном
+процессе (каждый читает DATABASE_URL при импорте): база заполняется
+--rows строками, затем горячие эндпоинты опрашиваются в процессе
+клиентами фреймворков - TestClient FastAPI, тестовый клиент Flask и
+HTTP-сервер Tornado на свободном порту.
+
+Результаты (rps и p50/p95/p99 по эндпоинтам) пишутся в JSON. С --baseline
+они сравниваются с сохраненным прогоном: эндпоинт считается регрессией,
+если p50 вырос или rps упал больше чем на --threshold, и команда
+завершается с кодом 1. Изменение p95 выводится, но на коротких прогонах
+слишком шумное, чтобы по нему останавливать сборку. --save-baseline записывает прогон как новую базу.
+
+Базы переиспользуются, пока число строк совпадает с --rows.
+
+Запуск: python -m benchmarks.suite [--rows 10000 100000 1000000]
+        [--requests 300] [--output /tmp/suite.json] [--baseline benchmarks/baseline.json]
+        [--save-baseline] [--threshold 0.25] [--services product adv lead]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.utils import run_sequential, summarize
+
+SERVICES = ("product", "adv", "lead")
+SEED_BATCH = 50_000
+WARMUP_REQUESTS = 20
+CHANELS = ("Google", "TG", "VK", "Yandex", "YouTube")
+
+
+def _database_url(service: str, rows: int) -> str:
+    path = Path(tempfile.gettempdir()) / f"suite_{service}_{rows}.db"
+    return f"sqlite:///{path}"
+
+
+def _needs_seed(engine, model, rows: int) -> bool:
+    from sqlalchemy import func, inspect, select
+
+    inspector = inspect(engine)
+    if not inspector.has_table(model.__tablename__):
+        return True
+    columns = {column["name"] for column in inspector.get_columns(model.__tablename__)}
+    if columns != set(model.__table__.columns.keys()):
+        # Схема модели изменилась с прошлого запуска
+        return True
+    with engine.connect() as connection:
+        return connection.scalar(select(func.count()).select_from(model)) != rows
+
+
+def _insert_batches(engine, table, rows: int, make_row) -> None:
+    with engine.begin() as connection:
+        for start in range(0, rows, SEED_BATCH):
+            connection.execute(
+                table.insert(),
+                [make_row(i) for i in range(start, min(start + SEED_BATCH, rows))],
+            )
+
+
+def _measure_sync(calls: dict, requests: int) -> dict:
+    """Опрос синхронным тестовым клиентом: прогрев, затем requests вызовов."""
+    results = {}
+    for title, call in calls.items():
+
+        def checked(call=call, title=title):
+            response = call()
+            assert response.status_code == 200, (title, response.status_code)
+
+        for _ in range(WARMUP_REQUESTS):
+            checked()
+        results[title] = run_sequential(checked, requests)
+    return results
+
+
+def _bench_product(rows: int, requests: int) -> dict:
+    os.environ.setdefault("APP_NAME", "Product API")
+    os.environ.setdefault("APP_VERSION", "bench")
+    os.environ.setdefault("SECRET_KEY", "bench_secret_key")
+    os.environ.setdefault("DEBUG", "False")
+
+    from fastapi.testclient import TestClient
+
+    from product.product_repository.engine import get_engine
+    from product.product_repository.models import Base, ProductModel
+    from product.web.main import app
+
+    engine = get_engine()
+    if _needs_seed(engine, ProductModel, rows):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        _insert_batches(
+            engine,
+            ProductModel.__table__,
+            rows,
+            lambda i: {"name": f"product_{i}", "price": i % 10_000 + 0.99},
+        )
+
+    client = TestClient(app)
+    rng = random.Random(1)
+    calls = {
+        "GET /products?limit=50": lambda: client.get("/products?limit=50"),
+        "GET /products?limit=50&sort_field=price": lambda: client.get(
+            "/products?limit=50&sort_field=price&sort_order=desc"
+        ),
+        "GET /products/{name}": lambda: client.get(
+            f"/products/product_{rng.randrange(rows)}"
+        ),
+    }
+    return _measure_sync(calls, requests)
+
+
+def _bench_adv(rows: int, requests: int) -> dict:
+    from adv.adv_repository.adv_repository import AdvRepository
+    from adv.adv_repository.models import AdvModel, Base
+    from adv.web.app import create_app
+
+    app = create_app("production")
+    engine = app.db_engine
+    if _needs_seed(engine, AdvModel, rows):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        _insert_batches(
+            engine,
+            AdvModel.__table__,
+            rows,
+            lambda i: {
+                "name": f"adv_{i}",
+                "chanel": CHANELS[i % len(CHANELS)],
+                "cost": i % 1000 + 0.5,
+                "product_id": i % 1000,
+                "created_at": started + timedelta(minutes=i),
+            },
+        )
+        with app.app_context():
+            AdvRepository(app.db_session).rebuild_spend_stats()
+            app.db_session.commit()
+
+    client = app.test_client()
+    rng = random.Random(1)
+    calls = {
+        "GET /ads?limit=50": lambda: client.get("/ads?limit=50"),
+        "GET /ads/{id}": lambda: client.get(f"/ads/{rng.randrange(rows) + 1}"),
+        "GET /ads/stats?chanel=VK&week": lambda: client.get(
+            "/ads/stats?chanel=VK&date_from=2024-01-01&date_to=2024-01-07"
+        ),
+    }
+    return _measure_sync(calls, requests)
+
+
+def _bench_lead(rows: int, requests: int) -> dict:
+    import asyncio
+
+    from sqlalchemy import create_engine
+    from tornado.httpclient import AsyncHTTPClient
+    from tornado.httpserver import HTTPServer
+    from tornado.testing import bind_unused_port
+
+    from lead.app import app
+    from lead.lead_repository.async_unit_of_work import dispose_async_engine
+    from lead.lead_repository.models import Base, LeadModel
+    from lead.lead_service.normalize import with_keys
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    if _needs_seed(engine, LeadModel, rows):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        _insert_batches(
+            engine,
+            LeadModel.__table__,
+            rows,
+            lambda i: with_keys(
+                {
+                    "name": f"lead_{i}",
+                    "first_name": f"first_{i}",
+                    "phone": f"+7999{i:07d}",
+                    "email": f"lead_{i}@example.com",
+                    "adv_id": i % 1000,
+                }
+            ),
+        )
+    engine.dispose()
+
+    rng = random.Random(1)
+    paths = {
+        "GET /leads/list/?limit=50": lambda: "/leads/list/?limit=50",
+        "GET /leads/{id}": lambda: f"/leads/{rng.randrange(rows) + 1}",
+        # Код и пять первых цифр номера: до сотни совпадений по телефону
+        "GET /leads/search?q=": lambda: "/leads/search?q=7999"
+        + f"{rng.randrange(rows):07d}"[:5],
+    }
+
+    async def measure() -> dict:
+        sock, port = bind_unused_port()
+        server = HTTPServer(app())
+        server.add_sockets([sock])
+        client = AsyncHTTPClient()
+        results = {}
+        try:
+            for title, path in paths.items():
+                for _ in range(WARMUP_REQUESTS):
+                    await client.fetch(f"http://127.0.0.1:{port}{path()}")
+                latencies = []
+                started = time.perf_counter()
+                for _ in range(requests):
+                    request_started = time.perf_counter()
+                    await client.fetch(f"http://127.0.0.1:{port}{path()}")
+                    latencies.append(time.perf_counter() - request_started)
+                results[title] = summarize(latencies, time.perf_counter() - started)
+        finally:
+            server.stop()
+            # Иначе поток aiosqlite не даст процессу завершиться
+            await dispose_async_engine()
+        return results
+
+    return asyncio.run(measure())
+
+
+BENCHES = {"product": _bench_product, "adv": _bench_adv, "lead": _bench_lead}
+
+
+def run_service(service: str, rows: int, requests: int) -> dict:
+    """Выполняется в отдельном процессе: заполняет базу и опрашивает эндпоинты."""
+    os.environ["DATABASE_URL"] = _database_url(service, rows)
+    os.environ.setdefault("LEAD_CACHE_BACKEND", "none")
+    started = time.perf_counter()
+    results = BENCHES[service](rows, requests)
+    return {
+        "seconds": round(time.perf_counter() - started, 2),
+        "endpoints": {f"{service} {title}": row for title, row in results.items()},
+    }
+
+
+def _change(current: float, base: float) -> float:
+    return current / base - 1 if base else 0.0
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Сравнение с базой по общим размерам и эндпоинтам."""
+    rows = []
+    for size, endpoints in results["runs"].items():
+        base_endpoints = baseline.get("runs", {}).get(size, {})
+        for endpoint, current in endpoints.items():
+            base = base_endpoints.get(endpoint)
+            if base is None:
+                continue
+            row = {
+                "rows": size,
+                "endpoint": endpoint,
+                "p50_change": _change(current["p50_ms"], base["p50_ms"]),
+                "p95_change": _change(current["p95_ms"], base["p95_ms"]),
+                "rps_change": _change(current["rps"], base["rps"]),
+            }
+            row["regression"] = (
+                row["p50_change"] > threshold or row["rps_change"] < -threshold
+            )
+            rows.append(row)
+    return rows
+
+
+def print_results(results: dict) -> None:
+    for size, endpoints in results["runs"].items():
+        print(f"\n{size} строк")
+        print(f"{'endpoint':<48}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for endpoint, row in endpoints.items():
+            print(
+                f"{endpoint:<48}{row['rps']:>9.1f}{row['p50_ms']:>9.2f}"
+                f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+            )
+
+
+def print_comparison(rows: list[dict], threshold: float) -> None:
+    print(f"\nСравнение с базой (порог {threshold:.0%})")
+    print(f"{'rows':>8}  {'endpoint':<48}{'p50':>9}{'p95':>9}{'rps':>9}")
+    for row in rows:
+        mark = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['rows']:>8}  {row['endpoint']:<48}"
+            f"{row['p50_change']:>+9.0%}{row['p95_change']:>+9.0%}"
+            f"{row['rps_change']:>+9.0%}{mark}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--services", nargs="+", choices=SERVICES, default=SERVICES)
+    parser.add_argument(
+        "--output", default=str(Path(tempfile.gettempdir()) / "suite.json")
+    )
+    parser.add_argument("--baseline")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "requests": args.requests,
+        },
+        "service_seconds": {},
+        "runs": {},
+    }
+    context = multiprocessing.get_context("spawn")
+    for rows in args.rows:
+        endpoints = {}
+        for service in args.services:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                run = executor.submit(run_service, service, rows, args.requests)
+                run = run.result()
+            results["service_seconds"][f"{service} {rows}"] = run["seconds"]
+            endpoints.update(run["endpoints"])
+        results["runs"][str(rows)] = endpoints
+
+    print_results(results)
+    Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"\nРезультаты: {args.output}")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(
+            json.dumps(results, indent=2, ensure_ascii=False)
+        )
+        print(f"База сохранена: {args.baseline}")
+        return
+    if args.baseline:
+        comparison = compare(
+            results, json.loads(Path(args.baseline).read_text()), args.threshold
+        )
+        print_comparison(comparison, args.threshold)
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Общие утилиты бенчмарков"""
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def configure_product_env(db_name: str = "product_bench.db") -> str:
+    """Задает переменные окружения сервиса Product до его импорта."""
+    database_url = f"sqlite:///{Path(tempfile.gettempdir()) / db_name}"
+    os.environ.setdefault("APP_NAME", "Product API")
+    os.environ.setdefault("APP_VERSION", "bench")
+    os.environ.setdefault("SECRET_KEY", "bench_secret_key")
+    os.environ.setdefault("DEBUG", "False")
+    os.environ.setdefault("DATABASE_URL", database_url)
+    return os.environ["DATABASE_URL"]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Перцентиль по методу ближайшего ранга."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    """Пропускная способность и перцентили задержки в миллисекундах."""
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run_sequential(call, requests: int) -> dict:
+    """Выполняет call() заданное число раз и возвращает сводку."""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - request_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def print_table(title: str, rows: dict[str, dict]) -> None:
+    print(title)
+    print(f"{'mode':<24}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in rows.items():
+        print(
+            f"{name:<24}{row['rps']:>10.1f}{row['p50_ms']:>10.2f}"
+            f"{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+        )
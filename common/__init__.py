@@ -0,0 +1 @@
+"""Общий код сервисов Product, Advertisement и Lead"""
@@ -0,0 +1,47 @@
+"""
+Общие помощники подключения к БД сервисов: asyncio-драйверы и сброс
+пулов движков, созданных до fork.
+"""
+
+import os
+import weakref
+
+from sqlalchemy import Engine
+from sqlalchemy.engine import make_url
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_fork_safe_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def to_async_url(database_url: str) -> str:
+    """Заменяет синхронный драйвер в URL на asyncio-драйвер."""
+    url = make_url(database_url)
+    if url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return database_url
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{url.drivername}'")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def reset_pool_after_fork(engine: Engine) -> Engine:
+    """
+    Регистрирует движок, который может быть создан до fork (preload_app
+    gunicorn): в дочернем процессе его пул сбрасывается без закрытия
+    соединений родителя, воркер открывает свои соединения.
+    """
+    _fork_safe_engines.add(engine)
+    return engine
+
+
+def _reset_pools_after_fork() -> None:
+    for engine in list(_fork_safe_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -0,0 +1,42 @@
+"""
+Сильные ETag по версии строки и проверка If-None-Match.
+
+Версия строки (колонка version) увеличивается каждым UPDATE, поэтому
+пары (id, version) достаточно, чтобы понять, изменился ли ресурс,
+не сериализуя его. ETag страницы списка считается по парам (id, version)
+всех строк страницы и курсору следующей страницы: так он меняется и при
+обновлении строки, и когда на страницу попадает новая или пропадает
+удаленная строка, и когда за страницей появляется следующая.
+"""
+
+import hashlib
+from typing import Iterable
+
+
+def resource_etag(id_, version) -> str:
+    """ETag одного ресурса."""
+    return f'"{id_}-{version}"'
+
+
+def page_etag(rows: Iterable, next_cursor: str | None = None) -> str:
+    """ETag страницы по атрибутам id и version ее строк и курсору следующей."""
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(f"{row.id}-{row.version},".encode())
+    digest.update(f"next:{next_cursor or ''}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Совпадает ли etag с заголовком If-None-Match.
+    Для GET сравнение слабое (RFC 9110): префикс W/ не учитывается.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
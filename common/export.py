@@ -0,0 +1,89 @@
+"""
+Построчная сериализация выгрузок в CSV и NDJSON.
+
+Функции принимают итератор строк БД и отдают закодированные строки
+по одной, поэтому в памяти одновременно находится только одна строка.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, Sequence
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    return _json_value(value)
+
+
+class _CsvEncoder:
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def encode(self, values) -> bytes:
+        self.writer.writerow(values)
+        encoded = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return encoded
+
+
+def csv_header(columns: Sequence[str]) -> bytes:
+    return _CsvEncoder().encode(columns)
+
+
+def csv_rows(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    encoder = _CsvEncoder()
+    for row in rows:
+        yield encoder.encode([_csv_value(value) for value in row])
+
+
+def csv_lines(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    yield csv_header(columns)
+    yield from csv_rows(rows)
+
+
+def ndjson_lines(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[bytes]:
+    for row in rows:
+        record = {column: _json_value(value) for column, value in zip(columns, row)}
+        yield json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+def buffered(lines: Iterable[bytes], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Склеивает строки в куски около chunk_size байт, чтобы не писать по строке."""
+    chunk, size = [], 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+def export_lines(
+    export_format: str, columns: Sequence[str], rows: Iterable[Sequence]
+) -> Iterator[bytes]:
+    if export_format == "csv":
+        return csv_lines(columns, rows)
+    if export_format == "ndjson":
+        return ndjson_lines(columns, rows)
+    raise ValueError(f"Unknown export format '{export_format}'")
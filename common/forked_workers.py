@@ -0,0 +1,95 @@
+"""
+Проверка движка БД под несколькими воркерами после fork.
+
+run_forked_workers повторяет модель preload_app gunicorn: приложение
+загружено в родителе, процесс форкается на несколько воркеров, и каждый
+выполняет запросы из нескольких потоков. Соединения пула помечаются pid
+процесса, открывшего их: соединение родителя, выданное воркеру,
+считается общим и попадает в отчет воркера.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, List
+
+from sqlalchemy import Engine, event
+
+MAX_REPORTED_ERRORS = 5
+
+
+def _on_connect(dbapi_connection, connection_record):
+    connection_record.info["pid"] = os.getpid()
+
+
+def _serve(call: Callable[[], None], threads: int, requests: int, shared: list):
+    errors = []
+
+    def worker():
+        for _ in range(requests):
+            try:
+                call()
+            except Exception as e:
+                errors.append(repr(e))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return {
+        "pid": os.getpid(),
+        "requests": threads * requests,
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "error_count": len(errors),
+        "shared_connections": len(shared),
+    }
+
+
+def run_forked_workers(
+    engine: Engine,
+    call: Callable[[], None],
+    workers: int = 3,
+    threads: int = 4,
+    requests: int = 20,
+) -> List[dict]:
+    """
+    Форкает workers процессов, в каждом threads потоков вызывают call
+    requests раз. Возвращает отчеты воркеров: pid, число запросов, ошибки
+    и число соединений, полученных из пула другого процесса.
+    """
+    shared = []
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info.get("pid") != os.getpid():
+            shared.append(connection_record.info.get("pid"))
+
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "checkout", on_checkout)
+    children = []
+    try:
+        for _ in range(workers):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    os.close(read_fd)
+                    report = _serve(call, threads, requests, shared)
+                    os.write(write_fd, json.dumps(report).encode())
+                    status = 0
+                finally:
+                    os._exit(status)
+            os.close(write_fd)
+            children.append((pid, read_fd))
+
+        reports = []
+        for pid, read_fd in children:
+            with os.fdopen(read_fd, "rb") as pipe:
+                payload = pipe.read()
+            os.waitpid(pid, 0)
+            reports.append(json.loads(payload) if payload else {"pid": pid})
+        return reports
+    finally:
+        event.remove(engine, "connect", _on_connect)
+        event.remove(engine, "checkout", on_checkout)
@@ -0,0 +1,214 @@
+"""
+Замеры времени запроса и SQL-запросов для всех трех сервисов.
+
+instrument_engine подписывается на before/after_cursor_execute движка и
+складывает число запросов и время в БД в метрики текущего HTTP-запроса
+(contextvar, поэтому работает и в потоках FastAPI, и в асинхронных
+сессиях Tornado). Адаптеры фреймворков открывают и закрывают метрики:
+
+    ASGIInstrumentation       - ASGI middleware для FastAPI (product);
+    instrument_flask          - before_request/after_request для Flask (adv);
+    InstrumentedHandlerMixin  - prepare/on_finish для Tornado (lead).
+
+Каждый ответ получает заголовок Server-Timing (db, app, total), а в лог
+common.instrumentation пишется JSON-строка с маршрутом, статусом,
+временем в БД, числом запросов и полным временем.
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Tuple
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    __slots__ = ("started", "queries", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        db_ms = self.db_seconds * 1000
+        total_ms = total * 1000
+        return (
+            f'db;desc="{self.queries} queries";dur={db_ms:.2f}, '
+            f"app;dur={total_ms - db_ms:.2f}, total;dur={total_ms:.2f}"
+        )
+
+
+def current_metrics() -> RequestMetrics | None:
+    return _current.get()
+
+
+def start_request() -> Tuple[RequestMetrics, Token]:
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(
+    token: Token,
+    metrics: RequestMetrics,
+    service: str,
+    method: str,
+    route: str,
+    status: int,
+) -> None:
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Запрос завершился в другом контексте (другая задача asyncio)
+        pass
+    total = metrics.elapsed()
+    logger.info(
+        json.dumps(
+            {
+                "service": service,
+                "method": method,
+                "route": route,
+                "status": status,
+                "total_ms": round(total * 1000, 2),
+                "db_ms": round(metrics.db_seconds * 1000, 2),
+                "queries": metrics.queries,
+            }
+        )
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("instrumentation_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info["instrumentation_started"].pop()
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("instrumentation_started"):
+        connection.info["instrumentation_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Подключает счетчики SQL к движку, повторный вызов ничего не меняет."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+class ASGIInstrumentation:
+    """ASGI middleware: Server-Timing в ответе и строка лога на каждый HTTP-запрос."""
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics, token = start_request()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = metrics.server_timing(metrics.elapsed()).encode()
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", header),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            finish_request(token, metrics, self.service, scope["method"], route, status)
+
+
+def instrument_flask(app, service: str):
+    """Замеры запросов приложения Flask через before_request/after_request."""
+    from flask import g, request
+
+    @app.before_request
+    def start_instrumentation():
+        g.instrumentation = start_request()
+
+    @app.after_request
+    def add_server_timing(response):
+        metrics, _ = g.instrumentation
+        response.headers["Server-Timing"] = metrics.server_timing(metrics.elapsed())
+        g.response_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_instrumentation(exception=None):
+        started = g.pop("instrumentation", None)
+        if started is None:
+            return
+        metrics, token = started
+        route = request.url_rule.rule if request.url_rule else request.path
+        status = 500 if exception is not None else g.get("response_status", 500)
+        finish_request(token, metrics, service, request.method, route, status)
+
+    return app
+
+
+class InstrumentedHandlerMixin:
+    """
+    Замеры для RequestHandler Tornado. Подмешивается перед RequestHandler;
+    SERVICE задает имя сервиса в логе, маршрутом считается имя обработчика.
+    """
+
+    SERVICE = "lead"
+
+    def prepare(self):
+        self._instrumentation = start_request()
+        return super().prepare()
+
+    def flush(self, include_footers=False):
+        # finish() тоже отправляет заголовки через flush(); для потоковых
+        # ответов Server-Timing показывает время до первого байта
+        started = getattr(self, "_instrumentation", None)
+        if started is not None and not self._headers_written:
+            metrics, _ = started
+            self.set_header("Server-Timing", metrics.server_timing(metrics.elapsed()))
+        return super().flush(include_footers)
+
+    def on_finish(self):
+        started = getattr(self, "_instrumentation", None)
+        if started is not None:
+            metrics, token = started
+            finish_request(
+                token,
+                metrics,
+                self.SERVICE,
+                self.request.method,
+                type(self).__name__,
+                self.get_status(),
+            )
+        super().on_finish()
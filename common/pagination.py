@@ -0,0 +1,120 @@
+"""
+Курсорная (keyset) пагинация.
+
+Курсор - непрозрачный токен с последним отданным значением
+(sort_field, id). Следующая страница выбирается условием
+WHERE (column, id) > (value, last_id), поэтому ее стоимость не зависит
+от номера страницы, в отличие от LIMIT/OFFSET.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _dump_value(value: Any) -> list:
+    if isinstance(value, Decimal):
+        return ["decimal", str(value)]
+    if isinstance(value, datetime):
+        return ["datetime", value.isoformat()]
+    return ["raw", value]
+
+
+def _load_value(value: list) -> Any:
+    kind, raw = value
+    if kind == "decimal":
+        return Decimal(raw)
+    if kind == "datetime":
+        return datetime.fromisoformat(raw)
+    if kind == "raw":
+        return raw
+    raise InvalidCursorError(f"Unknown cursor value type '{kind}'")
+
+
+def encode_cursor(sort_field: str | None, sort_order: str, value: Any, id_: int) -> str:
+    payload = {"f": sort_field, "o": sort_order, "v": _dump_value(value), "id": id_}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        return {
+            "sort_field": payload["f"],
+            "sort_order": payload["o"],
+            "value": _load_value(payload["v"]),
+            "id": int(payload["id"]),
+        }
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def apply_keyset(
+    query,
+    model,
+    sort_field: str | None,
+    sort_order: str | None,
+    cursor: str | None,
+):
+    """
+    Добавляет к Query/Select сортировку по (sort_field, id) и условие
+    продолжения после курсора. Возвращает запрос и фактические
+    sort_field, sort_order.
+    """
+    sort_order = (sort_order or "asc").lower()
+    column = None
+    if sort_field is not None:
+        column = getattr(model, sort_field, None)
+        if column is None:
+            print(f"Warning: Sort field '{sort_field}' not found in {model.__name__}.")
+            sort_field = None
+
+    descending = sort_order == "desc"
+    if column is None:
+        query = query.order_by(model.id.desc() if descending else model.id.asc())
+    elif descending:
+        query = query.order_by(column.desc(), model.id.desc())
+    else:
+        query = query.order_by(column.asc(), model.id.asc())
+
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        if (position["sort_field"], position["sort_order"]) != (sort_field, sort_order):
+            raise InvalidCursorError("Cursor does not match sort parameters")
+        if column is None:
+            condition = (
+                model.id < position["id"] if descending else model.id > position["id"]
+            )
+        else:
+            key = tuple_(column, model.id)
+            last = tuple_(position["value"], position["id"])
+            condition = key < last if descending else key > last
+        query = query.where(condition)
+
+    return query, sort_field, sort_order
+
+
+def split_page(
+    records: List[Any], limit: int, sort_field: str | None, sort_order: str
+) -> Tuple[List[Any], str | None]:
+    """
+    Делит limit + 1 выбранных записей на страницу и курсор следующей.
+    Курсор равен None, если страница последняя.
+    """
+    if len(records) <= limit:
+        return records, None
+    page = records[:limit]
+    last = page[-1]
+    value = getattr(last, sort_field) if sort_field is not None else None
+    return page, encode_cursor(sort_field, sort_order, value, last.id)
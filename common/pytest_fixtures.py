@@ -0,0 +1,30 @@
+"""
+Общие фикстуры pytest для тестов сервисов, подключаются корневым conftest.py.
+
+db_engine создает SQLite в памяти со схемой из фикстуры db_metadata,
+которую определяет модуль тестов сервиса:
+
+    @pytest.fixture
+    def db_metadata():
+        return Base.metadata
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from common.query_budget import QueryBudget
+
+
+@pytest.fixture
+def db_engine(db_metadata):
+    """Движок SQLite в памяти со схемой сервиса."""
+    engine = create_engine("sqlite://")
+    db_metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budget(db_engine):
+    """Бюджет запросов к db_engine: with query_budget(2): ..."""
+    return lambda limit: QueryBudget(db_engine, limit)
@@ -0,0 +1,65 @@
+"""
+Бюджет SQL-запросов для тестов репозиториев и сервисов.
+
+StatementRecorder записывает SQL, выполненный движком, QueryBudget
+падает с AssertionError и списком запросов, если блок выполнил их больше,
+чем разрешено:
+
+    with QueryBudget(engine, 2):
+        service.update_product("name", {...})
+
+Так лишний запрос (N+1, повторный поиск перед UPDATE) ломает тест,
+а не тихо добавляет круг до БД. Принимает и AsyncEngine (через sync_engine).
+"""
+
+from typing import List
+
+from sqlalchemy import event
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, limit: int, statements: List[str]):
+        self.limit = limit
+        self.statements = statements
+        listing = "\n".join(
+            f"  {number}. {statement}"
+            for number, statement in enumerate(statements, start=1)
+        )
+        super().__init__(
+            f"Expected at most {limit} SQL statements, "
+            f"executed {len(statements)}:\n{listing}"
+        )
+
+
+class StatementRecorder:
+    """Список SQL-запросов движка, выполненных внутри блока with."""
+
+    def __init__(self, engine):
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+
+class QueryBudget(StatementRecorder):
+    """Не более limit SQL-запросов внутри блока with."""
+
+    def __init__(self, engine, limit: int):
+        super().__init__(engine)
+        self.limit = limit
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if exc_type is None and len(self.statements) > self.limit:
+            raise QueryBudgetExceeded(self.limit, self.statements)
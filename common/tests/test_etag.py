@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from common.etag import etag_matches, page_etag, resource_etag
+
+
+def rows(*pairs):
+    return [SimpleNamespace(id=id_, version=version) for id_, version in pairs]
+
+
+def test_resource_etag_is_strong():
+    assert resource_etag(7, 3) == '"7-3"'
+
+
+def test_page_etag_changes_with_versions_and_membership():
+    etag = page_etag(rows((1, 1), (2, 1)))
+
+    assert page_etag(rows((1, 1), (2, 1))) == etag
+    assert page_etag(rows((1, 1), (2, 2))) != etag
+    assert page_etag(rows((1, 1), (3, 1))) != etag
+    assert page_etag(rows((1, 1))) != etag
+
+
+def test_page_etag_changes_with_next_cursor():
+    etag = page_etag(rows((1, 1), (2, 1)))
+
+    assert page_etag(rows((1, 1), (2, 1)), None) == etag
+    assert page_etag(rows((1, 1), (2, 1)), "cursor") != etag
+
+
+def test_etag_matches_if_none_match():
+    assert etag_matches('"7-3"', '"7-3"')
+    assert etag_matches('"1-1", "7-3"', '"7-3"')
+    assert etag_matches('W/"7-3"', '"7-3"')
+    assert etag_matches("*", '"7-3"')
+    assert not etag_matches('"7-2"', '"7-3"')
+    assert not etag_matches(None, '"7-3"')
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from common.database import reset_pool_after_fork
+from common.forked_workers import run_forked_workers
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'workers.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    yield engine
+    engine.dispose()
+
+
+def select_one(engine):
+    def call():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    return call
+
+
+def test_reports_connections_inherited_from_parent_pool(engine):
+    reports = run_forked_workers(engine, select_one(engine), threads=1, requests=3)
+
+    assert all(report["shared_connections"] > 0 for report in reports)
+
+
+def test_registered_engine_gets_new_pool_in_each_worker(engine):
+    reset_pool_after_fork(engine)
+
+    reports = run_forked_workers(engine, select_one(engine))
+
+    for report in reports:
+        assert report["requests"] == 80
+        assert report["errors"] == []
+        assert report["shared_connections"] == 0
@@ -0,0 +1,92 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+pytest.importorskip("gunicorn")
+httpx = pytest.importorskip("httpx")
+
+ROOT = Path(__file__).parent.parent.parent
+
+SERVICES = {
+    "product": (
+        "product.web.gunicorn_conf",
+        "product.product_repository.models",
+        "/products?limit=10",
+    ),
+    "adv": ("adv.web.gunicorn_conf", "adv.adv_repository.models", "/ads"),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(params=SERVICES)
+def server(request, tmp_path):
+    """Сервис под gunicorn с тремя воркерами на временной БД."""
+    config, models, path = SERVICES[request.param]
+    database_url = f"sqlite:///{tmp_path / 'workers.db'}"
+    engine = create_engine(database_url)
+    __import__(models, fromlist=["Base"]).Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": "3",
+        "FLASK_ENV": "production",
+        "APP_NAME": "Product API",
+        "APP_VERSION": "test",
+        "SECRET_KEY": "test_secret_key",
+        "DEBUG": "False",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", f"python:{config}"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    url = f"http://127.0.0.1:{port}{path}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=5)
+            break
+        except httpx.TransportError:
+            assert process.poll() is None, process.stderr.read().decode()
+            time.sleep(0.1)
+    yield url
+    process.terminate()
+    _, stderr = process.communicate(timeout=30)
+    assert b"Traceback" not in stderr, stderr.decode()
+
+
+def test_workers_serve_concurrent_requests(server):
+    """Воркеры из preload-приложения отвечают на параллельные запросы без ошибок."""
+    with httpx.Client(timeout=30) as client:
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            statuses = list(
+                executor.map(lambda _: client.get(server).status_code, range(120))
+            )
+
+    assert statuses == [200] * 120
+
+
+@pytest.mark.parametrize("server", ["product"], indirect=True)
+def test_product_cache_is_off_with_several_workers(server):
+    """Кэш в памяти воркера не видит записей других воркеров и выключен."""
+    response = httpx.get(httpx.URL(server).join("/cache/stats"), timeout=30)
+
+    assert response.json() == {"products": None}
@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from common.instrumentation import (
+    current_metrics,
+    finish_request,
+    instrument_engine,
+    start_request,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = instrument_engine(create_engine("sqlite://"))
+    yield engine
+    engine.dispose()
+
+
+def test_counts_queries_of_current_request(engine):
+    metrics, token = start_request()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+    finish_request(token, metrics, "test", "GET", "/items", 200)
+
+    assert metrics.queries == 2
+    assert metrics.db_seconds > 0
+    assert current_metrics() is None
+
+
+def test_queries_outside_request_are_ignored(engine):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert current_metrics() is None
+
+
+def test_instrument_engine_is_idempotent(engine):
+    instrument_engine(engine)
+    metrics, token = start_request()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    finish_request(token, metrics, "test", "GET", "/items", 200)
+    assert metrics.queries == 1
+
+
+def test_failed_query_does_not_break_counting(engine):
+    metrics, token = start_request()
+    with engine.connect() as connection:
+        with pytest.raises(Exception):
+            connection.execute(text("SELECT * FROM missing"))
+        connection.execute(text("SELECT 1"))
+    finish_request(token, metrics, "test", "GET", "/items", 200)
+    assert metrics.queries == 1
+
+
+def test_server_timing_header():
+    metrics, token = start_request()
+    metrics.queries = 3
+    metrics.db_seconds = 0.004
+    header = metrics.server_timing(0.010)
+    finish_request(token, metrics, "test", "GET", "/items", 200)
+    assert header == 'db;desc="3 queries";dur=4.00, app;dur=6.00, total;dur=10.00'
+
+
+def test_log_line(caplog):
+    metrics, token = start_request()
+    metrics.queries = 2
+    with caplog.at_level(logging.INFO, logger="common.instrumentation"):
+        finish_request(token, metrics, "product", "GET", "/products/{id}", 404)
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["service"] == "product"
+    assert record["method"] == "GET"
+    assert record["route"] == "/products/{id}"
+    assert record["status"] == 404
+    assert record["queries"] == 2
+    assert record["total_ms"] >= record["db_ms"] >= 0
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import DateTime, Numeric, String, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from common.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    split_page,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class ItemModel(Base):
+    __tablename__ = "item"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(30))
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+@pytest.fixture
+def session():
+    """Фикстура с сессией SQLite в памяти и записями с повторяющимися значениями."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    started = datetime(2025, 1, 1)
+    with Session(engine) as session:
+        session.add_all(
+            ItemModel(
+                name=f"item_{i % 4}",
+                price=Decimal(f"{i % 5}.50"),
+                created_at=started + timedelta(hours=i % 3),
+            )
+            for i in range(23)
+        )
+        session.commit()
+        yield session
+
+
+def walk(session, sort_field, sort_order, limit=5):
+    items, cursor = [], None
+    while True:
+        query, field, order = apply_keyset(
+            session.query(ItemModel), ItemModel, sort_field, sort_order, cursor
+        )
+        page, cursor = split_page(query.limit(limit + 1).all(), limit, field, order)
+        items.extend(page)
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("sort_field", [None, "name", "price", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_walk_matches_full_ordering(session, sort_field, sort_order):
+    """Проход по курсорам дает ту же последовательность, что и полная сортировка."""
+    key = (
+        (lambda item: item.id)
+        if sort_field is None
+        else (lambda item: (getattr(item, sort_field), item.id))
+    )
+    expected = sorted(session.query(ItemModel).all(), key=key)
+    if sort_order == "desc":
+        expected.reverse()
+
+    assert [item.id for item in walk(session, sort_field, sort_order)] == [
+        item.id for item in expected
+    ]
+
+
+def test_cursor_roundtrip():
+    token = encode_cursor("price", "desc", Decimal("10.50"), 7)
+    assert decode_cursor(token) == {
+        "sort_field": "price",
+        "sort_order": "desc",
+        "value": Decimal("10.50"),
+        "id": 7,
+    }
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_must_match_sort_parameters(session):
+    token = encode_cursor("name", "asc", "item_1", 3)
+    with pytest.raises(InvalidCursorError):
+        apply_keyset(session.query(ItemModel), ItemModel, "price", "asc", token)
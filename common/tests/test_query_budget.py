@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from common.query_budget import QueryBudget, QueryBudgetExceeded, StatementRecorder
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_recorder_collects_statements_inside_block(engine):
+    with engine.connect() as connection:
+        with StatementRecorder(engine) as recorder:
+            connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+
+    assert recorder.statements == ["SELECT 1"]
+
+
+def test_budget_allows_statements_within_limit(engine):
+    with engine.connect() as connection:
+        with QueryBudget(engine, 2) as budget:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    assert len(budget) == 2
+
+
+def test_budget_exceeded_lists_statements(engine):
+    with engine.connect() as connection:
+        with pytest.raises(QueryBudgetExceeded) as error:
+            with QueryBudget(engine, 1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+    message = str(error.value)
+    assert "at most 1 SQL statements, executed 2" in message
+    assert "1. SELECT 1" in message
+    assert "2. SELECT 2" in message
+
+
+def test_budget_does_not_mask_errors(engine):
+    with pytest.raises(ZeroDivisionError):
+        with QueryBudget(engine, 0):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            1 / 0
@@ -0,0 +1,21 @@
+"""
+Общие настройки gunicorn для запуска сервисов несколькими воркерами.
+
+Конфигурации сервисов (product/web/gunicorn_conf.py,
+adv/web/gunicorn_conf.py) загружают приложение в мастер-процессе
+(preload_app) и прогревают его до fork. Воркеры наследуют настройки,
+маршруты и схемы, а пулы соединений движков сбрасываются в каждом
+воркере после fork.
+"""
+
+import os
+
+
+def default_bind() -> str:
+    """Адрес из BIND, по умолчанию 0.0.0.0:8000."""
+    return os.environ.get("BIND", "0.0.0.0:8000")
+
+
+def default_workers() -> int:
+    """Число воркеров из WEB_CONCURRENCY, по умолчанию 2 * CPU + 1."""
+    return int(os.environ.get("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
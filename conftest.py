@@ -0,0 +1 @@
+pytest_plugins = ["common.pytest_fixtures"]
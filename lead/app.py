@@ -6,6 +6,8 @@ import logging
 
 import tornado
 
+from lead.lead_repository.async_unit_of_work import init_models
+from lead.lead_settings.app_settings import get_settings
 from lead.web.routers import routers
 
 
@@ -16,8 +18,10 @@ def app():
 if __name__ == "__main__":
     try:
         app = app()
-        app.listen(8000)
-        logging.info("Server started on port 8000")  # Добавьте логирование
+        tornado.ioloop.IOLoop.current().run_sync(init_models)
+        port = get_settings().port
+        app.listen(port)
+        logging.info(f"Server started on port {port}")  # Добавьте логирование
         tornado.ioloop.IOLoop.current().start()
     except OSError as e:
         logging.error(
@@ -0,0 +1,263 @@
+from typing import Dict, Any, AsyncIterator, Iterable, List, Set, Tuple
+
+from sqlalchemy import delete, insert, or_, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.pagination import apply_keyset, split_page
+from lead.lead_repository.models import LeadModel, lead_search
+from lead.lead_service.lead import Lead, LeadRow
+from lead.lead_service.normalize import normalize_email, normalize_phone, with_keys
+
+SEARCH_COLUMNS = ("name", "first_name", "email", "phone")
+
+
+def search_match(query: str) -> str | None:
+    """
+    Выражение MATCH для FTS5: каждое слово запроса в кавычках, найтись должны все.
+    Слова короче трех символов триграммный индекс не ищет, их проверяет
+    search_word_filter.
+    """
+    terms = [term for term in query.split() if len(term) >= 3]
+    if not terms:
+        return None
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_word_filter(word: str):
+    """Условие: слово встречается подстрокой хотя бы в одной из SEARCH_COLUMNS."""
+    return or_(
+        *(
+            getattr(LeadModel, column).icontains(word, autoescape=True)
+            for column in SEARCH_COLUMNS
+        )
+    )
+
+
+class AsyncLeadRepository:
+    """
+    Асинхронный репозиторий для Lead поверх AsyncSession.
+    Повторяет интерфейс LeadRepository, методы являются корутинами.
+    """
+
+    EXPORT_COLUMNS = LeadRow.__slots__
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def after_commit(self, callback) -> None:
+        """Регистрирует корутину callback, которую AsyncUnitOfWork вызовет после commit."""
+        self.session.info.setdefault("after_commit", []).append(callback)
+
+    def _select_rows(self):
+        """SELECT колонок LeadRow без загрузки ORM-объектов."""
+        return select(*(getattr(LeadModel, column) for column in LeadRow.__slots__))
+
+    async def _get_lead(self, id_: int | None) -> LeadModel | None:
+        if id_ is None:
+            # Маршрут /leads/?(\d+)? передает None, если id в пути нет
+            return None
+        try:
+            return await self.session.get(LeadModel, int(id_))
+        except SQLAlchemyError as e:
+            print(f"Error getting lead: {e}")
+            return None
+
+    async def get_list(
+        self,
+        limit: int | None,
+        offset: int | None,
+        sort_field: str | None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> List[LeadRow] | None:
+        try:
+            query = self._select_rows().filter_by(**filters)
+            if sort_field is not None:
+                column = getattr(LeadModel, sort_field, None)
+                if column is not None:
+                    if sort_order.lower() == "desc":
+                        query = query.order_by(column.desc())
+                    else:
+                        query = query.order_by(column.asc())
+                else:
+                    print(f"Warning: Sort field '{sort_field}' not found in LeadModel.")
+
+            if limit is not None:
+                query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
+            return [LeadRow(*row) for row in await self.session.execute(query)]
+
+        except SQLAlchemyError as e:
+            print(f"Error getting lead: {e}")
+            return None
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort_field: str | None = None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> Tuple[List[LeadRow] | None, str | None]:
+        try:
+            query = self._select_rows().filter_by(**filters)
+            query, sort_field, sort_order = apply_keyset(
+                query, LeadModel, sort_field, sort_order, cursor
+            )
+            result = await self.session.execute(query.limit(limit + 1))
+            records = [LeadRow(*row) for row in result]
+            return split_page(records, limit, sort_field, sort_order)
+
+        except SQLAlchemyError as e:
+            print(f"Error getting lead: {e}")
+            return None, None
+
+    async def search(self, query: str, limit: int, offset: int = 0) -> List[LeadRow]:
+        """
+        Поиск подстроки в name, first_name, email и phone: каждое слово
+        запроса должно найтись хотя бы в одном поле.
+        На SQLite слова от трех символов ищутся по FTS5-индексу lead_search
+        с ранжированием bm25, более короткие проверяются ILIKE по найденным
+        строкам. Для других СУБД все слова проверяются ILIKE.
+        """
+        words = query.split()
+        match = search_match(query)
+        if match is not None and self.session.bind.dialect.name == "sqlite":
+            matches = (
+                select(lead_search.c.rowid.label("id"), lead_search.c.rank)
+                .where(text("lead_search MATCH :match").bindparams(match=match))
+                .subquery()
+            )
+            rows = (
+                self._select_rows()
+                .join(matches, matches.c.id == LeadModel.id)
+                .where(*(search_word_filter(word) for word in words if len(word) < 3))
+                .order_by(matches.c.rank)
+            )
+        else:
+            rows = (
+                self._select_rows()
+                .where(*(search_word_filter(word) for word in words))
+                .order_by(LeadModel.id)
+            )
+        rows = rows.limit(limit).offset(offset)
+        return [LeadRow(*row) for row in await self.session.execute(rows)]
+
+    async def stream_rows(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Отдает пачки кортежей EXPORT_COLUMNS через серверный курсор,
+        не создавая ORM-объекты.
+        """
+        query = (
+            self._select_rows()
+            .filter_by(**filters)
+            .order_by(LeadModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    async def add(self, lead) -> Lead | None:
+        try:
+            record = LeadModel(**with_keys(lead))
+            self.session.add(record)
+            await self.session.flush()
+            return Lead(**record.dict(), lead_=record)
+        except SQLAlchemyError as e:
+            print(f"Error adding lead: {e}")
+            return None
+
+    async def add_many(self, leads: List[Dict[str, Any]]) -> int:
+        """Вставляет лиды одним executemany, возвращает число вставленных строк."""
+        if not leads:
+            return 0
+        await self.session.execute(
+            insert(LeadModel), [with_keys(lead) for lead in leads]
+        )
+        return len(leads)
+
+    async def find_duplicate(self, lead: Dict[str, Any]) -> int | None:
+        """
+        id лида с тем же нормализованным email или телефоном.
+        Один запрос с LIMIT 1 по индексам email_normalized и phone_normalized.
+        """
+        query = (
+            select(LeadModel.id)
+            .where(
+                or_(
+                    LeadModel.email_normalized == normalize_email(lead["email"]),
+                    LeadModel.phone_normalized == normalize_phone(lead["phone"]),
+                )
+            )
+            .limit(1)
+        )
+        return await self.session.scalar(query)
+
+    async def find_existing_keys(
+        self, emails: Iterable[str], phones: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Нормализованные email и телефоны из переданных, которые уже есть в БД."""
+        emails, phones = list(emails), list(phones)
+        if not emails and not phones:
+            return set(), set()
+        result = await self.session.execute(
+            select(LeadModel.email_normalized, LeadModel.phone_normalized).where(
+                or_(
+                    LeadModel.email_normalized.in_(emails),
+                    LeadModel.phone_normalized.in_(phones),
+                )
+            )
+        )
+        existing_emails, existing_phones = set(), set()
+        for email, phone in result:
+            existing_emails.add(email)
+            existing_phones.add(phone)
+        return existing_emails, existing_phones
+
+    async def get(self, id_: int) -> Lead | None:
+        lead = await self._get_lead(id_)
+        if lead:
+            return Lead(**lead.dict())
+        return None
+
+    async def update(self, id_, new_lead: Dict[str, Any]) -> Lead | None:
+        """Обновляет лид одним UPDATE ... RETURNING, None если лид не найден."""
+        if id_ is None:
+            return None
+        try:
+            result = await self.session.scalars(
+                update(LeadModel)
+                .where(LeadModel.id == int(id_))
+                .values(**with_keys(new_lead))
+                .returning(LeadModel),
+                execution_options={"synchronize_session": False},
+            )
+            record = result.first()
+            if record is None:
+                return None
+            return Lead(**record.dict())
+        except SQLAlchemyError as e:
+            print(f"Error updating lead: {e}")
+            return None
+
+    async def delete(self, id_) -> Lead | None:
+        """Удаляет лид одним DELETE ... RETURNING и возвращает удаленный лид."""
+        if id_ is None:
+            return None
+        try:
+            result = await self.session.scalars(
+                delete(LeadModel).where(LeadModel.id == int(id_)).returning(LeadModel),
+                execution_options={"synchronize_session": False},
+            )
+            record = result.first()
+            if record is None:
+                return None
+            return Lead(**record.dict())
+        except SQLAlchemyError as e:
+            print(f"Error deleting lead: {e}")
+            return None
@@ -0,0 +1,72 @@
+"""
+Асинхронная единица работы сервиса Lead.
+
+Движок на asyncio-драйвере создается один раз на процесс,
+запросы к БД не блокируют IOLoop Tornado.
+"""
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from common.database import to_async_url
+from common.instrumentation import instrument_engine
+from lead.lead_repository.schema import upgrade_schema
+from lead.lead_settings.app_settings import get_settings
+
+_engine: AsyncEngine | None = None
+_session_maker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _engine, _session_maker
+    if _engine is None:
+        _engine = create_async_engine(to_async_url(get_settings().database_url))
+        instrument_engine(_engine.sync_engine)
+        _session_maker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    get_async_engine()
+    return _session_maker
+
+
+async def init_models() -> None:
+    """Создает таблицы сервиса и обновляет схему существующей базы."""
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(upgrade_schema)
+
+
+async def dispose_async_engine() -> None:
+    global _engine, _session_maker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_maker = None
+
+
+class AsyncUnitOfWork:
+    def __init__(self, session_maker=None):
+        self.session_maker = session_maker or get_async_session_maker()
+
+    async def __aenter__(self):
+        self.session = self.session_maker()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            await self.rollback()
+        await self.session.close()
+
+    async def commit(self):
+        await self.session.commit()
+        for callback in self.session.info.pop("after_commit", []):
+            await callback()
+
+    async def rollback(self):
+        await self.session.rollback()
+        self.session.info.pop("after_commit", None)
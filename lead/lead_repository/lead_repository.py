@@ -1,16 +1,23 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
+from sqlalchemy import case, delete, func, or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from common.pagination import apply_keyset, split_page
 from lead.lead_repository.models import LeadModel
-from lead.lead_service.lead import Lead
+from lead.lead_service.lead import Lead, LeadRow
+from lead.lead_service.normalize import normalize_email, normalize_phone, with_keys
 
 
 class LeadRepository:
     def __init__(self, session: Session):
         self.session = session
 
+    def _select_rows(self):
+        """SELECT колонок LeadRow без загрузки ORM-объектов."""
+        return select(*(getattr(LeadModel, column) for column in LeadRow.__slots__))
+
     def _get_lead(self, id_: int) -> LeadModel | None:
         try:
             return self.session.query(LeadModel).filter(LeadModel.id == id_).first()
@@ -26,9 +33,9 @@ class LeadRepository:
         sort_field: str | None,
         sort_order: str = "asc",
         **filters,
-    ) -> List[Lead] | None:
+    ) -> List[LeadRow] | None:
         try:
-            query = self.session.query(LeadModel).filter_by(**filters)
+            query = self._select_rows().filter_by(**filters)
             if sort_field is not None:
                 column = getattr(LeadModel, sort_field, None)
                 if column is not None:
@@ -43,17 +50,37 @@ class LeadRepository:
                 query = query.limit(limit)
             if offset > 0:
                 query = query.offset(offset)
-            leads = query.all()
-
-            return [Lead(**lead.dict()) for lead in leads]
+            return [LeadRow(*row) for row in self.session.execute(query)]
 
         except SQLAlchemyError as e:
             print(f"Error getting lead: {e}")
             return None
 
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort_field: str | None = None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> Tuple[List[LeadRow], str | None]:
+        try:
+            query = self._select_rows().filter_by(**filters)
+            query, sort_field, sort_order = apply_keyset(
+                query, LeadModel, sort_field, sort_order, cursor
+            )
+            records = [
+                LeadRow(*row) for row in self.session.execute(query.limit(limit + 1))
+            ]
+            return split_page(records, limit, sort_field, sort_order)
+
+        except SQLAlchemyError as e:
+            print(f"Error getting lead: {e}")
+            return [], None
+
     def add(self, lead) -> Lead | None:
         try:
-            record = LeadModel(**lead)
+            record = LeadModel(**with_keys(lead))
             self.session.add(record)
             return Lead(**record.dict(), lead_=record)
         except SQLAlchemyError as e:
@@ -70,22 +97,113 @@ class LeadRepository:
             return None
 
     def update(self, id_, new_lead: Dict[str, Any]) -> Lead | None:
+        """Обновляет лид одним UPDATE ... RETURNING, None если лид не найден."""
         try:
-            record = self._get_lead(id_)
+            record = self.session.scalars(
+                update(LeadModel)
+                .where(LeadModel.id == int(id_))
+                .values(**with_keys(new_lead))
+                .returning(LeadModel),
+                execution_options={"synchronize_session": False},
+            ).first()
             if record is None:
                 return None
-            for key, value in new_lead.items():
-                setattr(record, key, value)
             return Lead(**record.dict())
         except SQLAlchemyError as e:
-            print(f"Error getting lead: {e}")
+            print(f"Error updating lead: {e}")
             return None
 
-    def delete(self, id_):
+    def delete(self, id_) -> Lead | None:
+        """Удаляет лид одним DELETE ... RETURNING и возвращает удаленный лид."""
         try:
-            record = self._get_lead(id_)
-            if record:
-                self.session.delete(record)
+            record = self.session.scalars(
+                delete(LeadModel).where(LeadModel.id == int(id_)).returning(LeadModel),
+                execution_options={"synchronize_session": False},
+            ).first()
+            if record is None:
+                return None
+            return Lead(**record.dict())
         except SQLAlchemyError as e:
-            print(f"Error getting lead: {e}")
+            print(f"Error deleting lead: {e}")
             return None
+
+    def find_duplicate(self, lead: Dict[str, Any]) -> int | None:
+        """
+        id лида с тем же нормализованным email или телефоном.
+        Один запрос с LIMIT 1 по индексам email_normalized и phone_normalized.
+        """
+        query = (
+            select(LeadModel.id)
+            .where(
+                or_(
+                    LeadModel.email_normalized == normalize_email(lead["email"]),
+                    LeadModel.phone_normalized == normalize_phone(lead["phone"]),
+                )
+            )
+            .limit(1)
+        )
+        return self.session.scalar(query)
+
+    def backfill_keys(self, batch_size: int = 1000) -> int:
+        """Заполняет нормализованные ключи у лидов, созданных до их появления."""
+        query = select(LeadModel.id, LeadModel.email, LeadModel.phone).where(
+            or_(
+                LeadModel.email_normalized.is_(None),
+                LeadModel.phone_normalized.is_(None),
+            )
+        )
+        rows = self.session.execute(query).all()
+        for start in range(0, len(rows), batch_size):
+            self.session.execute(
+                update(LeadModel),
+                [
+                    with_keys({"id": id_, "email": email, "phone": phone})
+                    for id_, email, phone in rows[start : start + batch_size]
+                ],
+            )
+        return len(rows)
+
+    def find_shared_keys(self) -> List[Tuple[int, str | None, str | None, bool]]:
+        """
+        Лиды, у которых email или телефон совпадает хотя бы с одним другим
+        лидом, одним запросом (оконный COUNT по каждому ключу).
+        Возвращает (id, email_normalized, phone_normalized, is_active) по id.
+        """
+
+        def shared(key):
+            return case((key.is_(None), 1), else_=func.count().over(partition_by=key))
+
+        keys = select(
+            LeadModel.id,
+            LeadModel.email_normalized,
+            LeadModel.phone_normalized,
+            LeadModel.is_active,
+            shared(LeadModel.email_normalized).label("by_email"),
+            shared(LeadModel.phone_normalized).label("by_phone"),
+        ).subquery()
+        query = (
+            select(
+                keys.c.id,
+                keys.c.email_normalized,
+                keys.c.phone_normalized,
+                keys.c.is_active,
+            )
+            .where(or_(keys.c.by_email > 1, keys.c.by_phone > 1))
+            .order_by(keys.c.id)
+        )
+        return [tuple(row) for row in self.session.execute(query)]
+
+    def merge_duplicates(self, duplicate_ids: List[int], activate_ids: List[int]):
+        """Удаляет дубли и переносит признак активности на оставшиеся лиды."""
+        if activate_ids:
+            self.session.execute(
+                update(LeadModel)
+                .where(LeadModel.id.in_(activate_ids))
+                .values(is_active=True),
+                execution_options={"synchronize_session": False},
+            )
+        if duplicate_ids:
+            self.session.execute(
+                delete(LeadModel).where(LeadModel.id.in_(duplicate_ids)),
+                execution_options={"synchronize_session": False},
+            )
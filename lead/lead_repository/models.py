@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Boolean
+from sqlalchemy import DDL, String, Integer, Boolean, column, event, table
 
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -19,6 +19,8 @@ class LeadModel(Base):
     first_name: Mapped[str] = mapped_column(String(30), nullable=False)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False)
+    email_normalized: Mapped[str | None] = mapped_column(String(255), index=True)
+    phone_normalized: Mapped[str | None] = mapped_column(String(20), index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_archived: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     adv_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -37,3 +39,51 @@ class LeadModel(Base):
             "is_active": self.is_active,
             "is_archived": self.is_archived,
         }
+
+
+# Поисковый FTS5-индекс (триграммы) по name, first_name, email и phone.
+# Только для SQLite: таблица хранит лишь индекс, содержимое берется из lead,
+# триггеры поддерживают индекс при вставке, изменении и удалении лидов.
+lead_search = table("lead_search", column("rowid"), column("rank"))
+
+LEAD_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS lead_search USING fts5(
+        name, first_name, email, phone,
+        content='lead', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lead_search_insert AFTER INSERT ON lead BEGIN
+        INSERT INTO lead_search(rowid, name, first_name, email, phone)
+        VALUES (new.id, new.name, new.first_name, new.email, new.phone);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lead_search_delete AFTER DELETE ON lead BEGIN
+        INSERT INTO lead_search(lead_search, rowid, name, first_name, email, phone)
+        VALUES ('delete', old.id, old.name, old.first_name, old.email, old.phone);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lead_search_update
+    AFTER UPDATE OF name, first_name, email, phone ON lead BEGIN
+        INSERT INTO lead_search(lead_search, rowid, name, first_name, email, phone)
+        VALUES ('delete', old.id, old.name, old.first_name, old.email, old.phone);
+        INSERT INTO lead_search(rowid, name, first_name, email, phone)
+        VALUES (new.id, new.name, new.first_name, new.email, new.phone);
+    END
+    """,
+)
+
+for statement in LEAD_SEARCH_DDL:
+    event.listen(
+        LeadModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    LeadModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS lead_search").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,48 @@
+"""
+Создание и обновление схемы БД сервиса Lead.
+
+create_all создает только отсутствующие таблицы и не меняет существующую
+таблицу lead. upgrade_schema доводит базу, созданную ранней версией
+сервиса, до текущей модели:
+    - добавляет колонки нормализованных ключей и их индексы;
+    - на SQLite создает поисковый индекс lead_search с триггерами и
+      заполняет его из lead;
+    - заполняет нормализованные ключи у уже существующих лидов.
+Все шаги идемпотентны, повторный вызов на актуальной базе ничего не меняет.
+"""
+
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.orm import Session
+
+from lead.lead_repository.lead_repository import LeadRepository
+from lead.lead_repository.models import LEAD_SEARCH_DDL, Base, LeadModel
+
+# Колонки, добавленные в lead после первой версии схемы
+ADDED_COLUMNS = ("email_normalized", "phone_normalized")
+
+
+def upgrade_schema(connection: Connection) -> None:
+    Base.metadata.create_all(connection)
+    table = LeadModel.__table__
+    inspector = inspect(connection)
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    for name in ADDED_COLUMNS:
+        if name not in existing:
+            column_type = table.c[name].type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+            )
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+    if connection.dialect.name == "sqlite":
+        has_search_index = inspector.has_table("lead_search")
+        for statement in LEAD_SEARCH_DDL:
+            connection.execute(text(statement))
+        if not has_search_index:
+            connection.execute(
+                text("INSERT INTO lead_search(lead_search) VALUES ('rebuild')")
+            )
+
+    with Session(bind=connection) as session:
+        LeadRepository(session).backfill_keys()
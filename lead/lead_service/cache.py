@@ -0,0 +1,226 @@
+"""
+Кэш лидов и страниц списка с подключаемым хранилищем.
+
+Записи версионируются: ключ записи содержит текущую версию корзины лида
+(id по модулю version_buckets) или версию списков, запись лида увеличивает
+версию его корзины. Так число счетчиков версий не растет с числом лидов.
+Значение, прочитанное из БД до записи, сохраняется под старой версией
+и больше никогда не читается, устаревшие записи удаляются по TTL.
+
+Хранилища:
+    MemoryCacheBackend - словарь в памяти процесса, для одного процесса;
+    RedisCacheBackend  - клиент redis.asyncio, общий кэш для всех процессов.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from lead.lead_service.lead import Lead, LeadRow
+from lead.lead_settings.app_settings import Settings, get_settings
+
+
+class MemoryCacheBackend:
+    """
+    LRU-словарь с TTL. Счетчики версий хранятся отдельно и не вытесняются,
+    их число ограничено числом корзин версий LeadCache.
+    """
+
+    def __init__(self, maxsize: int = 10_000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend:
+    """
+    Хранилище поверх клиента redis.asyncio.
+    Ошибки Redis не прерывают запрос: чтение считается промахом.
+    """
+
+    def __init__(self, client):
+        # redis загружается только для этого хранилища, а не при старте
+        try:
+            from redis.exceptions import RedisError
+        except ImportError:  # pragma: no cover - клиент-заглушка без redis
+            RedisError = OSError
+
+        self.client = client
+        self.errors = RedisError
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.client.get(key)
+        except self.errors as e:
+            print(f"Error reading lead cache: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self.client.set(key, value, px=int(ttl * 1000))
+        except self.errors as e:
+            print(f"Error writing lead cache: {e}")
+
+    async def incr(self, key: str) -> int | None:
+        try:
+            return await self.client.incr(key)
+        except self.errors as e:
+            print(f"Error invalidating lead cache: {e}")
+            return None
+
+
+class LeadCache:
+    """
+    Версионированный кэш лидов (ключ по id) и страниц списка
+    (ключ по параметрам запроса) поверх любого хранилища.
+    """
+
+    def __init__(
+        self,
+        backend,
+        ttl: float = 60.0,
+        list_ttl: float = 10.0,
+        prefix: str = "lead",
+        version_buckets: int = 4096,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.list_ttl = list_ttl
+        self.prefix = prefix
+        self.version_buckets = version_buckets
+
+    def _lead_version_key(self, lead_id) -> str:
+        # Запись лида сбрасывает и его соседей по корзине: лишний промах
+        # вместо счетчика на каждый измененный лид
+        bucket = int(lead_id) % self.version_buckets
+        return f"{self.prefix}:bucket:{bucket}:version"
+
+    def _list_version_key(self) -> str:
+        return f"{self.prefix}:list:version"
+
+    async def _version(self, key: str) -> int:
+        value = await self.backend.get(key)
+        return int(value) if value is not None else 0
+
+    async def get_lead(self, lead_id) -> Tuple[Lead | None, int]:
+        """Лид из кэша и версия, под которой сохранять прочитанный из БД лид."""
+        version = await self._version(self._lead_version_key(lead_id))
+        value = await self.backend.get(f"{self.prefix}:{int(lead_id)}:v{version}")
+        if value is None:
+            return None, version
+        return Lead(**json.loads(value)), version
+
+    async def put_lead(self, lead: Lead, version: int) -> None:
+        await self.backend.set(
+            f"{self.prefix}:{int(lead.id)}:v{version}",
+            json.dumps(lead.dict()).encode(),
+            self.ttl,
+        )
+
+    def _list_key(self, version: int, parameters: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(
+            json.dumps(parameters, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{self.prefix}:list:v{version}:{digest}"
+
+    async def get_list(
+        self, parameters: Dict[str, Any]
+    ) -> Tuple[Tuple[List[LeadRow], str | None] | None, int]:
+        """Страница (строки, next_cursor) из кэша и текущая версия списков."""
+        version = await self._version(self._list_version_key())
+        value = await self.backend.get(self._list_key(version, parameters))
+        if value is None:
+            return None, version
+        page = json.loads(value)
+        return ([LeadRow(**row) for row in page["rows"]], page["next_cursor"]), version
+
+    async def put_list(
+        self,
+        parameters: Dict[str, Any],
+        rows: List[LeadRow],
+        next_cursor: str | None,
+        version: int,
+    ) -> None:
+        value = {"rows": [row.dict() for row in rows], "next_cursor": next_cursor}
+        await self.backend.set(
+            self._list_key(version, parameters),
+            json.dumps(value).encode(),
+            self.list_ttl,
+        )
+
+    async def invalidate(self, *lead_ids) -> None:
+        """Новая версия списков и переданных лидов: старые записи больше не читаются."""
+        await self.backend.incr(self._list_version_key())
+        for lead_id in lead_ids:
+            await self.backend.incr(self._lead_version_key(lead_id))
+
+
+def create_lead_cache(settings: Settings) -> LeadCache | None:
+    """Кэш по настройкам: Redis при заданном redis_host, иначе словарь в памяти."""
+    backend_name = settings.cache_backend
+    if backend_name == "none":
+        return None
+    if backend_name == "redis":
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("redis package is required for the redis cache backend")
+        backend = RedisCacheBackend(
+            aioredis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                db=settings.redis_db,
+            )
+        )
+    elif backend_name == "memory":
+        backend = MemoryCacheBackend(maxsize=settings.cache_size)
+    else:
+        raise ValueError(f"Unknown lead cache backend '{backend_name}'")
+    return LeadCache(backend, ttl=settings.cache_ttl, list_ttl=settings.cache_list_ttl)
+
+
+_cache: LeadCache | None = None
+_cache_created = False
+
+
+def get_lead_cache() -> LeadCache | None:
+    """Кэш лидов процесса, создается при первом обращении."""
+    global _cache, _cache_created
+    if not _cache_created:
+        _cache = create_lead_cache(get_settings())
+        _cache_created = True
+    return _cache
+
+
+def set_lead_cache(cache: LeadCache | None) -> None:
+    """Подменяет кэш процесса, None отключает кэширование."""
+    global _cache, _cache_created
+    _cache = cache
+    _cache_created = True
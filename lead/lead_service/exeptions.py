@@ -1,2 +1,8 @@
 class LeadNotNotFoundError(Exception):
     pass
+
+
+class LeadDuplicateError(Exception):
+    def __init__(self, lead_id):
+        super().__init__(f"Lead duplicates lead with id {lead_id}")
+        self.lead_id = lead_id
@@ -36,3 +36,45 @@ class Lead:
             "is_active": self.is_active,
             "is_archived": self.is_archived,
         }
+
+
+class LeadRow:
+    """
+    Компактная строка списка лидов, заполняется прямо из кортежа колонок.
+    Только для чтения, dict() сразу готов к сериализации в JSON.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "first_name",
+        "phone",
+        "email",
+        "adv_id",
+        "is_active",
+        "is_archived",
+    )
+
+    def __init__(
+        self, id, name, first_name, phone, email, adv_id, is_active, is_archived
+    ):
+        self.id = id
+        self.name = name
+        self.first_name = first_name
+        self.phone = phone
+        self.email = email
+        self.adv_id = adv_id
+        self.is_active = is_active
+        self.is_archived = is_archived
+
+    def dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "first_name": self.first_name,
+            "phone": self.phone,
+            "email": self.email,
+            "adv_id": self.adv_id,
+            "is_active": self.is_active,
+            "is_archived": self.is_archived,
+        }
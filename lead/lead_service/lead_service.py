@@ -1,4 +1,5 @@
-from lead.lead_service.exeptions import LeadNotNotFoundError
+from lead.lead_service.exeptions import LeadDuplicateError, LeadNotNotFoundError
+from lead.lead_service.normalize import with_keys
 
 
 class LeadService:
@@ -6,6 +7,9 @@ class LeadService:
         self.lead_repository = lead_repository
 
     def place_lead(self, item):
+        duplicate_id = self.lead_repository.find_duplicate(item)
+        if duplicate_id is not None:
+            raise LeadDuplicateError(duplicate_id)
         return self.lead_repository.add(item)
 
     def get_lead(self, lead_id):
@@ -15,16 +19,15 @@ class LeadService:
         raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
 
     def update_lead(self, lead_id, item):
-        lead = self.lead_repository.get(lead_id)
+        lead = self.lead_repository.update(lead_id, item)
         if lead is None:
             raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
-        return self.lead_repository.update(lead_id, item)
+        return lead
 
     def delete_lead(self, lead_id):
-        lead = self.lead_repository.get(lead_id)
+        lead = self.lead_repository.delete(lead_id)
         if lead is None:
             raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
-        self.lead_repository.delete(lead_id)
 
     def list_leads(self, **filters):
         limit = filters.pop("limit")
@@ -39,8 +42,223 @@ class LeadService:
             **filters,
         )
 
+    def list_leads_page(self, **filters):
+        limit = filters.pop("limit")
+        cursor = filters.pop("cursor", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+        return self.lead_repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
+
     def archive_lead(self, lead_id):
-        lead = self.lead_repository.get(lead_id)
+        lead = self.lead_repository.update(lead_id, {"is_archived": True})
+        if lead is None:
+            raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
+        return lead
+
+    def merge_duplicates(self, dry_run=False):
+        """
+        Склеивает лиды с одинаковым email или телефоном в лид с минимальным id.
+        Группы - компоненты связности по общим ключам (union-find): лиды,
+        связанные через цепочку, например A~C по email и B~C по телефону,
+        попадают в одну группу. Оставшийся лид становится активным,
+        если активен любой из его дублей.
+        """
+        self.lead_repository.backfill_keys()
+        parents = {}
+
+        def find(lead_id):
+            root = lead_id
+            while parents[root] != root:
+                root = parents[root]
+            while parents[lead_id] != root:
+                parents[lead_id], lead_id = root, parents[lead_id]
+            return root
+
+        first_by_key = {}
+        active = set()
+        for lead_id, email, phone, is_active in self.lead_repository.find_shared_keys():
+            parents[lead_id] = lead_id
+            if is_active:
+                active.add(lead_id)
+            for key in (("email", email), ("phone", phone)):
+                if key[1] is None:
+                    continue
+                roots = find(first_by_key.setdefault(key, lead_id)), find(lead_id)
+                # Корнем компоненты остается минимальный id
+                parents[max(roots)] = min(roots)
+
+        targets = sorted(lead_id for lead_id in parents if find(lead_id) != lead_id)
+        keepers = {find(lead_id) for lead_id in targets}
+        activate = sorted({find(lead_id) for lead_id in targets if lead_id in active})
+        if not dry_run:
+            self.lead_repository.merge_duplicates(targets, activate)
+        return {"groups": len(keepers), "merged": len(targets)}
+
+
+class AsyncLeadService:
+    """Бизнес логика Lead поверх асинхронного репозитория."""
+
+    def __init__(self, lead_repository, cache=None):
+        self.lead_repository = lead_repository
+        self.cache = cache
+
+    def _invalidate_after_commit(self, *lead_ids):
+        """Сбрасывает версии кэша списков и лидов только после фиксации транзакции."""
+        if self.cache is None:
+            return
+        cache = self.cache
+
+        async def invalidate():
+            await cache.invalidate(*lead_ids)
+
+        self.lead_repository.after_commit(invalidate)
+
+    async def place_lead(self, item):
+        duplicate_id = await self.lead_repository.find_duplicate(item)
+        if duplicate_id is not None:
+            raise LeadDuplicateError(duplicate_id)
+        lead = await self.lead_repository.add(item)
+        self._invalidate_after_commit()
+        return lead
+
+    async def place_leads(self, items):
+        """
+        Вставляет пачку лидов без дублей: один запрос проверяет ключи всей
+        пачки в БД, повторы внутри пачки отсеиваются по множествам ключей.
+        Возвращает число вставленных лидов и позиции дублей в items.
+        """
+        items = [with_keys(item) for item in items]
+        emails, phones = await self.lead_repository.find_existing_keys(
+            {item["email_normalized"] for item in items},
+            {item["phone_normalized"] for item in items},
+        )
+        fresh, duplicates = [], []
+        for position, item in enumerate(items):
+            email, phone = item["email_normalized"], item["phone_normalized"]
+            if email in emails or phone in phones:
+                duplicates.append(position)
+                continue
+            emails.add(email)
+            phones.add(phone)
+            fresh.append(item)
+        inserted = await self.lead_repository.add_many(fresh)
+        if inserted:
+            self._invalidate_after_commit()
+        return inserted, duplicates
+
+    async def search_leads(self, query, limit, offset=0):
+        return await self.lead_repository.search(query, limit=limit, offset=offset)
+
+    def export_leads(self, batch_size=1000, **filters):
+        return self.lead_repository.stream_rows(batch_size=batch_size, **filters)
+
+    async def get_lead(self, lead_id):
+        # Ключ кэша строится из id: без id лид не ищем ни в кэше, ни в БД
+        if lead_id is None:
+            raise LeadNotNotFoundError("Lead id is not given")
+        version = None
+        if self.cache is not None:
+            lead, version = await self.cache.get_lead(lead_id)
+            if lead is not None:
+                return lead
+        lead = await self.lead_repository.get(lead_id)
+        if lead is not None:
+            if self.cache is not None:
+                await self.cache.put_lead(lead, version)
+            return lead
+        raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
+
+    async def update_lead(self, lead_id, item):
+        lead = await self.lead_repository.update(lead_id, item)
+        if lead is None:
+            raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
+        self._invalidate_after_commit(lead.id)
+        return lead
+
+    async def delete_lead(self, lead_id):
+        lead = await self.lead_repository.delete(lead_id)
+        if lead is None:
+            raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
+        self._invalidate_after_commit(lead.id)
+
+    async def _cached_page(self, method, load, **parameters):
+        """
+        Страница (строки, next_cursor) из кэша списков или из load().
+        Ошибка БД (строки None) не кэшируется.
+        """
+        if self.cache is None:
+            return await load()
+        key = {"method": method, **parameters}
+        page, version = await self.cache.get_list(key)
+        if page is not None:
+            return page
+        rows, next_cursor = await load()
+        if rows is not None:
+            await self.cache.put_list(key, rows, next_cursor, version)
+        return rows, next_cursor
+
+    async def list_leads(self, **filters):
+        limit = filters.pop("limit")
+        offset = filters.pop("offset", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+
+        async def load():
+            rows = await self.lead_repository.get_list(
+                limit=limit,
+                offset=offset,
+                sort_field=sort_field,
+                sort_order=sort_order,
+                **filters,
+            )
+            return rows, None
+
+        rows, _ = await self._cached_page(
+            "list",
+            load,
+            limit=limit,
+            offset=offset,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
+        return rows
+
+    async def list_leads_page(self, **filters):
+        limit = filters.pop("limit")
+        cursor = filters.pop("cursor", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+
+        async def load():
+            return await self.lead_repository.get_page(
+                limit=limit,
+                cursor=cursor,
+                sort_field=sort_field,
+                sort_order=sort_order,
+                **filters,
+            )
+
+        rows, next_cursor = await self._cached_page(
+            "page",
+            load,
+            limit=limit,
+            cursor=cursor,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
+        return rows if rows is not None else [], next_cursor
+
+    async def archive_lead(self, lead_id):
+        lead = await self.lead_repository.update(lead_id, {"is_archived": True})
         if lead is None:
             raise LeadNotNotFoundError(f"Lead with id {lead_id} is not found")
-        return self.lead_repository.update(lead_id, is_archived=True)
+        self._invalidate_after_commit(lead.id)
+        return lead
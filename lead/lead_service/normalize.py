@@ -0,0 +1,38 @@
+"""
+Нормализованные ключи контактов лида для поиска дублей.
+
+Email приводится к нижнему регистру, телефон к формату E.164. Номера
+без кода страны (8XXXXXXXXXX и 10 цифр) считаются российскими.
+"""
+
+import re
+from typing import Any, Dict
+
+_NON_DIGITS = re.compile(r"\D")
+
+DEFAULT_COUNTRY_CODE = "7"
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_phone(phone: str, country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    digits = _NON_DIGITS.sub("", phone)
+    if phone.strip().startswith("+"):
+        return f"+{digits}"
+    if country_code == "7" and len(digits) == 11 and digits.startswith("8"):
+        return f"+7{digits[1:]}"
+    if len(digits) == 10:
+        return f"+{country_code}{digits}"
+    return f"+{digits}"
+
+
+def with_keys(lead: Dict[str, Any]) -> Dict[str, Any]:
+    """Копия lead с email_normalized и phone_normalized для переданных контактов."""
+    keys = {}
+    if lead.get("email") is not None:
+        keys["email_normalized"] = normalize_email(lead["email"])
+    if lead.get("phone") is not None:
+        keys["phone_normalized"] = normalize_phone(lead["phone"])
+    return {**lead, **keys}
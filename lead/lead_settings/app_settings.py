@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 
@@ -26,14 +27,52 @@ class Settings:
     log_level: str = "INFO"
     log_file: Optional[str] = None
 
-    redis_host: Optional[str] = None
-    redis_port: Optional[int] = None
-    redis_password: Optional[str] = None
-    redis_db: Optional[int] = None
+    redis_host: Optional[str] = field(
+        default_factory=lambda: os.environ.get("REDIS_HOST")
+    )
+    redis_port: Optional[int] = field(
+        default_factory=lambda: int(os.environ.get("REDIS_PORT", 6379))
+    )
+    redis_password: Optional[str] = field(
+        default_factory=lambda: os.environ.get("REDIS_PASSWORD")
+    )
+    redis_db: Optional[int] = field(
+        default_factory=lambda: int(os.environ.get("REDIS_DB", 0))
+    )
+
+    # memory, redis или none; по умолчанию redis, если задан redis_host
+    cache_backend: str = field(
+        default_factory=lambda: os.environ.get(
+            "LEAD_CACHE_BACKEND",
+            "redis" if os.environ.get("REDIS_HOST") else "memory",
+        )
+    )
+    cache_ttl: float = field(
+        default_factory=lambda: float(os.environ.get("LEAD_CACHE_TTL", 60))
+    )
+    cache_list_ttl: float = field(
+        default_factory=lambda: float(os.environ.get("LEAD_CACHE_LIST_TTL", 10))
+    )
+    cache_size: int = field(
+        default_factory=lambda: int(os.environ.get("LEAD_CACHE_SIZE", 10_000))
+    )
+
+    ingest_batch_size: int = field(
+        default_factory=lambda: int(os.environ.get("LEAD_INGEST_BATCH_SIZE", 500))
+    )
+    ingest_max_body_size: int = field(
+        default_factory=lambda: int(
+            os.environ.get("LEAD_INGEST_MAX_BODY_SIZE", 10 * 1024**3)
+        )
+    )
+    ingest_max_line_size: int = 64 * 1024
+    ingest_max_rejected_details: int = 100
 
     def __post_init__(self):
         self.sqlalchemy_database_uri = self.database_url
 
 
+@lru_cache(maxsize=None)
 def get_settings():
+    """Настройки процесса, окружение читается при первом вызове."""
     return Settings()
@@ -0,0 +1,46 @@
+"""
+Разовая склейка дублей лидов по нормализованному email и телефону.
+
+Лиды с общими ключами находятся одним запросом с оконным COUNT по каждому
+ключу, без попарного сравнения лидов. Группы собираются union-find:
+связанные через цепочку лидов дубли склеиваются в лид с минимальным id.
+
+Запуск: python -m lead.merge_duplicates [--database-url URL] [--dry-run]
+"""
+
+import argparse
+import json
+
+from sqlalchemy import create_engine
+
+from lead.lead_repository.lead_repository import LeadRepository
+from lead.lead_repository.schema import upgrade_schema
+from lead.lead_repository.unit_of_work import UnitOfWork
+from lead.lead_service.lead_service import LeadService
+from lead.lead_settings.app_settings import get_settings
+
+
+def merge_duplicates(database_url: str, dry_run: bool = False) -> dict:
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+        with UnitOfWork(engine) as unit_of_work:
+            lead_service = LeadService(LeadRepository(unit_of_work.session))
+            report = lead_service.merge_duplicates(dry_run=dry_run)
+            unit_of_work.commit()
+        return report
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(merge_duplicates(args.database_url, dry_run=args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Создание и перестроение поискового FTS5-индекса lead_search.
+
+Нужно для баз SQLite, созданных до появления индекса: таблица и триггеры
+создаются, если их нет, затем индекс заполняется из таблицы lead.
+
+Запуск: python -m lead.rebuild_search_index [--database-url URL]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+
+from lead.lead_repository.models import LEAD_SEARCH_DDL
+from lead.lead_settings.app_settings import get_settings
+
+
+def rebuild_search_index(database_url: str) -> None:
+    engine = create_engine(database_url)
+    try:
+        if engine.dialect.name != "sqlite":
+            raise SystemExit("lead_search index is only available on SQLite")
+        with engine.begin() as connection:
+            for statement in LEAD_SEARCH_DDL:
+                connection.execute(text(statement))
+            connection.execute(
+                text("INSERT INTO lead_search(lead_search) VALUES ('rebuild')")
+            )
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    rebuild_search_index(args.database_url)
+    print(f"lead_search rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{Path(tempfile.gettempdir()) / 'lead_test.db'}",
+)
+# Кэш процесса переживал бы пересоздание таблиц между тестами,
+# тесты кэша подключают его явно
+os.environ.setdefault("LEAD_CACHE_BACKEND", "none")
+
+
+class FakeRedis:
+    """Подмножество API redis.asyncio.Redis (get, set, incr) в памяти."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data: Dict[str, Tuple[float | None, bytes]] = {}
+
+    async def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key, value, px=None):
+        expires_at = None if px is None else self._clock() + px / 1000
+        if isinstance(value, str):
+            value = value.encode()
+        self._data[key] = (expires_at, value)
+        return True
+
+    async def incr(self, key):
+        value = int(await self.get(key) or 0) + 1
+        expires_at = self._data[key][0] if key in self._data else None
+        self._data[key] = (expires_at, str(value).encode())
+        return value
@@ -0,0 +1,316 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import tornado.testing
+from sqlalchemy import event
+
+from lead.app import app
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import (
+    AsyncUnitOfWork,
+    dispose_async_engine,
+    get_async_engine,
+)
+from lead.lead_repository.models import Base
+from lead.lead_service.cache import (
+    LeadCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_lead_cache,
+    set_lead_cache,
+)
+from lead.lead_service.lead import Lead, LeadRow
+from lead.lead_service.lead_service import AsyncLeadService
+from lead.lead_settings.app_settings import Settings
+from lead.tests.conftest import FakeRedis
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_lead(id_=1, name="Cached"):
+    return Lead(
+        id=id_,
+        name=name,
+        first_name="Lead",
+        phone="+79990000001",
+        email="cached@example.com",
+        adv_id=1,
+        is_active=False,
+        is_archived=False,
+    )
+
+
+@pytest.fixture(params=["memory", "fake_redis"])
+def clock_and_cache(request):
+    """Кэш на каждом из тестовых хранилищ с управляемыми часами."""
+    clock = Clock()
+    if request.param == "memory":
+        backend = MemoryCacheBackend(maxsize=100, clock=clock)
+    else:
+        backend = RedisCacheBackend(FakeRedis(clock=clock))
+    return clock, LeadCache(backend, ttl=60, list_ttl=10)
+
+
+def test_cache_returns_lead_until_invalidated(clock_and_cache):
+    _, cache = clock_and_cache
+
+    async def scenario():
+        lead, version = await cache.get_lead(1)
+        assert lead is None
+        await cache.put_lead(make_lead(), version)
+
+        lead, _ = await cache.get_lead("1")
+        assert lead.dict() == make_lead().dict()
+
+        await cache.invalidate(1)
+        lead, new_version = await cache.get_lead(1)
+        assert lead is None
+        assert new_version == version + 1
+
+    asyncio.run(scenario())
+
+
+def test_cache_drops_value_read_before_invalidation(clock_and_cache):
+    _, cache = clock_and_cache
+
+    async def scenario():
+        _, version = await cache.get_lead(1)
+        # Запись в БД зафиксирована, пока читатель держал старое значение
+        await cache.invalidate(1)
+        await cache.put_lead(make_lead(name="Stale"), version)
+
+        lead, _ = await cache.get_lead(1)
+        assert lead is None
+
+    asyncio.run(scenario())
+
+
+def test_cache_expires_entries_by_ttl(clock_and_cache):
+    clock, cache = clock_and_cache
+
+    async def scenario():
+        parameters = {"method": "page", "limit": 10}
+        rows = [LeadRow(*make_lead().dict().values())]
+        _, version = await cache.get_list(parameters)
+        await cache.put_list(parameters, rows, "cursor", version)
+        await cache.put_lead(make_lead(), 0)
+
+        page, _ = await cache.get_list(parameters)
+        assert [row.dict() for row in page[0]] == [make_lead().dict()]
+        assert page[1] == "cursor"
+
+        clock.now = 30
+        assert (await cache.get_list(parameters))[0] is None
+        assert (await cache.get_lead(1))[0] is not None
+
+        clock.now = 61
+        assert (await cache.get_lead(1))[0] is None
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_bumps_list_version_for_any_write(clock_and_cache):
+    _, cache = clock_and_cache
+
+    async def scenario():
+        parameters = {"method": "list", "limit": 10, "offset": 5}
+        _, version = await cache.get_list(parameters)
+        await cache.put_list(parameters, [], None, version)
+        assert (await cache.get_list(parameters))[0] == ([], None)
+
+        await cache.invalidate()
+        assert (await cache.get_list(parameters))[0] is None
+
+    asyncio.run(scenario())
+
+
+def test_lead_versions_are_bounded_by_buckets():
+    backend = MemoryCacheBackend()
+    cache = LeadCache(backend, version_buckets=8)
+
+    async def scenario():
+        await cache.put_lead(make_lead(id_=3), 0)
+        await cache.invalidate(*range(1000))
+        return await cache.get_lead(3)
+
+    lead, version = asyncio.run(scenario())
+    assert lead is None
+    assert version > 0
+    # 8 корзин лидов и версия списков
+    assert len(backend._counters) == 9
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(maxsize=2)
+
+    async def scenario():
+        await backend.set("a", b"1", 60)
+        await backend.set("b", b"2", 60)
+        await backend.get("a")
+        await backend.set("c", b"3", 60)
+        await backend.incr("version")
+        return [await backend.get(key) for key in ("a", "b", "c", "version")]
+
+    assert asyncio.run(scenario()) == [b"1", None, b"3", b"1"]
+
+
+def test_service_get_lead_reads_repository_once():
+    repository = MagicMock()
+    repository.get = AsyncMock(return_value=make_lead())
+    lead_service = AsyncLeadService(repository, cache=LeadCache(MemoryCacheBackend()))
+
+    async def scenario():
+        first = await lead_service.get_lead(1)
+        second = await lead_service.get_lead(1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    repository.get.assert_awaited_once_with(1)
+    assert first.dict() == second.dict()
+
+
+def test_service_does_not_cache_page_after_database_error():
+    repository = MagicMock()
+    row = LeadRow(**make_lead().dict())
+    repository.get_page = AsyncMock(side_effect=[(None, None), ([row], None)])
+    lead_service = AsyncLeadService(repository, cache=LeadCache(MemoryCacheBackend()))
+
+    async def scenario():
+        failed = await lead_service.list_leads_page(limit=10)
+        loaded = await lead_service.list_leads_page(limit=10)
+        return failed, loaded
+
+    failed, loaded = asyncio.run(scenario())
+    assert failed == ([], None)
+    assert [lead.id for lead in loaded[0]] == [1]
+    assert repository.get_page.await_count == 2
+
+
+def test_service_invalidates_only_after_commit():
+    repository = MagicMock()
+    repository.update = AsyncMock(return_value=make_lead(name="Updated"))
+    cache = MagicMock()
+    cache.invalidate = AsyncMock()
+    lead_service = AsyncLeadService(repository, cache=cache)
+
+    asyncio.run(lead_service.update_lead(1, {"name": "Updated"}))
+
+    cache.invalidate.assert_not_awaited()
+    (callback,) = repository.after_commit.call_args.args
+    asyncio.run(callback())
+    cache.invalidate.assert_awaited_once_with(1)
+
+
+@pytest.mark.parametrize(
+    "environment, backend_type",
+    [
+        ({"LEAD_CACHE_BACKEND": "none"}, None),
+        ({"LEAD_CACHE_BACKEND": "memory"}, MemoryCacheBackend),
+        ({"LEAD_CACHE_BACKEND": "", "REDIS_HOST": "redis"}, RedisCacheBackend),
+    ],
+)
+def test_create_lead_cache_picks_backend_from_settings(
+    monkeypatch, environment, backend_type
+):
+    monkeypatch.delenv("REDIS_HOST", raising=False)
+    for name, value in environment.items():
+        if value:
+            monkeypatch.setenv(name, value)
+        else:
+            monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("LEAD_CACHE_TTL", "5")
+
+    cache = create_lead_cache(Settings())
+
+    if backend_type is None:
+        assert cache is None
+    else:
+        assert isinstance(cache.backend, backend_type)
+        assert cache.ttl == 5
+
+
+class TestCachedLeadsApi(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return app()
+
+    def setUp(self):
+        super().setUp()
+        self.io_loop.run_sync(self.reset_db)
+        set_lead_cache(LeadCache(MemoryCacheBackend()))
+        self.statements = []
+        event.listen(
+            get_async_engine().sync_engine, "before_cursor_execute", self.on_execute
+        )
+
+    def tearDown(self):
+        event.remove(
+            get_async_engine().sync_engine, "before_cursor_execute", self.on_execute
+        )
+        set_lead_cache(None)
+        self.io_loop.run_sync(dispose_async_engine)
+        super().tearDown()
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @staticmethod
+    async def reset_db():
+        async with get_async_engine().begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncUnitOfWork() as unit_of_work:
+            await AsyncLeadRepository(unit_of_work.session).add(
+                {
+                    "name": "Cached",
+                    "first_name": "Lead",
+                    "phone": "+79990000001",
+                    "email": "cached@example.com",
+                    "adv_id": 1,
+                }
+            )
+            await unit_of_work.commit()
+
+    async def fetch_json(self, path, **kwargs):
+        response = await self.http_client.fetch(self.get_url(path), **kwargs)
+        return json.loads(response.body) if response.body else None
+
+    @tornado.testing.gen_test
+    async def test_reads_are_served_from_cache_until_write(self):
+        await self.fetch_json("/leads/1")
+        await self.fetch_json("/leads/list/")
+        reads = len(self.statements)
+
+        cached = await self.fetch_json("/leads/1")
+        listed = await self.fetch_json("/leads/list/")
+        self.assertEqual(len(self.statements), reads)
+        self.assertEqual(cached["name"], "Cached")
+        self.assertEqual([lead["name"] for lead in listed["leads"]], ["Cached"])
+
+        await self.fetch_json(
+            "/leads/1?name=Renamed&first_name=Lead&phone=%2B79990000001"
+            "&email=cached%40example.com&adv_id=1",
+            method="PUT",
+            allow_nonstandard_methods=True,
+            body="",
+        )
+
+        self.assertEqual((await self.fetch_json("/leads/1"))["name"], "Renamed")
+        self.assertEqual(
+            [lead["name"] for lead in (await self.fetch_json("/leads/list/"))["leads"]],
+            ["Renamed"],
+        )
+
+    @tornado.testing.gen_test
+    async def test_lead_route_without_id_is_not_found(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads"), raise_error=False
+        )
+        self.assertEqual(response.code, 404)
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+
+import tornado.testing
+
+from lead.app import app
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import (
+    AsyncUnitOfWork,
+    dispose_async_engine,
+    get_async_engine,
+    init_models,
+)
+from lead.lead_repository.models import Base
+
+
+async def reset_db():
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await init_models()
+    async with AsyncUnitOfWork() as unit_of_work:
+        await AsyncLeadRepository(unit_of_work.session).add_many(
+            [
+                {
+                    "name": f"Export User {i}",
+                    "first_name": "Export",
+                    "phone": f"+7999{i:07d}",
+                    "email": f"export_{i}@example.com",
+                    "adv_id": i % 2,
+                }
+                for i in range(2500)
+            ]
+        )
+        await unit_of_work.commit()
+
+
+class TestLeadsExport(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return app()
+
+    def setUp(self):
+        super().setUp()
+        self.io_loop.run_sync(reset_db)
+
+    def tearDown(self):
+        self.io_loop.run_sync(dispose_async_engine)
+        super().tearDown()
+
+    @tornado.testing.gen_test
+    async def test_export_csv(self):
+        response = await self.http_client.fetch(self.get_url("/leads/export/"))
+
+        self.assertTrue(response.headers["Content-Type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(response.body.decode())))
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(rows[0]["email"], "export_0@example.com")
+        self.assertEqual(rows[0]["is_active"], "False")
+
+    @tornado.testing.gen_test
+    async def test_export_ndjson_with_filter(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads/export/?format=ndjson&adv_id=1")
+        )
+
+        records = [json.loads(line) for line in response.body.splitlines()]
+        self.assertEqual(len(records), 1250)
+        self.assertTrue(all(record["adv_id"] == 1 for record in records))
+
+    @tornado.testing.gen_test
+    async def test_export_unknown_format(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads/export/?format=xml"), raise_error=False
+        )
+        self.assertEqual(response.code, 400)
+
+    @tornado.testing.gen_test
+    async def test_export_rejects_non_integer_adv_id(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads/export/?adv_id=one"), raise_error=False
+        )
+        self.assertEqual(response.code, 400)
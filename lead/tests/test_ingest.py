@@ -0,0 +1,152 @@
+import json
+from unittest import mock
+
+import tornado.testing
+from sqlalchemy.exc import OperationalError
+
+from lead.app import app
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import (
+    AsyncUnitOfWork,
+    dispose_async_engine,
+    get_async_engine,
+    init_models,
+)
+from lead.lead_repository.models import Base
+
+
+def make_lead(i):
+    return {
+        "name": f"Ingest User {i}",
+        "first_name": "Ingest",
+        "phone": f"+7999{i:07d}",
+        "email": f"ingest_{i}@example.com",
+        "adv_id": 1,
+    }
+
+
+async def reset_db():
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await init_models()
+
+
+class TestLeadsIngest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return app()
+
+    def setUp(self):
+        super().setUp()
+        self.io_loop.run_sync(reset_db)
+
+    def tearDown(self):
+        self.io_loop.run_sync(dispose_async_engine)
+        super().tearDown()
+
+    async def count_leads(self):
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncLeadRepository(unit_of_work.session)
+            return len(await repo.get_list(limit=None, offset=0, sort_field=None))
+
+    @tornado.testing.gen_test
+    async def test_ingest_streams_and_reports_rejected_lines(self):
+        lines = [json.dumps(make_lead(i)) for i in range(1200)]
+        lines.insert(10, "{not json")
+        lines.insert(20, json.dumps({**make_lead(5000), "email": "broken"}))
+        lines.insert(30, "")
+        body = ("\n".join(lines) + "\n").encode()
+
+        async def body_producer(write):
+            for start in range(0, len(body), 4096):
+                await write(body[start : start + 4096])
+
+        response = await self.http_client.fetch(
+            self.get_url("/leads/ingest/"),
+            method="POST",
+            body_producer=body_producer,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        report = json.loads(response.body)
+        self.assertEqual(report["inserted"], 1200)
+        self.assertEqual(report["rejected"], 2)
+        self.assertEqual([line["line"] for line in report["rejected_lines"]], [11, 21])
+        self.assertIn("email", report["rejected_lines"][1]["errors"])
+        self.assertGreater(report["rows_per_sec"], 0)
+        self.assertEqual(await self.count_leads(), 1200)
+
+    @tornado.testing.gen_test
+    async def test_ingest_skips_too_long_line(self):
+        body = (
+            json.dumps(make_lead(1))
+            + "\n"
+            + "x" * 200_000
+            + "\n"
+            + json.dumps(make_lead(2))
+        ).encode()
+
+        response = await self.http_client.fetch(
+            self.get_url("/leads/ingest/"), method="POST", body=body
+        )
+
+        report = json.loads(response.body)
+        self.assertEqual(report["inserted"], 2)
+        self.assertEqual(report["rejected"], 1)
+        self.assertEqual(report["rejected_lines"][0]["line"], 2)
+
+    @tornado.testing.gen_test
+    async def test_ingest_rejects_duplicates(self):
+        lines = [
+            make_lead(1),
+            make_lead(2),
+            {**make_lead(3), "email": "Ingest_1@Example.com"},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines).encode()
+
+        response = await self.http_client.fetch(
+            self.get_url("/leads/ingest/"), method="POST", body=body
+        )
+
+        report = json.loads(response.body)
+        self.assertEqual(report["inserted"], 2)
+        self.assertEqual(
+            report["rejected_lines"], [{"line": 3, "errors": "Duplicate lead"}]
+        )
+        self.assertEqual(await self.count_leads(), 2)
+
+    @tornado.testing.gen_test
+    async def test_ingest_reports_failed_batch_and_keeps_going(self):
+        add_many = AsyncLeadRepository.add_many
+        calls = []
+
+        async def failing_second_batch(repo, leads):
+            calls.append(len(leads))
+            if len(calls) == 2:
+                raise OperationalError("INSERT", {}, Exception("database is locked"))
+            return await add_many(repo, leads)
+
+        lines = [json.dumps(make_lead(i)) for i in range(1200)]
+        body = ("\n".join(lines) + "\n").encode()
+
+        async def body_producer(write):
+            for start in range(0, len(body), 4096):
+                await write(body[start : start + 4096])
+
+        with mock.patch.object(AsyncLeadRepository, "add_many", failing_second_batch):
+            response = await self.http_client.fetch(
+                self.get_url("/leads/ingest/"),
+                method="POST",
+                body_producer=body_producer,
+            )
+
+        report = json.loads(response.body)
+        # Пачки по 500 строк: после упавшей второй пачки вставлена третья
+        self.assertEqual(len(calls), 3)
+        (failed_batch,) = report["failed_batches"]
+        self.assertEqual(report["failed"], calls[1])
+        self.assertEqual(
+            failed_batch["last_line"] - failed_batch["first_line"] + 1, calls[1]
+        )
+        self.assertEqual(failed_batch["first_line"], calls[0] + 1)
+        self.assertEqual(report["inserted"], 1200 - calls[1])
+        self.assertEqual(await self.count_leads(), report["inserted"])
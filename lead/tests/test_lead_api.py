@@ -1,8 +1,16 @@
 import json
 import tornado.testing
+from sqlalchemy import event
 from tornado.httpclient import HTTPRequest, HTTPClientError
 
 from lead.app import app
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import (
+    AsyncUnitOfWork,
+    dispose_async_engine,
+    get_async_engine,
+    init_models,
+)
 
 
 class TestApp(tornado.testing.AsyncHTTPTestCase):
@@ -152,3 +160,91 @@ class TestApp(tornado.testing.AsyncHTTPTestCase):
         deleted_lead = await self.async_fetch(f"/leads/{deleted_lead['id']}")
 
         self.assertEqual(deleted_lead.code, 404)
+
+
+class TestLeadWriteStatements(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return app()
+
+    def setUp(self):
+        super().setUp()
+        self.lead_id = self.io_loop.run_sync(self.create_lead)
+        self.statements = []
+        event.listen(
+            get_async_engine().sync_engine, "before_cursor_execute", self.on_execute
+        )
+
+    def tearDown(self):
+        event.remove(
+            get_async_engine().sync_engine, "before_cursor_execute", self.on_execute
+        )
+        self.io_loop.run_sync(dispose_async_engine)
+        super().tearDown()
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @staticmethod
+    async def create_lead():
+        await init_models()
+        async with AsyncUnitOfWork() as unit_of_work:
+            lead = await AsyncLeadRepository(unit_of_work.session).add(
+                {
+                    "name": "Statement User",
+                    "first_name": "Statement",
+                    "phone": "+15551234567",
+                    "email": "statement@example.com",
+                    "adv_id": 1,
+                }
+            )
+            await unit_of_work.commit()
+            return lead.id
+
+    @tornado.testing.gen_test
+    async def test_update_lead_runs_single_statement(self):
+        response = await self.http_client.fetch(
+            self.get_url(
+                f"/leads/{self.lead_id}?name=New&first_name=New"
+                "&phone=%2B15550000000&email=new%40example.com&adv_id=2"
+            ),
+            method="PUT",
+            allow_nonstandard_methods=True,
+            body="",
+        )
+
+        self.assertEqual(response.code, 200)
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith("UPDATE lead"))
+        self.assertTrue(
+            response.headers["Server-Timing"].startswith('db;desc="1 queries";dur=')
+        )
+
+    @tornado.testing.gen_test
+    async def test_delete_lead_runs_single_statement(self):
+        response = await self.http_client.fetch(
+            self.get_url(f"/leads/{self.lead_id}"), method="DELETE"
+        )
+        missing = await self.http_client.fetch(
+            self.get_url(f"/leads/{self.lead_id}"), method="DELETE", raise_error=False
+        )
+
+        self.assertEqual(response.code, 204)
+        self.assertEqual(missing.code, 404)
+        self.assertEqual(len(self.statements), 2)
+        self.assertTrue(
+            all(
+                statement.startswith("DELETE FROM lead")
+                for statement in self.statements
+            )
+        )
+
+    @tornado.testing.gen_test
+    async def test_lead_routes_without_id_are_not_found(self):
+        get = await self.http_client.fetch(self.get_url("/leads"), raise_error=False)
+        delete = await self.http_client.fetch(
+            self.get_url("/leads"), method="DELETE", raise_error=False
+        )
+
+        self.assertEqual(get.code, 404)
+        self.assertEqual(delete.code, 404)
+        self.assertEqual(self.statements, [])
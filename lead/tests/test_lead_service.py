@@ -2,9 +2,13 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from lead.lead_service.exeptions import LeadNotNotFoundError
+from lead.lead_repository.lead_repository import LeadRepository
+from lead.lead_repository.models import Base
+from lead.lead_repository.unit_of_work import UnitOfWork
+from lead.lead_service.exeptions import LeadDuplicateError, LeadNotNotFoundError
 from lead.lead_service.lead import Lead
 from lead.lead_service.lead_service import LeadService
+from lead.lead_service.normalize import normalize_email, normalize_phone
 
 
 @pytest.fixture
@@ -71,14 +75,107 @@ def test_place_lead__adds_item_to_repository_and_returns_it(
     Тестирует, что place_lead корректно вызывает метод add репозитория
     и возвращает результат этого вызова.
     """
+    mock_lead_repository.find_duplicate.return_value = None
     mock_lead_repository.add.return_value = lead_post
 
     returned_lead = lead_service.place_lead(lead_post)
 
+    mock_lead_repository.find_duplicate.assert_called_once_with(lead_post)
     mock_lead_repository.add.assert_called_once_with(lead_post)
     assert returned_lead == lead_post
 
 
+def test_place_lead_raises_duplicate_error_for_known_contacts(
+    lead_service, mock_lead_repository, lead_post
+):
+    """
+    Тестирует, что place_lead не добавляет лид, если найден лид с теми же контактами.
+    """
+    mock_lead_repository.find_duplicate.return_value = 7
+
+    with pytest.raises(LeadDuplicateError) as e:
+        lead_service.place_lead(lead_post)
+
+    mock_lead_repository.add.assert_not_called()
+    assert e.value.lead_id == 7
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("+7 (999) 555-66-11", "+79995556611"),
+        ("89995556611", "+79995556611"),
+        ("9995556611", "+79995556611"),
+        ("+1 555 123 4567", "+15551234567"),
+        ("15551234567", "+15551234567"),
+    ],
+)
+def test_normalize_phone_to_e164(phone, expected):
+    """Тестирует приведение телефонов к E.164."""
+    assert normalize_phone(phone) == expected
+
+
+def test_normalize_email_ignores_case_and_spaces():
+    """Тестирует, что email сравниваются без учета регистра и пробелов."""
+    assert normalize_email(" Exmp_22@Mail.COM ") == "exmp_22@mail.com"
+
+
+def test_merge_duplicates_resolves_chains_and_keeps_activity(
+    lead_service, mock_lead_repository
+):
+    """
+    Тестирует, что merge_duplicates сводит цепочки дублей к лиду с минимальным id
+    и делает его активным, если активен любой из дублей.
+    """
+    mock_lead_repository.find_shared_keys.return_value = [
+        (2, "a@example.com", "+79990000002", False),
+        (3, "a@example.com", "+79990000003", False),
+        (4, "b@example.com", "+79990000003", True),
+        (5, "c@example.com", "+79990000005", False),
+        (6, "c@example.com", "+79990000006", False),
+    ]
+
+    report = lead_service.merge_duplicates()
+
+    mock_lead_repository.backfill_keys.assert_called_once_with()
+    mock_lead_repository.merge_duplicates.assert_called_once_with([3, 4, 6], [2])
+    assert report == {"groups": 2, "merged": 3}
+
+
+def test_merge_duplicates_dry_run_does_not_change_leads(
+    lead_service, mock_lead_repository
+):
+    """Тестирует, что merge_duplicates с dry_run только считает дубли."""
+    mock_lead_repository.find_shared_keys.return_value = [
+        (1, "a@example.com", "+79990000001", False),
+        (2, "a@example.com", "+79990000002", True),
+    ]
+
+    report = lead_service.merge_duplicates(dry_run=True)
+
+    mock_lead_repository.merge_duplicates.assert_not_called()
+    assert report == {"groups": 1, "merged": 1}
+
+
+def test_merge_duplicates_joins_leads_linked_through_another_lead(
+    lead_service, mock_lead_repository
+):
+    """
+    Тестирует, что лиды, связанные только через третий лид (A~C по email,
+    B~C по телефону), склеиваются в одну группу с минимальным id.
+    """
+    mock_lead_repository.find_shared_keys.return_value = [
+        (1, "a@example.com", "+79990000001", False),
+        (2, "b@example.com", "+79990000003", True),
+        (3, "a@example.com", "+79990000003", False),
+    ]
+
+    report = lead_service.merge_duplicates()
+
+    mock_lead_repository.merge_duplicates.assert_called_once_with([2, 3], [1])
+    assert report == {"groups": 1, "merged": 2}
+
+
 def test_get_lead_returns_lead_id_found(lead_service, mock_lead_repository, lead_get):
     """
     Тестирует, что get_lead возвращает объявление, если оно найдено.
@@ -110,12 +207,11 @@ def test_update_lead_updates_lead_if_found_and_returns_updated(
     Тестирует, что update_lead корректно обновляет объявление, если оно найдено,
     и возвращает обновленный объект.
     """
-    mock_lead_repository.get.return_value = lead_get
     mock_lead_repository.update.return_value = lead_update
 
     returned_lead = lead_service.update_lead(1, lead_update)
 
-    mock_lead_repository.get.assert_called_once_with(1)
+    mock_lead_repository.get.assert_not_called()
     mock_lead_repository.update.assert_called_once_with(1, lead_update)
     assert returned_lead == lead_update
 
@@ -126,13 +222,12 @@ def test_update_lead_raises_lead_not_find_if_not_found(
     """
     Тестирует, что update_lead выбрасывает LeadNotNotFoundError, если лида не найдено.
     """
-    mock_lead_repository.get.return_value = None
+    mock_lead_repository.update.return_value = None
 
     with pytest.raises(LeadNotNotFoundError) as e:
         lead_service.update_lead(999, lead_update)
 
-    mock_lead_repository.get.assert_called_once_with(999)
-    mock_lead_repository.update.assert_not_called()
+    mock_lead_repository.update.assert_called_once_with(999, lead_update)
     assert "Lead with id 999 is not found" in str(e.value)
 
 
@@ -142,11 +237,11 @@ def test_delete_lead_deletes_lead_if_found(
     """
     Тестирует, что delete_lead корректно удаляет лида, если оно найдено.
     """
-    mock_lead_repository.get.return_value = lead_get
+    mock_lead_repository.delete.return_value = lead_get
 
     lead_service.delete_lead(1)
 
-    mock_lead_repository.get.assert_called_once_with(1)
+    mock_lead_repository.get.assert_not_called()
     mock_lead_repository.delete.assert_called_once_with(1)
 
 
@@ -156,13 +251,12 @@ def test_delete_lead_raises_lead_not_find_if_not_found(
     """
     Тестирует, что delete_lead выбрасывает LeadNotNotFoundError, если лид не найден.
     """
-    mock_lead_repository.get.return_value = None
+    mock_lead_repository.delete.return_value = None
 
     with pytest.raises(LeadNotNotFoundError) as e:
         lead_service.delete_lead(999)
 
-    mock_lead_repository.get.assert_called_once_with(999)
-    mock_lead_repository.delete.assert_not_called()
+    mock_lead_repository.delete.assert_called_once_with(999)
     assert "Lead with id 999 is not found" in str(e.value)
 
 
@@ -214,3 +308,101 @@ def test_list_ads_calls_repository_with_correct_filters_and_returns_list(
     )
     assert len(result) == 1
     assert result[0] == lead_get
+
+
+def test_list_leads_page_passes_cursor_to_repository(
+    lead_service, mock_lead_repository, lead_get
+):
+    """
+    Тестирует, что list_leads_page передает курсор и сортировку в get_page репозитория.
+    """
+    mock_lead_repository.get_page.return_value = ([lead_get], "next-cursor")
+
+    result = lead_service.list_leads_page(
+        limit=10, cursor="cursor", sort_field="name", sort_order="asc"
+    )
+
+    mock_lead_repository.get_page.assert_called_once_with(
+        limit=10, cursor="cursor", sort_field="name", sort_order="asc"
+    )
+    assert result == ([lead_get], "next-cursor")
+
+
+@pytest.fixture
+def db_metadata():
+    """Схема сервиса для db_engine из common.pytest_fixtures."""
+    return Base.metadata
+
+
+@pytest.fixture
+def unit_of_work(db_engine):
+    with UnitOfWork(db_engine) as unit_of_work:
+        yield unit_of_work
+
+
+@pytest.fixture
+def db_lead_service(unit_of_work):
+    """LeadService поверх настоящего репозитория и SQLite."""
+    return LeadService(lead_repository=LeadRepository(unit_of_work.session))
+
+
+def budget_lead(number):
+    return {
+        "name": "Budget",
+        "first_name": "Lead",
+        "phone": f"+7999000000{number}",
+        "email": f"budget{number}@example.com",
+        "adv_id": 1,
+    }
+
+
+@pytest.fixture
+def stored_lead_id(db_lead_service, unit_of_work):
+    db_lead_service.place_lead(budget_lead(1))
+    unit_of_work.commit()
+    return db_lead_service.list_leads(limit=1, offset=0)[0].id
+
+
+def test_place_lead_query_budget(db_lead_service, unit_of_work, query_budget):
+    """Проверка дубля и INSERT при фиксации."""
+    with query_budget(2):
+        db_lead_service.place_lead(budget_lead(1))
+        unit_of_work.commit()
+
+
+def test_get_lead_query_budget(db_lead_service, stored_lead_id, query_budget):
+    with query_budget(1):
+        db_lead_service.get_lead(stored_lead_id)
+
+
+def test_update_lead_query_budget(db_lead_service, stored_lead_id, query_budget):
+    with query_budget(1):
+        db_lead_service.update_lead(stored_lead_id, budget_lead(2))
+    with query_budget(1):
+        db_lead_service.archive_lead(stored_lead_id)
+
+
+def test_delete_lead_query_budget(db_lead_service, stored_lead_id, query_budget):
+    with query_budget(1):
+        db_lead_service.delete_lead(stored_lead_id)
+
+
+def test_list_leads_query_budget(db_lead_service, stored_lead_id, query_budget):
+    with query_budget(1):
+        db_lead_service.list_leads(limit=10, offset=0)
+    with query_budget(1):
+        db_lead_service.list_leads_page(limit=10)
+
+
+def test_merge_duplicates_query_budget(db_lead_service, unit_of_work, query_budget):
+    """Число запросов не зависит от числа дублей."""
+    for number in range(5):
+        db_lead_service.lead_repository.add(
+            {**budget_lead(number), "email": "same@example.com"}
+        )
+    unit_of_work.commit()
+
+    with query_budget(4):
+        result = db_lead_service.merge_duplicates()
+
+    assert result == {"groups": 1, "merged": 4}
@@ -0,0 +1,72 @@
+from sqlalchemy import create_engine, select, update
+
+from lead.lead_repository.lead_repository import LeadRepository
+from lead.lead_repository.models import Base, LeadModel
+from lead.lead_repository.unit_of_work import UnitOfWork
+from lead.merge_duplicates import merge_duplicates
+
+
+def make_lead(email, phone, is_active=False):
+    return {
+        "name": "Merge User",
+        "first_name": "Merge",
+        "phone": phone,
+        "email": email,
+        "adv_id": 1,
+        "is_active": is_active,
+    }
+
+
+def test_merge_duplicates_keeps_first_lead_of_each_group(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'merge.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with UnitOfWork(engine) as unit_of_work:
+        repo = LeadRepository(unit_of_work.session)
+        for lead in (
+            make_lead("one@example.com", "+79990000001"),
+            make_lead("two@example.com", "+79990000002"),
+            make_lead("ONE@example.com", "89990000003"),
+            make_lead("three@example.com", "8 999 000-00-03", is_active=True),
+            make_lead("four@example.com", "+79990000004"),
+        ):
+            repo.add(lead)
+        unit_of_work.commit()
+    with engine.begin() as connection:
+        # Лиды, созданные до появления нормализованных ключей
+        connection.execute(
+            update(LeadModel).values(email_normalized=None, phone_normalized=None)
+        )
+
+    assert merge_duplicates(database_url, dry_run=True) == {"groups": 1, "merged": 2}
+    assert merge_duplicates(database_url) == {"groups": 1, "merged": 2}
+    assert merge_duplicates(database_url) == {"groups": 0, "merged": 0}
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(LeadModel.id, LeadModel.is_active).order_by(LeadModel.id)
+        ).all()
+    assert [tuple(row) for row in rows] == [(1, True), (2, False), (5, False)]
+    engine.dispose()
+
+
+def test_merge_duplicates_joins_leads_linked_through_another_lead(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'merge.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with UnitOfWork(engine) as unit_of_work:
+        repo = LeadRepository(unit_of_work.session)
+        for lead in (
+            make_lead("a@example.com", "+79990000001"),
+            make_lead("b@example.com", "+79990000003", is_active=True),
+            make_lead("a@example.com", "+79990000003"),
+        ):
+            repo.add(lead)
+        unit_of_work.commit()
+
+    assert merge_duplicates(database_url) == {"groups": 1, "merged": 2}
+
+    with engine.connect() as connection:
+        rows = connection.execute(select(LeadModel.id, LeadModel.is_active)).all()
+    assert [tuple(row) for row in rows] == [(1, True)]
+    engine.dispose()
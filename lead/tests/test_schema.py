@@ -0,0 +1,52 @@
+from sqlalchemy import create_engine, select, text
+
+from lead.lead_repository.models import LeadModel
+from lead.lead_repository.schema import upgrade_schema
+
+# Таблица lead первой версии сервиса: без нормализованных ключей и FTS5
+OLD_LEAD_TABLE = """
+    CREATE TABLE lead (
+        id INTEGER NOT NULL PRIMARY KEY,
+        name VARCHAR(30) NOT NULL,
+        first_name VARCHAR(30) NOT NULL,
+        phone VARCHAR(20) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        is_active BOOLEAN NOT NULL,
+        is_archived BOOLEAN NOT NULL,
+        adv_id INTEGER NOT NULL
+    )
+"""
+
+
+def test_upgrade_schema_migrates_existing_lead_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(OLD_LEAD_TABLE))
+        connection.execute(
+            text(
+                "INSERT INTO lead VALUES "
+                "(1, 'Old', 'Lead', '8 (999) 000-00-01', 'Old@Example.com', 0, 0, 1)"
+            )
+        )
+
+    for _ in range(2):
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+
+    with engine.connect() as connection:
+        lead = connection.execute(select(LeadModel)).one()
+        found = connection.execute(
+            text("SELECT rowid FROM lead_search WHERE lead_search MATCH 'old'")
+        ).all()
+        indexes = set(
+            connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            ).scalars()
+        )
+    assert (lead.email_normalized, lead.phone_normalized) == (
+        "old@example.com",
+        "+79990000001",
+    )
+    assert [tuple(row) for row in found] == [(1,)]
+    assert {"ix_lead_email_normalized", "ix_lead_phone_normalized"} <= indexes
+    engine.dispose()
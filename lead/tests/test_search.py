@@ -0,0 +1,194 @@
+import json
+
+import tornado.testing
+from sqlalchemy import create_engine, text
+
+from lead.app import app
+from lead.lead_repository.async_lead_repository import (
+    AsyncLeadRepository,
+    search_match,
+)
+from lead.lead_repository.async_unit_of_work import (
+    AsyncUnitOfWork,
+    dispose_async_engine,
+    get_async_engine,
+    init_models,
+)
+from lead.lead_repository.models import Base, LeadModel
+from lead.rebuild_search_index import rebuild_search_index
+
+LEADS = [
+    ("Ivanov", "Ivan", "+79990000001", "ivan.ivanov@example.com"),
+    ("Petrov", "Petr", "+79990000002", "petrov@mail.ru"),
+    ("Sidorova", "Anna", "+79995551234", "anna@example.com"),
+    ("Ivanova", "Maria", "+79990000004", "maria@ivanova.org"),
+]
+
+
+async def reset_db():
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await init_models()
+    async with AsyncUnitOfWork() as unit_of_work:
+        await AsyncLeadRepository(unit_of_work.session).add_many(
+            [
+                {
+                    "name": name,
+                    "first_name": first_name,
+                    "phone": phone,
+                    "email": email,
+                    "adv_id": 1,
+                }
+                for name, first_name, phone, email in LEADS
+            ]
+        )
+        await unit_of_work.commit()
+
+
+def test_search_match_quotes_terms():
+    assert search_match("ivan x ok") == '"ivan"'
+    assert search_match('iv"an 555') == '"iv""an" "555"'
+    assert search_match("iv") is None
+
+
+class TestLeadsSearch(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return app()
+
+    def setUp(self):
+        super().setUp()
+        self.io_loop.run_sync(reset_db)
+
+    def tearDown(self):
+        self.io_loop.run_sync(dispose_async_engine)
+        super().tearDown()
+
+    async def search(self, query, **parameters):
+        arguments = "".join(f"&{key}={value}" for key, value in parameters.items())
+        response = await self.http_client.fetch(
+            self.get_url(f"/leads/search?q={query}{arguments}")
+        )
+        return json.loads(response.body)
+
+    @tornado.testing.gen_test
+    async def test_search_finds_substrings_in_all_fields(self):
+        by_name = await self.search("IVANOV")
+        by_phone = await self.search("5551")
+        by_email = await self.search("mail.r")
+        by_terms = await self.search("ivan%20example")
+
+        self.assertEqual(
+            sorted(lead["name"] for lead in by_name["leads"]), ["Ivanov", "Ivanova"]
+        )
+        self.assertEqual([lead["name"] for lead in by_phone["leads"]], ["Sidorova"])
+        self.assertEqual([lead["name"] for lead in by_email["leads"]], ["Petrov"])
+        self.assertEqual([lead["name"] for lead in by_terms["leads"]], ["Ivanov"])
+
+    @tornado.testing.gen_test
+    async def test_search_paginates(self):
+        first = await self.search("7999", limit=3)
+        second = await self.search("7999", limit=3, offset=first["next_offset"])
+
+        self.assertEqual(len(first["leads"]), 3)
+        self.assertEqual(first["next_offset"], 3)
+        self.assertEqual(len(second["leads"]), 1)
+        self.assertIsNone(second["next_offset"])
+        self.assertEqual(
+            len({lead["id"] for lead in first["leads"] + second["leads"]}), 4
+        )
+
+    @tornado.testing.gen_test
+    async def test_search_index_follows_updates_and_deletes(self):
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncLeadRepository(unit_of_work.session)
+            await repo.update(1, {"name": "Smirnov", "email": "smirnov@example.com"})
+            await repo.delete(2)
+            await unit_of_work.commit()
+
+        self.assertEqual(
+            [lead["id"] for lead in (await self.search("smirn"))["leads"]], [1]
+        )
+        self.assertEqual(
+            [lead["name"] for lead in (await self.search("ivanov"))["leads"]],
+            ["Ivanova"],
+        )
+        self.assertEqual((await self.search("petrov"))["leads"], [])
+
+    @tornado.testing.gen_test
+    async def test_short_query_falls_back_to_substring_scan(self):
+        result = await self.search("an")
+
+        self.assertEqual(
+            sorted(lead["name"] for lead in result["leads"]),
+            ["Ivanov", "Ivanova", "Sidorova"],
+        )
+
+    @tornado.testing.gen_test
+    async def test_short_words_narrow_index_matches(self):
+        result = await self.search("ivanov%20ma")
+
+        self.assertEqual([lead["name"] for lead in result["leads"]], ["Ivanova"])
+
+    @tornado.testing.gen_test
+    async def test_substring_scan_requires_every_word(self):
+        result = await self.search("an%2012")
+
+        self.assertEqual([lead["name"] for lead in result["leads"]], ["Sidorova"])
+
+    @tornado.testing.gen_test
+    async def test_search_clamps_limit(self):
+        smallest = await self.search("7999", limit=0)
+        largest = await self.search("7999", limit=1000)
+
+        self.assertEqual(len(smallest["leads"]), 1)
+        self.assertEqual(smallest["next_offset"], 1)
+        self.assertEqual(len(largest["leads"]), 4)
+        self.assertIsNone(largest["next_offset"])
+
+    @tornado.testing.gen_test
+    async def test_search_rejects_non_integer_limit(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads/search?q=ivan&limit=ten"), raise_error=False
+        )
+
+        self.assertEqual(response.code, 400)
+
+    @tornado.testing.gen_test
+    async def test_search_requires_query(self):
+        response = await self.http_client.fetch(
+            self.get_url("/leads/search?q=%20"), raise_error=False
+        )
+
+        self.assertEqual(response.code, 400)
+
+
+def test_rebuild_search_index_indexes_existing_leads(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'search.db'}"
+    engine = create_engine(database_url)
+    # База, созданная до появления индекса
+    LeadModel.__table__.create(engine)
+    with engine.begin() as connection:
+        for trigger in ("insert", "update", "delete"):
+            connection.execute(text(f"DROP TRIGGER lead_search_{trigger}"))
+        connection.execute(text("DROP TABLE lead_search"))
+        connection.execute(
+            LeadModel.__table__.insert(),
+            [
+                {
+                    "name": "Old",
+                    "first_name": "Lead",
+                    "phone": "+79990000001",
+                    "email": "old@example.com",
+                    "adv_id": 1,
+                }
+            ],
+        )
+
+    rebuild_search_index(database_url)
+
+    with engine.connect() as connection:
+        found = connection.execute(
+            text("SELECT rowid FROM lead_search WHERE lead_search MATCH 'old'")
+        ).all()
+    assert [tuple(row) for row in found] == [(1,)]
+    engine.dispose()
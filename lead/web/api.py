@@ -3,15 +3,18 @@ from http.client import HTTPException
 from marshmallow import ValidationError
 from tornado.web import RequestHandler, HTTPError
 
-from lead.lead_repository.lead_repository import LeadRepository
-from lead.lead_repository.unit_of_work import UnitOfWork
-from lead.lead_service.exeptions import LeadNotNotFoundError
-from lead.lead_service.lead_service import LeadService
+from common.instrumentation import InstrumentedHandlerMixin
+from common.pagination import InvalidCursorError
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import AsyncUnitOfWork
+from lead.lead_service.cache import get_lead_cache
+from lead.lead_service.exeptions import LeadDuplicateError, LeadNotNotFoundError
+from lead.lead_service.lead_service import AsyncLeadService
 from lead.web.schemas import CreateLeadSchema, GetLeadSchema
 
 
-class Leads(RequestHandler):
-    def get(self):
+class Leads(InstrumentedHandlerMixin, RequestHandler):
+    async def get(self):
         parameters = {
             "limit": int(self.get_query_argument("limit", "10")),
             "offset": int(self.get_query_argument("offset", "0")),
@@ -19,18 +22,32 @@ class Leads(RequestHandler):
             "sort_order": self.get_query_argument("sort_order", "asc"),
         }
         try:
-            with UnitOfWork() as unit_of_work:
-                repo = LeadRepository(unit_of_work.session)
-                lead_service = LeadService(repo)
-                all_leads = lead_service.list_leads(**parameters)
-            self.write({"leads": [lead.dict() for lead in all_leads]})
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                if parameters["offset"]:
+                    all_leads = await lead_service.list_leads(**parameters)
+                    next_cursor = None
+                else:
+                    parameters.pop("offset")
+                    all_leads, next_cursor = await lead_service.list_leads_page(
+                        cursor=self.get_query_argument("cursor", None), **parameters
+                    )
+            self.write(
+                {
+                    "leads": [lead.dict() for lead in all_leads],
+                    "next_cursor": next_cursor,
+                }
+            )
 
         except LeadNotNotFoundError:
             raise HTTPError(404, reason="Leads not founds")
+        except InvalidCursorError as e:
+            raise HTTPError(400, reason=str(e))
 
 
-class Lead(RequestHandler):
-    def post(self):
+class Lead(InstrumentedHandlerMixin, RequestHandler):
+    async def post(self):
         try:
             payload = {
                 "name": self.get_argument("name"),
@@ -40,11 +57,11 @@ class Lead(RequestHandler):
                 "adv_id": int(self.get_argument("adv_id")),
             }
             CreateLeadSchema().validate(payload)
-            with UnitOfWork() as unit_of_work:
-                repo = LeadRepository(unit_of_work.session)
-                lead_service = LeadService(repo)
-                lead = lead_service.place_lead(payload)
-                unit_of_work.commit()
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                lead = await lead_service.place_lead(payload)
+                await unit_of_work.commit()
             self.set_status(200)
             self.write(lead.dict())
 
@@ -52,21 +69,25 @@ class Lead(RequestHandler):
             self.set_status(400)
             self.write({"errors": e.messages})
 
+        except LeadDuplicateError as e:
+            self.set_status(409)
+            self.write({"error": str(e), "lead_id": e.lead_id})
+
         except HTTPException as e:
             self.set_status(e.code)
             self.write({"error": e.message})
 
-    def get(self, lead_id=None):
+    async def get(self, lead_id=None):
         try:
-            with UnitOfWork() as unit_of_work:
-                repo = LeadRepository(unit_of_work.session)
-                lead_service = LeadService(repo)
-                result = lead_service.get_lead(lead_id)
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                result = await lead_service.get_lead(lead_id)
             self.write(result.dict())
         except LeadNotNotFoundError:
             raise HTTPError(404, reason="Lead not found")
 
-    def put(self, lead_id=None):
+    async def put(self, lead_id=None):
         try:
             payload = {
                 "name": self.get_argument("name"),
@@ -76,22 +97,49 @@ class Lead(RequestHandler):
                 "adv_id": int(self.get_argument("adv_id")),
             }
 
-            with UnitOfWork() as unit_of_work:
-                repo = LeadRepository(unit_of_work.session)
-                lead_service = LeadService(repo)
-                result = lead_service.update_lead(lead_id, **payload)
-                unit_of_work.commit()
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                result = await lead_service.update_lead(lead_id, payload)
+                await unit_of_work.commit()
             self.write(result.dict())
         except LeadNotNotFoundError:
             raise HTTPError(404, reason="Lead not found")
 
-    def delete(self, lead_id=None):
+    async def delete(self, lead_id=None):
         try:
-            with UnitOfWork() as unit_of_work:
-                repo = LeadRepository(unit_of_work.session)
-                lead_service = LeadService(repo)
-                lead_service.delete_lead(lead_id)
-                unit_of_work.commit()
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                await lead_service.delete_lead(lead_id)
+                await unit_of_work.commit()
             self.set_status(204)
         except LeadNotNotFoundError:
             raise HTTPError(404, reason="Lead not found")
+
+
+class LeadsSearch(InstrumentedHandlerMixin, RequestHandler):
+    async def get(self):
+        query = self.get_query_argument("q", "").strip()
+        if not query:
+            raise HTTPError(400, reason="Query parameter q is required")
+        try:
+            limit = int(self.get_query_argument("limit", "10"))
+            offset = int(self.get_query_argument("offset", "0"))
+        except ValueError:
+            raise HTTPError(400, reason="limit and offset must be integers")
+        # Границы limit те же, что в GetLeadsParameters
+        limit = min(max(limit, 1), 50)
+        offset = max(offset, 0)
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncLeadRepository(unit_of_work.session)
+            lead_service = AsyncLeadService(repo)
+            leads = await lead_service.search_leads(
+                query, limit=limit + 1, offset=offset
+            )
+        self.write(
+            {
+                "leads": [lead.dict() for lead in leads[:limit]],
+                "next_offset": offset + limit if len(leads) > limit else None,
+            }
+        )
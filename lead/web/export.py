@@ -0,0 +1,50 @@
+"""
+Потоковая выгрузка лидов в CSV или NDJSON.
+
+Строки читаются серверным курсором пачками, каждая пачка сразу
+отправляется клиенту через flush().
+"""
+
+from tornado.web import RequestHandler, HTTPError
+
+from common.export import EXPORT_FORMATS, csv_header, csv_rows, ndjson_lines
+from common.instrumentation import InstrumentedHandlerMixin
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import AsyncUnitOfWork
+from lead.lead_service.lead_service import AsyncLeadService
+
+EXPORT_FILTERS = {"adv_id": int, "is_active": lambda value: value == "true"}
+
+
+class LeadsExport(InstrumentedHandlerMixin, RequestHandler):
+    async def get(self):
+        export_format = self.get_query_argument("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise HTTPError(400, reason=f"Unknown export format '{export_format}'")
+        try:
+            filters = {
+                name: convert(self.get_query_argument(name))
+                for name, convert in EXPORT_FILTERS.items()
+                if self.get_query_argument(name, None) is not None
+            }
+        except ValueError:
+            raise HTTPError(400, reason="adv_id must be an integer")
+
+        self.set_header("Content-Type", EXPORT_FORMATS[export_format])
+        self.set_header(
+            "Content-Disposition", f'attachment; filename="leads.{export_format}"'
+        )
+        columns = AsyncLeadRepository.EXPORT_COLUMNS
+        if export_format == "csv":
+            self.write(csv_header(columns))
+
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncLeadRepository(unit_of_work.session)
+            lead_service = AsyncLeadService(repo)
+            async for rows in lead_service.export_leads(**filters):
+                if export_format == "csv":
+                    lines = csv_rows(rows)
+                else:
+                    lines = ndjson_lines(columns, rows)
+                self.write(b"".join(lines))
+                await self.flush()
@@ -0,0 +1,141 @@
+"""
+Потоковая загрузка лидов в формате NDJSON.
+
+Тело запроса читается по частям, каждая полная строка проверяется
+CreateLeadSchema, проверенные лиды вставляются пачками по
+ingest_batch_size. Память не зависит от размера загрузки: в ней
+хранятся только незавершенная строка и текущая пачка. Дубли по email
+и телефону отклоняются так же, как невалидные строки.
+
+Каждая пачка фиксируется отдельной транзакцией. Если БД отклонила пачку,
+она откатывается целиком, диапазон ее строк попадает в failed_batches
+отчета, а загрузка продолжается со следующей пачки: inserted - число
+строк из зафиксированных пачек.
+"""
+
+import json
+import time
+
+from marshmallow import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from tornado.web import RequestHandler, stream_request_body
+
+from common.instrumentation import InstrumentedHandlerMixin
+from lead.lead_repository.async_lead_repository import AsyncLeadRepository
+from lead.lead_repository.async_unit_of_work import AsyncUnitOfWork
+from lead.lead_service.cache import get_lead_cache
+from lead.lead_service.lead_service import AsyncLeadService
+from lead.lead_settings.app_settings import get_settings
+from lead.web.schemas import CreateLeadSchema
+
+
+@stream_request_body
+class LeadsIngest(InstrumentedHandlerMixin, RequestHandler):
+    def prepare(self):
+        super().prepare()
+        self.ingest_settings = get_settings()
+        self.request.connection.set_max_body_size(
+            self.ingest_settings.ingest_max_body_size
+        )
+        self.schema = CreateLeadSchema()
+        self.buffer = b""
+        self.skip_line = False
+        self.line_number = 0
+        self.batch = []
+        self.inserted = 0
+        self.rejected = 0
+        self.rejected_lines = []
+        self.failed = 0
+        self.failed_batches = []
+        self.started = time.perf_counter()
+
+    async def data_received(self, chunk):
+        if self.skip_line:
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                return
+            chunk = chunk[newline + 1 :]
+            self.skip_line = False
+        self.buffer += chunk
+        if b"\n" in chunk:
+            *lines, self.buffer = self.buffer.split(b"\n")
+            for line in lines:
+                self.accept_line(line)
+        if len(self.buffer) > self.ingest_settings.ingest_max_line_size:
+            # Остаток слишком длинной строки пропускается до следующего перевода строки
+            self.line_number += 1
+            self.reject(self.line_number, "Line is too long")
+            self.buffer = b""
+            self.skip_line = True
+        if len(self.batch) >= self.ingest_settings.ingest_batch_size:
+            await self.flush_batch()
+
+    def accept_line(self, line: bytes):
+        self.line_number += 1
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Line must be a JSON object")
+            self.batch.append((self.line_number, self.schema.load(record)))
+        except ValidationError as e:
+            self.reject(self.line_number, e.messages)
+        except ValueError as e:
+            self.reject(self.line_number, str(e))
+
+    def reject(self, line_number: int, errors):
+        self.rejected += 1
+        if len(self.rejected_lines) < self.ingest_settings.ingest_max_rejected_details:
+            self.rejected_lines.append({"line": line_number, "errors": errors})
+
+    async def flush_batch(self):
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        try:
+            async with AsyncUnitOfWork() as unit_of_work:
+                repo = AsyncLeadRepository(unit_of_work.session)
+                lead_service = AsyncLeadService(repo, cache=get_lead_cache())
+                inserted, duplicates = await lead_service.place_leads(
+                    [record for _, record in batch]
+                )
+                await unit_of_work.commit()
+        except SQLAlchemyError as e:
+            # AsyncUnitOfWork уже откатил пачку
+            print(f"Error ingesting leads: {e}")
+            self.failed += len(batch)
+            if (
+                len(self.failed_batches)
+                < self.ingest_settings.ingest_max_rejected_details
+            ):
+                self.failed_batches.append(
+                    {
+                        "first_line": batch[0][0],
+                        "last_line": batch[-1][0],
+                        "errors": type(e).__name__,
+                    }
+                )
+            return
+        self.inserted += inserted
+        for position in duplicates:
+            self.reject(batch[position][0], "Duplicate lead")
+
+    async def post(self):
+        if self.buffer:
+            self.accept_line(self.buffer)
+            self.buffer = b""
+        await self.flush_batch()
+
+        elapsed = time.perf_counter() - self.started
+        self.write(
+            {
+                "inserted": self.inserted,
+                "rejected": self.rejected,
+                "rejected_lines": self.rejected_lines,
+                "failed": self.failed,
+                "failed_batches": self.failed_batches,
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_sec": round(self.inserted / elapsed, 1) if elapsed else 0.0,
+            }
+        )
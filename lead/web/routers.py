@@ -4,9 +4,14 @@
 
 from tornado.web import URLSpec
 
-from lead.web.api import Lead, Leads
+from lead.web.api import Lead, Leads, LeadsSearch
+from lead.web.export import LeadsExport
+from lead.web.ingest import LeadsIngest
 
 routers = [
     URLSpec(r"/leads/?(\d+)?", Lead),
     URLSpec(r"/leads/list/", Leads),
+    URLSpec(r"/leads/search/?", LeadsSearch),
+    URLSpec(r"/leads/ingest/", LeadsIngest),
+    URLSpec(r"/leads/export/", LeadsExport),
 ]
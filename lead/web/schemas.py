@@ -23,6 +23,7 @@ class GetLeadsSchema(Schema):
         unknown = EXCLUDE
 
     leads = fields.List(fields.Nested(GetLeadSchema), required=True)
+    next_cursor = fields.Str(allow_none=True)
 
 
 class GetLeadsParameters(Schema):
@@ -35,3 +36,4 @@ class GetLeadsParameters(Schema):
     sort_order = fields.Str(
         load_default="asc", validate=validate.OneOf(["asc", "desc"])
     )
+    cursor = fields.Str()
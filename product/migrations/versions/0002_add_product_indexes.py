@@ -0,0 +1,33 @@
+"""add product indexes
+
+Уникальный индекс по name для поиска GET/PUT /products/{product_name}
+и индексы по price и created_at для сортировок SortField.
+Перед применением в таблице не должно быть продуктов с одинаковым name.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-06-02 10:05:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_product_name", "product", ["name"], unique=True)
+    op.create_index("ix_product_price", "product", ["price"])
+    op.create_index("ix_product_created_at", "product", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_created_at", table_name="product")
+    op.drop_index("ix_product_price", table_name="product")
+    op.drop_index("ix_product_name", table_name="product")
@@ -0,0 +1,178 @@
+from typing import Dict, Any, List, Set, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.pagination import apply_keyset, split_page
+from product.product_repository.models import ProductModel
+from product.product_service.products import Product, ProductRow
+
+
+class AsyncProductRepository:
+    """
+    Асинхронный репозиторий для Product поверх AsyncSession.
+    Повторяет интерфейс ProductRepository, методы являются корутинами.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def after_commit(self, callback) -> None:
+        """Регистрирует callback, который AsyncUnitOfWork вызовет после commit."""
+        self.session.info.setdefault("after_commit", []).append(callback)
+
+    def _select_rows(self):
+        """SELECT колонок ProductRow без загрузки ORM-объектов."""
+        return select(
+            *(getattr(ProductModel, column) for column in ProductRow.__slots__)
+        )
+
+    async def get_list(
+        self,
+        limit: int | None,
+        offset: int | None,
+        sort_field: str | None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> List[ProductRow]:
+        try:
+            query = self._select_rows().filter_by(**filters)
+            if sort_field is not None:
+                column = getattr(ProductModel, sort_field, None)
+                if column is not None:
+                    if sort_order.lower() == "desc":
+                        query = query.order_by(column.desc())
+                    else:
+                        query = query.order_by(column.asc())
+                else:
+                    print(
+                        f"Warning: Sort field '{sort_field}' not found in ProductModel."
+                    )
+            if limit is not None:
+                query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
+            return [ProductRow(*row) for row in await self.session.execute(query)]
+        except SQLAlchemyError as e:
+            print(f"Error getting products: {e}")
+            return []
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort_field: str | None = None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> Tuple[List[ProductRow], str | None]:
+        """Страница списка по курсору и курсор следующей страницы."""
+        try:
+            query = self._select_rows().filter_by(**filters)
+            query, sort_field, sort_order = apply_keyset(
+                query, ProductModel, sort_field, sort_order, cursor
+            )
+            records = [
+                ProductRow(*row)
+                for row in await self.session.execute(query.limit(limit + 1))
+            ]
+            return split_page(records, limit, sort_field, sort_order)
+        except SQLAlchemyError as e:
+            print(f"Error getting products: {e}")
+            return [], None
+
+    async def add(self, product: Dict[str, Any]) -> Product | None:
+        """Вставляет продукт и сразу получает id: после commit атрибуты не догружаются."""
+        try:
+            record = ProductModel(**product)
+            self.session.add(record)
+            await self.session.flush()
+            return Product(**record.dict())
+        except IntegrityError:
+            raise
+        except SQLAlchemyError as e:
+            print(f"Error adding product: {e}")
+            return None
+
+    async def add_many(self, products: List[Dict[str, Any]]) -> List[int]:
+        """Вставляет продукты одним executemany и возвращает их id в порядке входа."""
+        if not products:
+            return []
+        result = await self.session.execute(
+            insert(ProductModel).returning(ProductModel.id, ProductModel.name),
+            products,
+        )
+        ids = {name: id_ for id_, name in result}
+        return [ids[product["name"]] for product in products]
+
+    async def get_existing_names(self, names: List[str]) -> Set[str]:
+        if not names:
+            return set()
+        return set(
+            await self.session.scalars(
+                select(ProductModel.name).where(ProductModel.name.in_(names))
+            )
+        )
+
+    async def get_by_id(self, id_: int) -> Product | None:
+        try:
+            product = await self.session.get(ProductModel, id_)
+            if product:
+                return Product(**product.dict())
+            return None
+        except SQLAlchemyError as e:
+            print(f"Error getting product: {e}")
+            return None
+
+    async def get_by_name(self, name_: str) -> Product | None:
+        try:
+            product = await self.session.scalar(
+                select(ProductModel).where(ProductModel.name == name_)
+            )
+            if product:
+                return Product(**product.dict())
+            return None
+        except SQLAlchemyError as e:
+            print(f"Error getting product: {e}")
+            return None
+
+    async def update(self, name_: str, new_product: Dict[str, Any]) -> Product | None:
+        """Обновляет продукт одним UPDATE ... RETURNING, None если продукт не найден."""
+        # UPDATE минует @validates модели: проверяем значения заранее
+        ProductModel(**new_product)
+        try:
+            record = (
+                await self.session.scalars(
+                    update(ProductModel)
+                    .where(ProductModel.name == name_)
+                    .values(**new_product, version=ProductModel.version + 1)
+                    .returning(ProductModel),
+                    execution_options={"synchronize_session": False},
+                )
+            ).first()
+            if record is None:
+                return None
+            return Product(**record.dict())
+        except IntegrityError:
+            raise
+        except SQLAlchemyError as e:
+            print(f"Error updating product: {e}")
+            return None
+
+    async def delete(self, id_: int) -> Product | None:
+        """Удаляет продукт одним DELETE ... RETURNING и возвращает удаленный продукт."""
+        try:
+            record = (
+                await self.session.scalars(
+                    delete(ProductModel)
+                    .where(ProductModel.id == id_)
+                    .returning(ProductModel),
+                    execution_options={"synchronize_session": False},
+                )
+            ).first()
+            if record is None:
+                return None
+            return Product(**record.dict())
+        except SQLAlchemyError as e:
+            print(f"Error deleting product: {e}")
+            return None
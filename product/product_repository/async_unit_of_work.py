@@ -0,0 +1,84 @@
+"""
+Асинхронный движок и единица работы сервиса Product.
+
+Движок на asyncio-драйвере (aiosqlite, asyncpg) создается один раз на
+процесс с теми же настройками пула, что и синхронный движок. Асинхронные
+обработчики FastAPI работают в цикле событий и не занимают пул потоков.
+"""
+
+import os
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from common.database import to_async_url
+from common.instrumentation import instrument_engine
+from product.product_repository.engine import _engine_options
+from product.settings.app_settings import settings
+
+_engine: AsyncEngine | None = None
+_session_maker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Возвращает асинхронный движок процесса, создавая его при первом вызове."""
+    global _engine, _session_maker
+    if _engine is None:
+        _engine = create_async_engine(
+            to_async_url(settings.DATABASE_URL),
+            **_engine_options(settings.DATABASE_URL),
+        )
+        instrument_engine(_engine.sync_engine)
+        _session_maker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _engine
+
+
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    get_async_engine()
+    return _session_maker
+
+
+async def dispose_async_engine() -> None:
+    """Закрывает пул соединений, следующий вызов создаст новый движок."""
+    global _engine, _session_maker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_maker = None
+
+
+def _reset_after_fork() -> None:
+    if _engine is not None:
+        # Соединения принадлежат родителю: сбрасываем пул, не закрывая их
+        _engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class AsyncUnitOfWork:
+    def __init__(self, session_maker=None):
+        self.session_maker = session_maker or get_async_session_maker()
+
+    async def __aenter__(self):
+        self.session = self.session_maker()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            await self.rollback()
+        await self.session.close()
+
+    async def commit(self):
+        await self.session.commit()
+        for callback in self.session.info.pop("after_commit", []):
+            callback()
+
+    async def rollback(self):
+        await self.session.rollback()
+        self.session.info.pop("after_commit", None)
@@ -0,0 +1,81 @@
+"""
+Общий для процесса движок БД и фабрика сессий сервиса Product.
+
+Движок создается лениво при первом обращении и переиспользуется всеми
+UnitOfWork процесса. После fork дочерний процесс получает новый пул
+соединений, не закрывая соединения родителя.
+"""
+
+import os
+import threading
+
+from sqlalchemy import create_engine, Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, Session
+
+from common.instrumentation import instrument_engine
+from product.settings.app_settings import settings
+
+_lock = threading.Lock()
+_engine: Engine | None = None
+_session_maker: sessionmaker[Session] | None = None
+
+
+def _engine_options(database_url: str) -> dict:
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # SQLite в памяти работает через SingletonThreadPool без размеров пула
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def get_engine() -> Engine:
+    """Возвращает движок процесса, создавая его при первом вызове."""
+    global _engine, _session_maker
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(
+                    settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL)
+                )
+                instrument_engine(engine)
+                _session_maker = sessionmaker(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def get_session_maker() -> sessionmaker[Session]:
+    """Возвращает фабрику сессий, привязанную к движку процесса."""
+    get_engine()
+    return _session_maker
+
+
+def dispose_engine() -> None:
+    """Закрывает пул соединений, следующий вызов get_engine создаст новый движок."""
+    global _engine, _session_maker
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_maker = None
+
+
+def _reset_after_fork() -> None:
+    global _lock
+    _lock = threading.Lock()
+    if _engine is not None:
+        # Соединения принадлежат родителю: сбрасываем пул, не закрывая их
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
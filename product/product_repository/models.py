@@ -1,6 +1,6 @@
 from datetime import datetime, UTC
 from decimal import Decimal
-from sqlalchemy import String, Numeric, DateTime
+from sqlalchemy import String, Numeric, DateTime, Integer
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
 
@@ -13,9 +13,17 @@ class ProductModel(Base):
     __tablename__ = "product"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(String(30), nullable=False)
-    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now(UTC))
+    name: Mapped[str] = mapped_column(
+        String(30), nullable=False, unique=True, index=True
+    )
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(UTC), index=True
+    )
+    # Увеличивается каждым UPDATE, по ней считаются ETag
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
 
     def __repr__(self) -> str:
         return f"Product(id={self.id!r}, name={self.name!r}, price={self.price!r})"
@@ -26,6 +34,7 @@ class ProductModel(Base):
             "name": self.name,
             "price": str(self.price),
             "created_at": self.created_at.isoformat() if self.created_at else None,
+            "version": self.version,
         }
 
     def formatted_price(self) -> str:
@@ -1,9 +1,12 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Set, Tuple
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+
+from common.pagination import apply_keyset, split_page
 from product.product_repository.models import ProductModel
-from product.product_service.products import Product
+from product.product_service.products import Product, ProductRow
 
 
 class ProductRepository:
@@ -17,9 +20,21 @@ class ProductRepository:
 
     """
 
+    EXPORT_COLUMNS = ("id", "name", "price", "created_at")
+
     def __init__(self, session: Session):
         self.session = session
 
+    def after_commit(self, callback) -> None:
+        """Регистрирует callback, который UnitOfWork вызовет после commit."""
+        self.session.info.setdefault("after_commit", []).append(callback)
+
+    def _select_rows(self):
+        """SELECT колонок ProductRow без загрузки ORM-объектов."""
+        return select(
+            *(getattr(ProductModel, column) for column in ProductRow.__slots__)
+        )
+
     def _get_by_id(self, id_: int) -> ProductModel | None:
         try:
             return (
@@ -47,9 +62,9 @@ class ProductRepository:
         sort_field: str | None,
         sort_order: str = "asc",
         **filters,
-    ) -> List[Product] | None:
+    ) -> List[ProductRow] | None:
         try:
-            query = self.session.query(ProductModel).filter_by(**filters)
+            query = self._select_rows().filter_by(**filters)
             if sort_field is not None:
                 column = getattr(ProductModel, sort_field, None)
                 if column is not None:
@@ -65,13 +80,47 @@ class ProductRepository:
                 query = query.limit(limit)
             if offset > 0:
                 query = query.offset(offset)
-            products = query.all()
-
-            return [Product(**product.dict()) for product in products]
+            return [ProductRow(*row) for row in self.session.execute(query)]
         except SQLAlchemyError as e:
             print(f"Error getting products: {e}")
             return []
 
+    def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort_field: str | None = None,
+        sort_order: str = "asc",
+        **filters,
+    ) -> Tuple[List[ProductRow], str | None]:
+        """Страница списка по курсору и курсор следующей страницы."""
+        try:
+            query = self._select_rows().filter_by(**filters)
+            query, sort_field, sort_order = apply_keyset(
+                query, ProductModel, sort_field, sort_order, cursor
+            )
+            records = [
+                ProductRow(*row) for row in self.session.execute(query.limit(limit + 1))
+            ]
+            return split_page(records, limit, sort_field, sort_order)
+        except SQLAlchemyError as e:
+            print(f"Error getting products: {e}")
+            return [], None
+
+    def stream_rows(self, batch_size: int = 1000, **filters) -> Iterator[Tuple]:
+        """
+        Построчно отдает кортежи EXPORT_COLUMNS без создания ORM-объектов.
+        Строки читаются с сервера пачками по batch_size.
+        """
+        query = (
+            select(*(getattr(ProductModel, column) for column in self.EXPORT_COLUMNS))
+            .filter_by(**filters)
+            .order_by(ProductModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in self.session.execute(query):
+            yield tuple(row)
+
     def add(self, product: Dict[str, Any]) -> Product | None:
         try:
             record = ProductModel(**product)
@@ -81,6 +130,30 @@ class ProductRepository:
             print(f"Error adding product: {e}")
             return None
 
+    def add_many(self, products: List[Dict[str, Any]]) -> List[int]:
+        """
+        Вставляет продукты одним executemany и возвращает их id в порядке входа.
+        Имена уникальны, поэтому id сопоставляются по RETURNING name: с
+        sort_by_parameter_order SQLite выполнял бы INSERT на каждую строку.
+        """
+        if not products:
+            return []
+        result = self.session.execute(
+            insert(ProductModel).returning(ProductModel.id, ProductModel.name),
+            products,
+        )
+        ids = {name: id_ for id_, name in result}
+        return [ids[product["name"]] for product in products]
+
+    def get_existing_names(self, names: List[str]) -> Set[str]:
+        if not names:
+            return set()
+        return set(
+            self.session.scalars(
+                select(ProductModel.name).where(ProductModel.name.in_(names))
+            )
+        )
+
     def get_by_id(self, id_: int) -> Product | None:
         try:
             product = self._get_by_id(id_)
@@ -102,22 +175,38 @@ class ProductRepository:
             return None
 
     def update(self, name_: str, new_product: Dict[str, Any]) -> Product | None:
+        """Обновляет продукт одним UPDATE ... RETURNING, None если продукт не найден."""
+        # UPDATE минует @validates модели: проверяем значения заранее
+        ProductModel(**new_product)
         try:
-            record = self._get_by_name(name_)
+            record = self.session.scalars(
+                update(ProductModel)
+                .where(ProductModel.name == name_)
+                .values(**new_product, version=ProductModel.version + 1)
+                .returning(ProductModel),
+                execution_options={"synchronize_session": False},
+            ).first()
             if record is None:
                 return None
-            for key, val in new_product.items():
-                setattr(record, key, val)
             return Product(**record.dict())
-
+        except IntegrityError:
+            raise
         except SQLAlchemyError as e:
-            print(f"Error getting product: {e}")
+            print(f"Error updating product: {e}")
             return None
 
-    def delete(self, id_: int):
+    def delete(self, id_: int) -> Product | None:
+        """Удаляет продукт одним DELETE ... RETURNING и возвращает удаленный продукт."""
         try:
-            record = self._get_by_id(id_)
-            if record:
-                self.session.delete(record)
+            record = self.session.scalars(
+                delete(ProductModel)
+                .where(ProductModel.id == id_)
+                .returning(ProductModel),
+                execution_options={"synchronize_session": False},
+            ).first()
+            if record is None:
+                return None
+            return Product(**record.dict())
         except SQLAlchemyError as e:
             print(f"Error deleting product: {e}")
+            return None
@@ -1,12 +1,9 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from product.settings.bd_settings import settings
+from product.product_repository.engine import get_session_maker
 
 
 class UnitOfWork:
     def __init__(self):
-        self.session_maker = sessionmaker(bind=create_engine(settings.DATABASE_URL))
+        self.session_maker = get_session_maker()
 
     def __enter__(self):
         self.session = self.session_maker()
@@ -20,6 +17,9 @@ class UnitOfWork:
 
     def commit(self):
         self.session.commit()
+        for callback in self.session.info.pop("after_commit", []):
+            callback()
 
     def rollback(self):
         self.session.rollback()
+        self.session.info.pop("after_commit", None)
@@ -0,0 +1,102 @@
+"""
+Кэш продуктов в памяти процесса: LRU с ограничением размера и TTL.
+
+Записи хранятся по id, имя продукта ссылается на id. Каждая
+инвалидация увеличивает поколение кэша: значение, прочитанное из БД
+до инвалидации, не попадет в кэш после нее.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ProductCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._names: dict = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, id_):
+        entry = self._entries.get(id_)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, product = entry
+        if expires_at <= self._clock():
+            self._remove(id_)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(id_)
+        self.hits += 1
+        return product
+
+    def _remove(self, id_):
+        entry = self._entries.pop(id_, None)
+        if entry is not None:
+            self._names.pop(entry[1].name, None)
+
+    def get_by_name(self, name):
+        with self._lock:
+            id_ = self._names.get(name)
+            if id_ is None:
+                self.misses += 1
+                return None
+            return self._lookup(id_)
+
+    def get_by_id(self, id_):
+        with self._lock:
+            return self._lookup(id_)
+
+    def put(self, product, generation: int | None = None):
+        """Сохраняет продукт, если с момента чтения generation не было инвалидаций."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._remove(product.id)
+            stale_id = self._names.get(product.name)
+            if stale_id is not None:
+                self._remove(stale_id)
+            self._entries[product.id] = (self._clock() + self.ttl, product)
+            self._names[product.name] = product.id
+            while len(self._entries) > self.maxsize:
+                id_, (_, evicted) = self._entries.popitem(last=False)
+                self._names.pop(evicted.name, None)
+                self.evictions += 1
+
+    def invalidate(self, name=None, id_=None):
+        with self._lock:
+            self.generation += 1
+            if name is not None:
+                name_id = self._names.get(name)
+                if name_id is not None:
+                    self._remove(name_id)
+            if id_ is not None:
+                self._remove(id_)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._names.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -3,31 +3,116 @@
 from product.product_service.exeptions import ProductNotFoundError
 
 
+def check_batch(items):
+    """
+    Проверяет элементы пачки без обращения к БД.
+    Возвращает результаты с ошибками по позициям и позиции годных элементов.
+    """
+    results = [None] * len(items)
+    pending = []
+    seen = set()
+    for position, item in enumerate(items):
+        name = item.get("name")
+        if not name:
+            results[position] = {"error": "Name must not be empty"}
+        elif item.get("price") is None or item["price"] < 0:
+            results[position] = {"error": "Price must be non-negative"}
+        elif name in seen:
+            results[position] = {"error": f"Duplicate name '{name}' in batch"}
+        else:
+            seen.add(name)
+            pending.append(position)
+    return results, pending
+
+
+def split_existing(items, chunk, existing, results):
+    """Отмечает ошибкой уже существующие имена и возвращает позиции для вставки."""
+    to_insert = []
+    for position in chunk:
+        name = items[position]["name"]
+        if name in existing:
+            results[position] = {"error": f"Product '{name}' already exists"}
+        else:
+            to_insert.append(position)
+    return to_insert
+
+
 class ProductService:
-    def __init__(self, product_repository):
+    def __init__(self, product_repository, cache=None):
         self.product_repository = product_repository
+        self.cache = cache
+
+    def _invalidate_after_commit(self, *keys):
+        """Сбрасывает записи кэша (name, id) только после фиксации транзакции."""
+        cache = self.cache
+
+        def invalidate():
+            for name, id_ in keys:
+                cache.invalidate(name=name, id_=id_)
+
+        self.product_repository.after_commit(invalidate)
 
     def place_product(self, item):
-        return self.product_repository.add(item)
+        product = self.product_repository.add(item)
+        if self.cache is not None:
+            self._invalidate_after_commit((item.get("name"), None))
+        return product
+
+    def place_products(self, items, chunk_size=1000):
+        """
+        Создает продукты пачками по chunk_size в текущей транзакции.
+        Возвращает результат для каждого элемента items: {"id": ...} или {"error": ...}.
+        Ошибочные элементы не прерывают вставку остальных.
+        """
+        results, pending = check_batch(items)
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            existing = self.product_repository.get_existing_names(
+                [items[position]["name"] for position in chunk]
+            )
+            to_insert = split_existing(items, chunk, existing, results)
+            ids = self.product_repository.add_many(
+                [items[position] for position in to_insert]
+            )
+            for position, id_ in zip(to_insert, ids):
+                results[position] = {"id": id_}
+
+        if self.cache is not None:
+            self._invalidate_after_commit(
+                *((items[position]["name"], None) for position in pending)
+            )
+        return results
 
     def get_product(self, product_name):
+        generation = None
+        if self.cache is not None:
+            product = self.cache.get_by_name(product_name)
+            if product is not None:
+                return product
+            generation = self.cache.generation
         product = self.product_repository.get_by_name(product_name)
         if product is not None:
+            if self.cache is not None:
+                self.cache.put(product, generation=generation)
             return product
         raise ProductNotFoundError(f"Product '{product_name}' is not found")
 
     def update_product(self, product_name, new_product):
-        product = self.product_repository.get_by_name(product_name)
-        if product is None:
+        result = self.product_repository.update(product_name, new_product)
+        if result is None:
             raise ProductNotFoundError(f"Product with name {product_name} is not found")
-        print(product_name, new_product)
-        return self.product_repository.update(product_name, new_product)
+        if self.cache is not None:
+            self._invalidate_after_commit(
+                (product_name, result.id), (new_product.get("name"), None)
+            )
+        return result
 
     def delete_product(self, product_id):
-        product = self.product_repository.get_by_id(product_id)
+        product = self.product_repository.delete(product_id)
         if product is None:
             raise ProductNotFoundError(f"Product with id {product_id} is not found")
-        self.product_repository.delete(product_id)
+        if self.cache is not None:
+            self._invalidate_after_commit((product.name, product_id))
 
     def list_products(self, **filters):
         limit = filters.pop("limit", None)
@@ -42,3 +127,126 @@ class ProductService:
             sort_order=sort_order,
             **filters,
         )
+
+    def list_products_page(self, **filters):
+        limit = filters.pop("limit", 10)
+        cursor = filters.pop("cursor", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+
+        return self.product_repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
+
+    def export_products(self, batch_size=1000, **filters):
+        return self.product_repository.stream_rows(batch_size=batch_size, **filters)
+
+
+class AsyncProductService:
+    """
+    Бизнес логика Product поверх асинхронного репозитория.
+    Кэш в памяти процесса не блокирует, поэтому работает с ним напрямую.
+    """
+
+    def __init__(self, product_repository, cache=None):
+        self.product_repository = product_repository
+        self.cache = cache
+
+    def _invalidate_after_commit(self, *keys):
+        """Сбрасывает записи кэша (name, id) только после фиксации транзакции."""
+        cache = self.cache
+
+        def invalidate():
+            for name, id_ in keys:
+                cache.invalidate(name=name, id_=id_)
+
+        self.product_repository.after_commit(invalidate)
+
+    async def place_product(self, item):
+        product = await self.product_repository.add(item)
+        if self.cache is not None:
+            self._invalidate_after_commit((item.get("name"), None))
+        return product
+
+    async def place_products(self, items, chunk_size=1000):
+        results, pending = check_batch(items)
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start : start + chunk_size]
+            existing = await self.product_repository.get_existing_names(
+                [items[position]["name"] for position in chunk]
+            )
+            to_insert = split_existing(items, chunk, existing, results)
+            ids = await self.product_repository.add_many(
+                [items[position] for position in to_insert]
+            )
+            for position, id_ in zip(to_insert, ids):
+                results[position] = {"id": id_}
+
+        if self.cache is not None:
+            self._invalidate_after_commit(
+                *((items[position]["name"], None) for position in pending)
+            )
+        return results
+
+    async def get_product(self, product_name):
+        generation = None
+        if self.cache is not None:
+            product = self.cache.get_by_name(product_name)
+            if product is not None:
+                return product
+            generation = self.cache.generation
+        product = await self.product_repository.get_by_name(product_name)
+        if product is not None:
+            if self.cache is not None:
+                self.cache.put(product, generation=generation)
+            return product
+        raise ProductNotFoundError(f"Product '{product_name}' is not found")
+
+    async def update_product(self, product_name, new_product):
+        result = await self.product_repository.update(product_name, new_product)
+        if result is None:
+            raise ProductNotFoundError(f"Product with name {product_name} is not found")
+        if self.cache is not None:
+            self._invalidate_after_commit(
+                (product_name, result.id), (new_product.get("name"), None)
+            )
+        return result
+
+    async def delete_product(self, product_id):
+        product = await self.product_repository.delete(product_id)
+        if product is None:
+            raise ProductNotFoundError(f"Product with id {product_id} is not found")
+        if self.cache is not None:
+            self._invalidate_after_commit((product.name, product_id))
+
+    async def list_products(self, **filters):
+        limit = filters.pop("limit", None)
+        offset = filters.pop("offset", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+
+        return await self.product_repository.get_list(
+            limit=limit,
+            offset=offset,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
+
+    async def list_products_page(self, **filters):
+        limit = filters.pop("limit", 10)
+        cursor = filters.pop("cursor", None)
+        sort_field = filters.pop("sort_field", None)
+        sort_order = filters.pop("sort_order", None)
+
+        return await self.product_repository.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            **filters,
+        )
@@ -1,10 +1,11 @@
 class Product:
-    def __init__(self, id, name, price, created_at, product_=None):
+    def __init__(self, id, name, price, created_at, version=None, product_=None):
         self._product = product_
         self._id = id
         self.name = name
         self.price = price
         self._created_at = created_at
+        self._version = version
 
     @property
     def id(self):
@@ -14,6 +15,10 @@ class Product:
     def created_at(self):
         return self._created_at or self._product.created_at
 
+    @property
+    def version(self):
+        return self._version or self._product.version
+
     def dict(self):
         return {
             "id": self.id,
@@ -21,3 +26,27 @@ class Product:
             "price": self.price,
             "created_at": self.created_at,
         }
+
+
+class ProductRow:
+    """
+    Компактная строка списка продуктов, заполняется прямо из кортежа колонок.
+    Только для чтения, dict() сразу готов к сериализации в JSON.
+    """
+
+    __slots__ = ("id", "name", "price", "created_at", "version")
+
+    def __init__(self, id, name, price, created_at, version=None):
+        self.id = id
+        self.name = name
+        self.price = price
+        self.created_at = created_at
+        self.version = version
+
+    def dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "price": str(self.price),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -1,17 +1,26 @@
-from pathlib import Path
+from product.settings.bd_settings import Settings as DatabaseSettings
 
-from pydantic_settings import BaseSettings
 
+class Settings(DatabaseSettings):
+    """Настройки приложения вместе с настройками БД: .env читается один раз."""
 
-class Settings(BaseSettings):
     APP_NAME: str
     APP_VERSION: str
     SECRET_KEY: str
     DEBUG: bool
 
-    class Config:
-        env_file = Path(__file__).parent / "../.env"
-        extra = "allow"
+    # Кэш продуктов живет в памяти процесса: запись в одном воркере не
+    # сбрасывает кэш других, и они до PRODUCT_CACHE_TTL секунд отдают
+    # старые тела и ETag. gunicorn_conf выключает его при нескольких воркерах
+    PRODUCT_CACHE_ENABLED: bool = True
+    PRODUCT_CACHE_SIZE: int = 1024
+    PRODUCT_CACHE_TTL: float = 60.0
+
+    PRODUCT_BULK_MAX_ITEMS: int = 100_000
+    PRODUCT_BULK_CHUNK_SIZE: int = 1000
+
+    PRODUCT_FAST_JSON: bool = False
+    PRODUCT_ASYNC_DB: bool = False
 
 
 settings = Settings()
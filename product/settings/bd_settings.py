@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import field_validator
@@ -7,6 +8,12 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+
     @field_validator("DATABASE_URL")
     def validate_db_url(cls, v):
         if not v:
@@ -18,4 +25,14 @@ class Settings(BaseSettings):
         extra = "allow"
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Настройки БД читаются при первом обращении: приложение берет их
+    # из app_settings и не разбирает .env второй раз
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
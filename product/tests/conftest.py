@@ -0,0 +1,45 @@
+import functools
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from common.query_budget import QueryBudget, StatementRecorder
+
+os.environ.setdefault("APP_NAME", "Product API")
+os.environ.setdefault("APP_VERSION", "test")
+os.environ.setdefault("SECRET_KEY", "test_secret_key")
+os.environ.setdefault("DEBUG", "True")
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{Path(tempfile.gettempdir()) / 'product_test.db'}",
+)
+
+
+@pytest.fixture(scope="function")
+def setup_db():
+    """Создает все таблицы БД перед тестом и удаляет их после."""
+    from product.product_repository.engine import get_engine
+    from product.product_repository.models import Base
+    from product.web.api.api import product_cache
+
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    if product_cache is not None:
+        product_cache.clear()
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def statements(setup_db):
+    """Список SQL-запросов, выполненных движком во время теста."""
+    with StatementRecorder(setup_db) as recorder:
+        yield recorder.statements
+
+
+@pytest.fixture(scope="function")
+def query_budget(setup_db):
+    """Бюджет запросов к движку процесса: with query_budget(1): ..."""
+    return functools.partial(QueryBudget, setup_db)
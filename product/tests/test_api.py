@@ -1,9 +1,12 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from product.web.main import app
 
 test_client = TestClient(app=app)
 
+pytestmark = pytest.mark.usefixtures("setup_db")
+
 good_payload = {"name": "test_name", "price": "100.13"}
 
 updated_payload = {"name": "updated_product_name", "price": 150.50}
@@ -16,6 +19,13 @@ def test_create_product_success():
     assert response.status_code == 201
 
 
+def test_create_product_duplicate_name():
+    assert test_client.post("/products", json=good_payload).status_code == 201
+
+    response = test_client.post("/products", json=good_payload)
+    assert response.status_code == 409
+
+
 def test_create_product_fails():
     response = test_client.post("/products", json=bad_payload)
     assert response.status_code == 422
@@ -82,3 +92,194 @@ def test_delete_product_success():
 
     get_response = test_client.get(f"/products/{product_id_to_delete}")
     assert get_response.status_code == 404
+
+
+def test_get_products_list_walks_pages_by_cursor():
+    names = [f"product_{i:02d}" for i in range(25)]
+    for name in names:
+        response = test_client.post("/products", json={"name": name, "price": "1.00"})
+        assert response.status_code == 201
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort_field": "name", "sort_order": "desc"}
+        if cursor:
+            params["cursor"] = cursor
+        response = test_client.get("/products", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(product["name"] for product in body["products"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(names, reverse=True)
+
+
+def test_get_products_list_rejects_bad_cursor():
+    response = test_client.get("/products", params={"cursor": "bad"})
+    assert response.status_code == 400
+
+
+def test_get_product_after_update_is_not_stale():
+    test_client.post("/products", json=good_payload)
+    assert test_client.get(f"/products/{good_payload['name']}").status_code == 200
+
+    response = test_client.put(
+        f"/products/{good_payload['name']}", json=updated_payload
+    )
+    assert response.status_code == 200
+
+    assert test_client.get(f"/products/{good_payload['name']}").status_code == 404
+    renamed = test_client.get(f"/products/{updated_payload['name']}")
+    assert renamed.json()["price"] == "150.50"
+    assert test_client.get("/cache/stats").json()["products"]["hits"] == 0
+
+
+def test_create_products_bulk_reports_per_item_errors():
+    test_client.post("/products", json={"name": "existing", "price": "1.00"})
+    payload = [
+        {"name": "bulk_1", "price": "1.10"},
+        {"name": 1, "price": "price"},
+        {"name": "bulk_2", "price": "2.20"},
+        {"name": "bulk_1", "price": "3.30"},
+        {"name": "existing", "price": "4.40"},
+        {"name": "bulk_3", "price": "-1"},
+    ]
+
+    response = test_client.post("/products/bulk", json=payload)
+    assert response.status_code == 200
+
+    body = response.json()
+    assert [item["index"] for item in body["created"]] == [0, 2]
+    assert [error["index"] for error in body["errors"]] == [1, 3, 4, 5]
+    assert test_client.get("/products/bulk_2").json()["price"] == "2.20"
+
+
+def test_update_product_runs_single_statement(statements):
+    test_client.post("/products", json={"name": "Single", "price": 10})
+    statements.clear()
+
+    response = test_client.put(
+        "/products/Single", json={"name": "Single 2", "price": 20}
+    )
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE product")
+
+
+def test_delete_product_runs_single_statement(statements):
+    created = test_client.post("/products", json={"name": "Single", "price": 10}).json()
+    statements.clear()
+
+    response = test_client.delete(f"/products/{created['id']}")
+    missing = test_client.delete(f"/products/{created['id']}")
+
+    assert response.status_code == 204
+    assert missing.status_code == 404
+    assert len(statements) == 2
+    assert all(statement.startswith("DELETE FROM product") for statement in statements)
+
+
+def test_update_product_to_existing_name_conflicts():
+    test_client.post("/products", json={"name": "First", "price": 1})
+    test_client.post("/products", json={"name": "Second", "price": 2})
+
+    response = test_client.put("/products/Second", json={"name": "First", "price": 3})
+
+    assert response.status_code == 409
+    assert test_client.get("/products/Second").json()["price"] == "2.00"
+
+
+def test_get_products_list_matches_single_product_payload():
+    test_client.post("/products", json=good_payload)
+
+    listed = test_client.get("/products").json()["products"][0]
+
+    assert listed == test_client.get(f"/products/{good_payload['name']}").json()
+
+
+def test_response_has_server_timing():
+    test_client.post("/products", json=good_payload)
+
+    response = test_client.get(f"/products/{good_payload['name']}")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;desc="1 queries";dur=')
+
+
+def test_get_product_etag_and_not_modified():
+    test_client.post("/products", json=good_payload)
+
+    response = test_client.get(f"/products/{good_payload['name']}")
+    etag = response.headers["etag"]
+    not_modified = test_client.get(
+        f"/products/{good_payload['name']}", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+
+def test_product_etag_changes_after_update():
+    test_client.post("/products", json=good_payload)
+    etag = test_client.get(f"/products/{good_payload['name']}").headers["etag"]
+
+    test_client.put(
+        f"/products/{good_payload['name']}",
+        json={"name": good_payload["name"], "price": "1.00"},
+    )
+    response = test_client.get(
+        f"/products/{good_payload['name']}", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["price"] == "1.00"
+
+
+def test_products_list_etag():
+    test_client.post("/products", json=good_payload)
+    etag = test_client.get("/products").headers["etag"]
+
+    not_modified = test_client.get("/products", headers={"If-None-Match": etag})
+    test_client.post("/products", json={"name": "other", "price": "1.00"})
+    changed = test_client.get("/products", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert changed.status_code == 200
+    assert len(changed.json()["products"]) == 2
+
+
+def test_products_list_etag_changes_when_next_page_appears():
+    """Строки полной страницы те же, но у нее появился next_cursor."""
+    for number in range(10):
+        test_client.post("/products", json={"name": f"p{number:02}", "price": 1})
+    first = test_client.get("/products?limit=10")
+    test_client.post("/products", json={"name": "p10", "price": 1})
+
+    changed = test_client.get(
+        "/products?limit=10", headers={"If-None-Match": first.headers["etag"]}
+    )
+
+    assert first.json()["next_cursor"] is None
+    assert changed.status_code == 200
+    assert changed.json()["next_cursor"] is not None
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"name": "Valid", "price": -5}, {"name": "", "price": 5}],
+)
+def test_update_product_rejects_invalid_values(payload):
+    """UPDATE минует @validates модели, поэтому значения проверяет схема."""
+    test_client.post("/products", json={"name": "Valid", "price": 10})
+
+    response = test_client.put("/products/Valid", json=payload)
+
+    assert response.status_code == 422
+    stored = test_client.get("/products/Valid").json()
+    assert stored["price"] == "10.00"
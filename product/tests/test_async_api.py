@@ -0,0 +1,121 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from product.product_repository.async_unit_of_work import dispose_async_engine
+from product.web.api import async_api
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await dispose_async_engine()
+
+
+@pytest.fixture
+def client(setup_db):
+    """Клиент приложения с асинхронным CRUD, один цикл событий на тест."""
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(async_api.router)
+    with TestClient(app) as client:
+        yield client
+
+
+good_payload = {"name": "async_product", "price": "100.13"}
+
+
+def test_create_and_get_product(client):
+    created = client.post("/products", json=good_payload)
+    response = client.get(f"/products/{good_payload['name']}")
+
+    assert created.status_code == 201
+    assert created.json()["id"] == response.json()["id"]
+    assert response.json()["price"] == good_payload["price"]
+
+
+def test_create_duplicate_product(client):
+    client.post("/products", json=good_payload)
+
+    response = client.post("/products", json=good_payload)
+
+    assert response.status_code == 409
+
+
+def test_get_missing_product(client):
+    assert client.get("/products/missing").status_code == 404
+
+
+def test_update_product_changes_etag(client):
+    client.post("/products", json=good_payload)
+    etag = client.get(f"/products/{good_payload['name']}").headers["etag"]
+
+    updated = client.put(
+        f"/products/{good_payload['name']}",
+        json={"name": "renamed", "price": "1.00"},
+    )
+    not_modified = client.get("/products/renamed", headers={"If-None-Match": etag})
+
+    assert updated.status_code == 200
+    assert updated.json()["name"] == "renamed"
+    assert not_modified.status_code == 200
+    assert client.get(f"/products/{good_payload['name']}").status_code == 404
+
+
+def test_delete_product(client):
+    product_id = client.post("/products", json=good_payload).json()["id"]
+
+    assert client.delete(f"/products/{product_id}").status_code == 204
+    assert client.delete(f"/products/{product_id}").status_code == 404
+
+
+def test_bulk_and_pages(client):
+    payload = [{"name": f"async_{i:02d}", "price": i + 1} for i in range(25)]
+    payload.append({"name": "async_00", "price": 1})
+
+    bulk = client.post("/products/bulk", json=payload).json()
+    first = client.get("/products?limit=10").json()
+    second = client.get(f"/products?limit=10&cursor={first['next_cursor']}").json()
+    by_offset = client.get("/products?limit=10&offset=10").json()
+
+    assert len(bulk["created"]) == 25
+    assert bulk["errors"][0]["index"] == 25
+    assert [p["name"] for p in second["products"]] == [
+        p["name"] for p in by_offset["products"]
+    ]
+
+
+def test_products_list_not_modified(client):
+    client.post("/products", json=good_payload)
+    etag = client.get("/products").headers["etag"]
+
+    assert client.get("/products", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_update_product_rejects_invalid_values(client):
+    client.post("/products", json=good_payload)
+
+    negative = client.put(
+        f"/products/{good_payload['name']}",
+        json={"name": good_payload["name"], "price": -5},
+    )
+    empty_name = client.put(
+        f"/products/{good_payload['name']}", json={"name": "", "price": 5}
+    )
+
+    assert negative.status_code == 422
+    assert empty_name.status_code == 422
+    assert client.get(f"/products/{good_payload['name']}").status_code == 200
+
+
+def test_products_list_etag_changes_when_next_page_appears(client):
+    for number in range(10):
+        client.post("/products", json={"name": f"p{number:02}", "price": 1})
+    etag = client.get("/products?limit=10").headers["etag"]
+    client.post("/products", json={"name": "p10", "price": 1})
+
+    changed = client.get("/products?limit=10", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.json()["next_cursor"] is not None
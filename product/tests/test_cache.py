@@ -0,0 +1,81 @@
+from product.product_service.cache import ProductCache
+from product.product_service.products import Product
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_product(id_, name):
+    return Product(id=id_, name=name, price="1.00", created_at=None)
+
+
+def test_get_by_name_and_id_after_put():
+    cache = ProductCache()
+    product = make_product(1, "a")
+    cache.put(product)
+
+    assert cache.get_by_name("a") is product
+    assert cache.get_by_id(1) is product
+    assert cache.get_by_name("b") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ProductCache(maxsize=2)
+    cache.put(make_product(1, "a"))
+    cache.put(make_product(2, "b"))
+    cache.get_by_name("a")
+    cache.put(make_product(3, "c"))
+
+    assert cache.get_by_name("b") is None
+    assert cache.get_by_name("a") is not None
+    assert cache.get_by_name("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = ProductCache(ttl=10, clock=clock)
+    cache.put(make_product(1, "a"))
+
+    clock.now = 9.9
+    assert cache.get_by_name("a") is not None
+    clock.now = 10.0
+    assert cache.get_by_name("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidate_by_id_drops_name_mapping():
+    cache = ProductCache()
+    cache.put(make_product(1, "a"))
+    cache.invalidate(id_=1)
+
+    assert cache.get_by_name("a") is None
+    assert cache.get_by_id(1) is None
+
+
+def test_put_after_invalidation_is_ignored():
+    """Значение, прочитанное до инвалидации, не попадает в кэш."""
+    cache = ProductCache()
+    generation = cache.generation
+    cache.invalidate(name="a")
+    cache.put(make_product(1, "a"), generation=generation)
+
+    assert cache.get_by_name("a") is None
+
+
+def test_renamed_product_replaces_old_name():
+    cache = ProductCache()
+    cache.put(make_product(1, "a"))
+    cache.put(make_product(1, "b"))
+
+    assert cache.get_by_name("a") is None
+    assert cache.get_by_name("b").id == 1
+    assert cache.stats()["size"] == 1
@@ -0,0 +1,53 @@
+import os
+
+from product.product_repository import engine as engine_module
+from product.product_repository.engine import (
+    dispose_engine,
+    get_engine,
+    get_session_maker,
+)
+from product.product_repository.unit_of_work import UnitOfWork
+
+
+def test_engine_is_shared_between_units_of_work():
+    """Все UnitOfWork процесса используют один движок и один пул."""
+    with UnitOfWork() as first, UnitOfWork() as second:
+        assert first.session.get_bind() is second.session.get_bind()
+        assert first.session.get_bind() is get_engine()
+
+
+def test_session_maker_is_created_once():
+    assert get_session_maker() is get_session_maker()
+
+
+def test_dispose_engine_creates_new_engine_on_next_call():
+    engine = get_engine()
+    dispose_engine()
+    assert engine_module._engine is None
+    assert get_engine() is not engine
+
+
+def test_pool_is_replaced_after_fork():
+    """В дочернем процессе движок получает новый пул, не закрывая пул родителя."""
+    engine = get_engine()
+    with engine.connect():
+        pass
+    parent_pool = engine.pool
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        child_engine = get_engine()
+        ok = child_engine is engine and child_engine.pool is not parent_pool
+        with child_engine.connect():
+            pass
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert result == b"1"
+    assert engine.pool is parent_pool
@@ -0,0 +1,90 @@
+import asyncio
+import csv
+import io
+import json
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from product.product_repository.models import ProductModel
+from product.web.api.api import export_products
+from product.web.main import app
+
+test_client = TestClient(app=app)
+
+pytestmark = pytest.mark.usefixtures("setup_db")
+
+
+def seed(engine, rows, start=0):
+    with engine.begin() as connection:
+        connection.execute(
+            ProductModel.__table__.insert(),
+            [
+                {"name": f"product_{i}", "price": f"{i}.50"}
+                for i in range(start, start + rows)
+            ],
+        )
+
+
+def export_peak_memory(export_format):
+    """
+    Пиковый объем памяти Python при чтении тела StreamingResponse.
+    TestClient буферизует ответ целиком, поэтому тело читается напрямую.
+    """
+
+    async def consume():
+        response = export_products(format=export_format)
+        lines = 0
+        async for chunk in response.body_iterator:
+            lines += chunk.count(b"\n")
+        return lines
+
+    tracemalloc.start()
+    try:
+        lines = asyncio.run(consume())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return lines, peak
+
+
+def test_export_csv(setup_db):
+    seed(setup_db, 3)
+
+    response = test_client.get("/products/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["product_0", "product_1", "product_2"]
+    assert rows[1]["price"] == "1.50"
+
+
+def test_export_ndjson(setup_db):
+    seed(setup_db, 2)
+
+    response = test_client.get("/products/export", params={"format": "ndjson"})
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["name"] for record in records] == ["product_0", "product_1"]
+    assert set(records[0]) == {"id", "name", "price", "created_at"}
+
+
+def test_export_rejects_unknown_format():
+    response = test_client.get("/products/export", params={"format": "xml"})
+    assert response.status_code == 422
+
+
+def test_export_memory_does_not_grow_with_rows(setup_db):
+    """
+    Пиковая память выгрузки 20 000 строк сопоставима с выгрузкой 2 000 строк.
+    Память считается через tracemalloc: RSS процесса тестов слишком шумный.
+    """
+    seed(setup_db, 2_000)
+    small_lines, small_peak = export_peak_memory("ndjson")
+    seed(setup_db, 18_000, start=2_000)
+    large_lines, large_peak = export_peak_memory("ndjson")
+
+    assert (small_lines, large_lines) == (2_000, 20_000)
+    assert large_peak < small_peak * 1.5
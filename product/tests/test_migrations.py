@@ -0,0 +1,156 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from common.pagination import encode_cursor
+from product.product_repository.models import Base
+from product.product_repository.product_repository import ProductRepository
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """Фикстура, предоставляющая движок БД, созданной миграциями Alembic."""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO product (name, price, created_at) VALUES (:n, :p, :c)"),
+            [
+                {"n": f"product_{i}", "p": i, "c": f"2025-01-{i % 28 + 1:02d}"}
+                for i in range(100)
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, call) -> list[str]:
+    """Выполняет call(repository) и возвращает EXPLAIN QUERY PLAN его запросов."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            call(ProductRepository(session))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as connection:
+        return [
+            " | ".join(
+                row[-1]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            )
+            for statement, parameters in statements
+        ]
+
+
+def test_get_by_name_uses_unique_index(migrated_engine):
+    plans = query_plans(migrated_engine, lambda repo: repo.get_by_name("product_7"))
+
+    assert len(plans) == 1
+    assert "USING INDEX ix_product_name" in plans[0] or (
+        "USING COVERING INDEX ix_product_name" in plans[0]
+    )
+
+
+@pytest.mark.parametrize("sort_field", ["price", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_sorted_page_uses_index(migrated_engine, sort_field, sort_order):
+    plans = query_plans(
+        migrated_engine,
+        lambda repo: repo.get_page(
+            limit=10, sort_field=sort_field, sort_order=sort_order
+        ),
+    )
+
+    assert len(plans) == 1
+    assert f"ix_product_{sort_field}" in plans[0]
+    assert "TEMP B-TREE" not in plans[0]
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_page_seeks_index(migrated_engine, sort_order):
+    cursor = encode_cursor("name", sort_order, "product_50", 51)
+    plans = query_plans(
+        migrated_engine,
+        lambda repo: repo.get_page(
+            limit=10, sort_field="name", sort_order=sort_order, cursor=cursor
+        ),
+    )
+
+    assert plans[0].startswith("SEARCH product USING INDEX ix_product_name")
+
+
+def test_name_is_unique(migrated_engine):
+    with pytest.raises(IntegrityError):
+        with migrated_engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT INTO product (name, price, created_at) "
+                    "VALUES ('product_1', 1, '2025-01-01')"
+                )
+            )
+
+
+def test_downgrade_removes_indexes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'downgrade.db'}"
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    command.downgrade(config, "0001")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        indexes = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).all()
+    engine.dispose()
+    assert not [name for (name,) in indexes if name.startswith("ix_product")]
+
+
+def test_version_column_defaults_to_one(migrated_engine):
+    with migrated_engine.connect() as connection:
+        versions = connection.execute(text("SELECT DISTINCT version FROM product"))
+        assert versions.scalars().all() == [1]
+
+
+def test_downgrade_removes_version_column(tmp_path):
+    url = f"sqlite:///{tmp_path / 'downgrade.db'}"
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    command.downgrade(config, "0002")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        columns = connection.execute(text("PRAGMA table_info(product)")).all()
+    engine.dispose()
+    assert "version" not in [column[1] for column in columns]
+
+
+def test_migrations_match_models(migrated_engine):
+    with migrated_engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
@@ -1,8 +1,17 @@
 import unittest
+from datetime import UTC, datetime
+from decimal import Decimal
 from unittest.mock import MagicMock
 
+import pytest
+
+from common.query_budget import QueryBudgetExceeded
+from product.product_repository.product_repository import ProductRepository
+from product.product_repository.unit_of_work import UnitOfWork
+from product.product_service.cache import ProductCache
 from product.product_service.exeptions import ProductNotFoundError
 from product.product_service.product_service import ProductService
+from product.product_service.products import Product
 
 
 class TestProductService(unittest.TestCase):
@@ -50,18 +59,16 @@ class TestProductService(unittest.TestCase):
         self.mock_repository.get_by_name.assert_called_once_with(product_name)
 
     def test_update_product_found(self):
-        """Тест update_product обновляет продукт, если найден."""
+        """Тест update_product обновляет продукт одним вызовом репозитория."""
         product_name = "Product To Update"
         new_product_data = {"name": "Updated Product", "price": 120}
-        mock_existing_product = {"id": 2, "name": product_name, "price": 100}
         mock_updated_product = {"id": 2, **new_product_data}
 
-        self.mock_repository.get_by_name.return_value = mock_existing_product
         self.mock_repository.update.return_value = mock_updated_product
 
         result = self.product_service.update_product(product_name, new_product_data)
 
-        self.mock_repository.get_by_name.assert_called_once_with(product_name)
+        self.mock_repository.get_by_name.assert_not_called()
         self.mock_repository.update.assert_called_once_with(
             product_name, new_product_data
         )
@@ -72,26 +79,27 @@ class TestProductService(unittest.TestCase):
         product_name = "Product Not Found"
         new_product_data = {"name": "Updated Product", "price": 120}
 
-        self.mock_repository.get_by_name.return_value = None
+        self.mock_repository.update.return_value = None
 
         with self.assertRaisesRegex(
             ProductNotFoundError, f"Product with name {product_name} is not found"
         ):
             self.product_service.update_product(product_name, new_product_data)
 
-        self.mock_repository.get_by_name.assert_called_once_with(product_name)
-        self.mock_repository.update.assert_not_called()
+        self.mock_repository.update.assert_called_once_with(
+            product_name, new_product_data
+        )
 
     def test_delete_product_found(self):
-        """Тест delete_product удаляет продукт, если найден."""
+        """Тест delete_product удаляет продукт одним вызовом репозитория."""
         product_id = 3
         mock_product = {"id": product_id, "name": "Product to Delete", "price": 200}
 
-        self.mock_repository.get_by_id.return_value = mock_product
+        self.mock_repository.delete.return_value = mock_product
 
         result = self.product_service.delete_product(product_id)
 
-        self.mock_repository.get_by_id.assert_called_once_with(product_id)
+        self.mock_repository.get_by_id.assert_not_called()
         self.mock_repository.delete.assert_called_once_with(product_id)
         self.assertIsNone(result)
 
@@ -99,15 +107,14 @@ class TestProductService(unittest.TestCase):
         """Тест delete_product выбрасывает ProductNotFoundError, если продукт не найден."""
         product_id = 4
 
-        self.mock_repository.get_by_id.return_value = None
+        self.mock_repository.delete.return_value = None
 
         with self.assertRaisesRegex(
             ProductNotFoundError, f"Product with id {product_id} is not found"
         ):
             self.product_service.delete_product(product_id)
 
-        self.mock_repository.get_by_id.assert_called_once_with(product_id)
-        self.mock_repository.delete.assert_not_called()
+        self.mock_repository.delete.assert_called_once_with(product_id)
 
     def test_list_products_without_filters(self):
         """Тест list_products без фильтров вызывает get_list репозитория без аргументов."""
@@ -177,6 +184,196 @@ class TestProductService(unittest.TestCase):
         )
         self.assertEqual(result, mock_product_list)
 
+    def test_list_products_page_passes_cursor_to_repository(self):
+        """Тест list_products_page передает курсор и сортировку в get_page."""
+        page = ([{"id": 7, "name": "G"}], "next-cursor")
+        self.mock_repository.get_page.return_value = page
+
+        result = self.product_service.list_products_page(
+            limit=10, cursor="cursor", sort_field="price", sort_order="desc"
+        )
+
+        self.mock_repository.get_page.assert_called_once_with(
+            limit=10, cursor="cursor", sort_field="price", sort_order="desc"
+        )
+        self.assertEqual(result, page)
+
+    def test_place_products_inserts_valid_items_in_chunks(self):
+        """Тест place_products вставляет пачками и сообщает об ошибках по элементам."""
+        items = [
+            {"name": "A", "price": 1},
+            {"name": "", "price": 1},
+            {"name": "B", "price": 2},
+            {"name": "A", "price": 3},
+            {"name": "C", "price": -1},
+            {"name": "D", "price": 4},
+        ]
+        self.mock_repository.get_existing_names.side_effect = [set(), {"D"}]
+        self.mock_repository.add_many.side_effect = [[10, 11], []]
+
+        results = self.product_service.place_products(items, chunk_size=2)
+
+        self.assertEqual(
+            self.mock_repository.add_many.call_args_list[0].args[0],
+            [items[0], items[2]],
+        )
+        self.assertEqual(results[0], {"id": 10})
+        self.assertEqual(results[2], {"id": 11})
+        self.assertIn("error", results[1])
+        self.assertIn("error", results[3])
+        self.assertIn("error", results[4])
+        self.assertEqual(results[5], {"error": "Product 'D' already exists"})
+
+
+class TestProductServiceCache(unittest.TestCase):
+
+    def setUp(self):
+        """Настройка перед каждым тестом: сервис с кэшем и отложенными commit-callback."""
+        self.mock_repository = MagicMock()
+        self.after_commit = []
+        self.mock_repository.after_commit.side_effect = self.after_commit.append
+        self.cache = ProductCache()
+        self.product_service = ProductService(self.mock_repository, cache=self.cache)
+        self.product = Product(id=1, name="Cached", price="10.00", created_at=None)
+
+    def commit(self):
+        for callback in self.after_commit:
+            callback()
+        self.after_commit.clear()
+
+    def test_get_product_reads_repository_once(self):
+        """Тест повторный get_product берет продукт из кэша."""
+        self.mock_repository.get_by_name.return_value = self.product
+
+        self.product_service.get_product("Cached")
+        result = self.product_service.get_product("Cached")
+
+        self.mock_repository.get_by_name.assert_called_once_with("Cached")
+        self.assertIs(result, self.product)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_update_product_invalidates_only_after_commit(self):
+        """Тест update_product сбрасывает кэш только после commit."""
+        self.mock_repository.get_by_name.return_value = self.product
+        self.mock_repository.update.return_value = self.product
+        self.product_service.get_product("Cached")
+
+        self.product_service.update_product("Cached", {"name": "New", "price": 1})
+        self.assertIs(self.cache.get_by_name("Cached"), self.product)
+
+        self.commit()
+        self.assertIsNone(self.cache.get_by_name("Cached"))
+
+    def test_delete_product_invalidates_after_commit(self):
+        """Тест delete_product сбрасывает запись по id после commit."""
+        self.mock_repository.get_by_name.return_value = self.product
+        self.mock_repository.delete.return_value = self.product
+        self.product_service.get_product("Cached")
+
+        self.product_service.delete_product(1)
+        self.commit()
+
+        self.assertIsNone(self.cache.get_by_id(1))
+        self.assertIsNone(self.cache.get_by_name("Cached"))
+
+    def test_rolled_back_write_keeps_cache(self):
+        """Тест без commit запись кэша остается."""
+        self.mock_repository.get_by_name.return_value = self.product
+        self.product_service.get_product("Cached")
+
+        self.product_service.place_product({"name": "Cached", "price": 1})
+        self.after_commit.clear()
+
+        self.assertIs(self.cache.get_by_name("Cached"), self.product)
+
+
+@pytest.fixture
+def unit_of_work(setup_db):
+    with UnitOfWork() as unit_of_work:
+        yield unit_of_work
+
+
+@pytest.fixture
+def service(unit_of_work):
+    return ProductService(ProductRepository(unit_of_work.session))
+
+
+@pytest.fixture
+def stored_product(service, unit_of_work):
+    product = service.place_product({"name": "Budget", "price": Decimal("10.00")})
+    unit_of_work.commit()
+    return product
+
+
+def test_created_at_is_taken_at_insert(service, unit_of_work):
+    before = datetime.now(UTC).replace(tzinfo=None)
+    product = service.place_product({"name": "Fresh", "price": Decimal("1.00")})
+    unit_of_work.commit()
+
+    assert product.created_at >= before
+
+
+def test_place_product_query_budget(service, unit_of_work, query_budget):
+    with query_budget(1):
+        service.place_product({"name": "Budget", "price": Decimal("10.00")})
+        unit_of_work.commit()
+
+
+def test_place_products_query_budget(service, query_budget):
+    items = [
+        {"name": f"Budget {number}", "price": Decimal("1.00")} for number in range(5)
+    ]
+    with query_budget(2):
+        service.place_products(items)
+
+
+def test_get_product_query_budget(service, stored_product, query_budget):
+    with query_budget(1):
+        service.get_product("Budget")
+
+
+def test_update_product_query_budget(service, stored_product, query_budget):
+    with query_budget(1):
+        service.update_product("Budget", {"price": Decimal("11.00")})
+
+
+@pytest.mark.parametrize(
+    "new_product", [{"price": Decimal("-1.00")}, {"name": "", "price": Decimal("1")}]
+)
+def test_update_product_checks_model_rules_before_update(
+    service, stored_product, query_budget, new_product
+):
+    with query_budget(0):
+        with pytest.raises(ValueError):
+            service.update_product("Budget", new_product)
+
+
+def test_delete_product_query_budget(service, stored_product, query_budget):
+    product_id = stored_product.id
+    with query_budget(1):
+        service.delete_product(product_id)
+
+
+def test_list_products_query_budget(service, unit_of_work, query_budget):
+    service.place_products(
+        [{"name": f"Budget {number}", "price": Decimal("1.00")} for number in range(20)]
+    )
+    unit_of_work.commit()
+
+    with query_budget(1):
+        service.list_products(limit=10, offset=0)
+    with query_budget(1):
+        service.list_products_page(limit=10)
+
+
+def test_query_budget_reports_statements(service, stored_product, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="executed 2") as error:
+        with query_budget(1):
+            service.get_product("Budget")
+            service.get_product("Budget")
+
+    assert all(statement.startswith("SELECT") for statement in error.value.statements)
+
 
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from product.settings.app_settings import settings
+from product.web import responses
+from product.web.main import app
+
+test_client = TestClient(app=app)
+
+content = {
+    "price": Decimal("10.50"),
+    "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456),
+    "name": "Тест",
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_encodes_decimal_and_datetime(monkeypatch, use_orjson):
+    """Тест dumps одинаково кодирует Decimal и datetime с orjson и без него."""
+    if not use_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+
+    assert json.loads(responses.dumps(content)) == {
+        "price": "10.50",
+        "created_at": "2024-05-01T12:30:15.123456",
+        "name": "Тест",
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    """Тест dumps не сериализует неизвестные объекты молча."""
+    with pytest.raises(TypeError):
+        responses.dumps({"value": object()})
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_fast_json_mode_returns_same_payload(monkeypatch):
+    """Тест PRODUCT_FAST_JSON не меняет тело ответа списка и продукта."""
+    for i in range(12):
+        test_client.post("/products", json={"name": f"fast_{i}", "price": i + 0.5})
+
+    regular = [
+        test_client.get("/products?limit=50").json(),
+        test_client.get("/products/fast_3").json(),
+    ]
+    monkeypatch.setattr(settings, "PRODUCT_FAST_JSON", True)
+    fast = [
+        test_client.get("/products?limit=50").json(),
+        test_client.get("/products/fast_3").json(),
+    ]
+
+    assert fast == regular
+    assert len(fast[0]["products"]) == 12
+
+
+@pytest.mark.usefixtures("setup_db")
+def test_fast_json_mode_keeps_etag(monkeypatch):
+    """Тест PRODUCT_FAST_JSON отдает тот же ETag и 304."""
+    test_client.post("/products", json={"name": "fast_etag", "price": 1.5})
+    regular = test_client.get("/products/fast_etag").headers["etag"]
+    monkeypatch.setattr(settings, "PRODUCT_FAST_JSON", True)
+
+    fast = test_client.get("/products/fast_etag")
+    not_modified = test_client.get(
+        "/products/fast_etag", headers={"If-None-Match": regular}
+    )
+
+    assert fast.headers["etag"] == regular
+    assert not_modified.status_code == 304
@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+PROBE = """
+import json, sys
+import product.web.main
+from product.settings import bd_settings
+print(json.dumps({
+    "modules": sorted(sys.modules),
+    "db_settings_loads": bd_settings.get_settings.cache_info().currsize,
+}))
+"""
+
+
+def test_entry_point_loads_settings_once_and_skips_optional_modules():
+    """Приложение читает .env один раз и не тянет yaml и асинхронный стек."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe = json.loads(result.stdout)
+
+    assert probe["db_settings_loads"] == 0
+    assert "product.web.api.api" in probe["modules"]
+    assert "yaml" not in probe["modules"]
+    assert "sqlalchemy.ext.asyncio" not in probe["modules"]
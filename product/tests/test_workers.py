@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from common.forked_workers import run_forked_workers
+from product.product_repository import engine as engine_module
+from product.web.main import app, warm_up
+
+test_client = TestClient(app=app)
+
+
+def get_products():
+    response = test_client.get("/products?limit=10")
+    assert response.status_code == 200, response.status_code
+
+
+def test_forked_workers_do_not_share_pooled_connections(setup_db):
+    """Воркеры после fork не получают соединения из пула родителя."""
+    assert test_client.post("/products", json={"name": "shared", "price": 1}).is_success
+
+    reports = run_forked_workers(setup_db, get_products)
+
+    assert len({report["pid"] for report in reports}) == 3
+    for report in reports:
+        assert report["requests"] == 80
+        assert report["errors"] == []
+        assert report["shared_connections"] == 0
+
+
+def test_warm_up_builds_openapi_and_closes_parent_pool(setup_db):
+    app.openapi_schema = None
+
+    warm_up()
+
+    assert app.openapi_schema is not None
+    assert engine_module._engine is None
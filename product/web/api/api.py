@@ -1,12 +1,24 @@
-from fastapi import Query, HTTPException
+from typing import Annotated, Any, List
+
+from fastapi import APIRouter, Body, Header, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from starlette import status
 
+from common.etag import etag_matches, page_etag, resource_etag
+from common.export import EXPORT_FORMATS, buffered, export_lines
+from common.pagination import InvalidCursorError
 from product.product_repository.product_repository import ProductRepository
 from product.product_repository.unit_of_work import UnitOfWork
+from product.product_service.cache import ProductCache
 from product.product_service.exeptions import ProductNotFoundError
 from product.product_service.product_service import ProductService
+from product.settings.app_settings import settings
 from product.web.main import app
+from product.web.responses import FastJSONResponse
 from product.web.api.schemas import (
+    BulkCreateProductResponse,
     CreateProductSchema,
     GetProductSchema,
     ProductResponse,
@@ -14,63 +26,201 @@ from product.web.api.schemas import (
     SortField,
 )
 
+product_cache = (
+    ProductCache(maxsize=settings.PRODUCT_CACHE_SIZE, ttl=settings.PRODUCT_CACHE_TTL)
+    if settings.PRODUCT_CACHE_ENABLED
+    else None
+)
+
+
+def validate_bulk(payload):
+    """Годные элементы пачки, их индексы и ошибки валидации остальных."""
+    valid_items, positions, errors = [], [], []
+    for index, item in enumerate(payload):
+        try:
+            valid_items.append(CreateProductSchema.model_validate(item).model_dump())
+            positions.append(index)
+        except ValidationError as e:
+            errors.append(
+                {
+                    "index": index,
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+            )
+    return valid_items, positions, errors
+
+
+def bulk_response(positions, results, errors):
+    created = []
+    for index, result in zip(positions, results):
+        if "id" in result:
+            created.append({"index": index, "id": result["id"]})
+        else:
+            errors.append({"index": index, "errors": [{"msg": result["error"]}]})
+    errors.sort(key=lambda error: error["index"])
+    return {"created": created, "errors": errors}
+
+
+# CRUD на синхронной сессии; main подключает его или router из async_api
+router = APIRouter()
+
+
+def respond(content, response: Response, etag: str):
+    """
+    В режиме PRODUCT_FAST_JSON отдает доверенный ответ репозитория без
+    повторной валидации response_model, иначе возвращает данные FastAPI.
+    ETag ставится в обоих режимах.
+    """
+    if settings.PRODUCT_FAST_JSON:
+        return FastJSONResponse(content, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return content
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
 
-@app.post(
+@router.post(
     "/products",
     status_code=status.HTTP_201_CREATED,
     response_model=GetProductSchema,
 )
 def create_product(payload: CreateProductSchema):
-    with UnitOfWork() as unit_of_work:
-        repo = ProductRepository(unit_of_work.session)
-        product_service = ProductService(repo)
-        product = payload.model_dump()
-        product = product_service.place_product(product)
-        unit_of_work.commit()
-        return_payload = product.dict()
-    return return_payload
+    try:
+        with UnitOfWork() as unit_of_work:
+            repo = ProductRepository(unit_of_work.session)
+            product_service = ProductService(repo, cache=product_cache)
+            product = payload.model_dump()
+            product = product_service.place_product(product)
+            unit_of_work.commit()
+            return_payload = product.dict()
+        return return_payload
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail=f"Product '{payload.name}' already exists"
+        )
+
+
+@router.post(
+    "/products/bulk",
+    response_model=BulkCreateProductResponse,
+)
+def create_products_bulk(
+    payload: Annotated[List[Any], Body(max_length=settings.PRODUCT_BULK_MAX_ITEMS)],
+):
+    valid_items, positions, errors = validate_bulk(payload)
+    try:
+        with UnitOfWork() as unit_of_work:
+            repo = ProductRepository(unit_of_work.session)
+            product_service = ProductService(repo, cache=product_cache)
+            results = product_service.place_products(
+                valid_items, chunk_size=settings.PRODUCT_BULK_CHUNK_SIZE
+            )
+            unit_of_work.commit()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="Products were created concurrently, retry"
+        )
+
+    return bulk_response(positions, results, errors)
 
 
-@app.get(
+@router.get(
     "/products",
     response_model=ProductResponse,
 )
 def get_products_list(
+    response: Response,
     limit: int | None = Query(10, ge=10, le=50),
     offset: int | None = Query(0, ge=0, le=50),
     sort_field: SortField | None = Query(None),
     sort_order: SortOrder | None = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+    if_none_match: str | None = Header(None),
 ):
     with UnitOfWork() as unit_of_work:
         repo = ProductRepository(unit_of_work.session)
-        product_service = ProductService(repo)
+        product_service = ProductService(repo, cache=product_cache)
 
-        all_products = product_service.list_products(
-            limit=limit, offset=offset, sort_field=sort_field, sort_order=sort_order
-        )
-    return {"products": [product.dict() for product in all_products]}
+        if offset:
+            all_products = product_service.list_products(
+                limit=limit, offset=offset, sort_field=sort_field, sort_order=sort_order
+            )
+            next_cursor = None
+        else:
+            try:
+                all_products, next_cursor = product_service.list_products_page(
+                    limit=limit,
+                    cursor=cursor,
+                    sort_field=sort_field,
+                    sort_order=sort_order,
+                )
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+    etag = page_etag(all_products, next_cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return respond(
+        {
+            "products": [product.dict() for product in all_products],
+            "next_cursor": next_cursor,
+        },
+        response,
+        etag,
+    )
+
+
+@app.get("/products/export")
+def export_products(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+):
+    """Потоковая выгрузка всех продуктов, объем памяти не зависит от числа строк."""
+
+    def rows():
+        with UnitOfWork() as unit_of_work:
+            repo = ProductRepository(unit_of_work.session)
+            product_service = ProductService(repo)
+            yield from buffered(
+                export_lines(
+                    format, repo.EXPORT_COLUMNS, product_service.export_products()
+                )
+            )
 
+    return StreamingResponse(
+        rows(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
 
-@app.get(
+
+@router.get(
     "/products/{product_name}",
     response_model=GetProductSchema,
 )
-def get_product(product_name: str):
+def get_product(
+    product_name: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
     try:
         with UnitOfWork() as unit_of_work:
             repo = ProductRepository(unit_of_work.session)
-            product_service = ProductService(repo)
+            product_service = ProductService(repo, cache=product_cache)
 
             result = product_service.get_product(product_name=product_name)
 
-        return result.dict()
+        etag = resource_etag(result.id, result.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return respond(result.dict(), response, etag)
     except ProductNotFoundError:
         raise HTTPException(
             status_code=404, detail=f"Product '{product_name}' not found"
         )
 
 
-@app.put(
+@router.put(
     "/products/{product_name}",
     response_model=GetProductSchema,
 )
@@ -78,7 +228,7 @@ def update_product(product_name: str, product_details: CreateProductSchema):
     try:
         with UnitOfWork() as unit_of_work:
             repo = ProductRepository(unit_of_work.session)
-            product_service = ProductService(repo)
+            product_service = ProductService(repo, cache=product_cache)
             new_product = product_details.model_dump()
 
             result = product_service.update_product(
@@ -90,9 +240,14 @@ def update_product(product_name: str, product_details: CreateProductSchema):
         raise HTTPException(
             status_code=404, detail=f"Product '{product_name}' not found"
         )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Product '{product_details.name}' already exists",
+        )
 
 
-@app.delete(
+@router.delete(
     "/products/{product_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
@@ -100,7 +255,7 @@ def delete_product(product_id: int):
     try:
         with UnitOfWork() as unit_of_work:
             repo = ProductRepository(unit_of_work.session)
-            product_service = ProductService(repo)
+            product_service = ProductService(repo, cache=product_cache)
             product_service.delete_product(product_id=product_id)
 
             unit_of_work.commit()
@@ -109,3 +264,16 @@ def delete_product(product_id: int):
         raise HTTPException(
             status_code=404, detail=f"Product with ID '{product_id}' not found"
         )
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    return {"products": product_cache.stats() if product_cache is not None else None}
+
+
+# Выгрузка и /cache/stats зарегистрированы выше, дальше CRUD выбранного режима
+if settings.PRODUCT_ASYNC_DB:
+    from product.web.api.async_api import router as crud_router
+else:
+    crud_router = router
+app.include_router(crud_router)
@@ -0,0 +1,195 @@
+"""
+CRUD продуктов на async def обработчиках и AsyncSession.
+
+Подключается вместо router из api при PRODUCT_ASYNC_DB: обработчики
+выполняются в цикле событий, а не в ограниченном пуле потоков FastAPI.
+Выгрузка и статистика кэша остаются общими для обоих режимов.
+"""
+
+from typing import Annotated, Any, List
+
+from fastapi import APIRouter, Body, Header, Query, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
+from starlette import status
+
+from common.etag import etag_matches, page_etag, resource_etag
+from common.pagination import InvalidCursorError
+from product.product_repository.async_product_repository import (
+    AsyncProductRepository,
+)
+from product.product_repository.async_unit_of_work import AsyncUnitOfWork
+from product.product_service.exeptions import ProductNotFoundError
+from product.product_service.product_service import AsyncProductService
+from product.settings.app_settings import settings
+from product.web.api.api import (
+    bulk_response,
+    not_modified,
+    product_cache,
+    respond,
+    validate_bulk,
+)
+from product.web.api.schemas import (
+    BulkCreateProductResponse,
+    CreateProductSchema,
+    GetProductSchema,
+    ProductResponse,
+    SortOrder,
+    SortField,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/products",
+    status_code=status.HTTP_201_CREATED,
+    response_model=GetProductSchema,
+)
+async def create_product(payload: CreateProductSchema):
+    try:
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncProductRepository(unit_of_work.session)
+            product_service = AsyncProductService(repo, cache=product_cache)
+            product = await product_service.place_product(payload.model_dump())
+            await unit_of_work.commit()
+        return product.dict()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail=f"Product '{payload.name}' already exists"
+        )
+
+
+@router.post(
+    "/products/bulk",
+    response_model=BulkCreateProductResponse,
+)
+async def create_products_bulk(
+    payload: Annotated[List[Any], Body(max_length=settings.PRODUCT_BULK_MAX_ITEMS)],
+):
+    valid_items, positions, errors = validate_bulk(payload)
+    try:
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncProductRepository(unit_of_work.session)
+            product_service = AsyncProductService(repo, cache=product_cache)
+            results = await product_service.place_products(
+                valid_items, chunk_size=settings.PRODUCT_BULK_CHUNK_SIZE
+            )
+            await unit_of_work.commit()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="Products were created concurrently, retry"
+        )
+    return bulk_response(positions, results, errors)
+
+
+@router.get(
+    "/products",
+    response_model=ProductResponse,
+)
+async def get_products_list(
+    response: Response,
+    limit: int | None = Query(10, ge=10, le=50),
+    offset: int | None = Query(0, ge=0, le=50),
+    sort_field: SortField | None = Query(None),
+    sort_order: SortOrder | None = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+):
+    async with AsyncUnitOfWork() as unit_of_work:
+        repo = AsyncProductRepository(unit_of_work.session)
+        product_service = AsyncProductService(repo, cache=product_cache)
+
+        if offset:
+            all_products = await product_service.list_products(
+                limit=limit, offset=offset, sort_field=sort_field, sort_order=sort_order
+            )
+            next_cursor = None
+        else:
+            try:
+                all_products, next_cursor = await product_service.list_products_page(
+                    limit=limit,
+                    cursor=cursor,
+                    sort_field=sort_field,
+                    sort_order=sort_order,
+                )
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+    etag = page_etag(all_products, next_cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return respond(
+        {
+            "products": [product.dict() for product in all_products],
+            "next_cursor": next_cursor,
+        },
+        response,
+        etag,
+    )
+
+
+@router.get(
+    "/products/{product_name}",
+    response_model=GetProductSchema,
+)
+async def get_product(
+    product_name: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
+    try:
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncProductRepository(unit_of_work.session)
+            product_service = AsyncProductService(repo, cache=product_cache)
+            result = await product_service.get_product(product_name=product_name)
+
+        etag = resource_etag(result.id, result.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return respond(result.dict(), response, etag)
+    except ProductNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Product '{product_name}' not found"
+        )
+
+
+@router.put(
+    "/products/{product_name}",
+    response_model=GetProductSchema,
+)
+async def update_product(product_name: str, product_details: CreateProductSchema):
+    try:
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncProductRepository(unit_of_work.session)
+            product_service = AsyncProductService(repo, cache=product_cache)
+            result = await product_service.update_product(
+                product_name=product_name, new_product=product_details.model_dump()
+            )
+            await unit_of_work.commit()
+        return result.dict()
+    except ProductNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Product '{product_name}' not found"
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Product '{product_details.name}' already exists",
+        )
+
+
+@router.delete(
+    "/products/{product_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def delete_product(product_id: int):
+    try:
+        async with AsyncUnitOfWork() as unit_of_work:
+            repo = AsyncProductRepository(unit_of_work.session)
+            product_service = AsyncProductService(repo, cache=product_cache)
+            await product_service.delete_product(product_id=product_id)
+            await unit_of_work.commit()
+        return
+    except ProductNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"Product with ID '{product_id}' not found"
+        )
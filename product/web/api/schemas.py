@@ -1,9 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List
+from typing import Any, List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SortField(str, Enum):
@@ -19,8 +19,9 @@ class SortOrder(str, Enum):
 
 
 class CreateProductSchema(BaseModel):
-    name: str
-    price: Decimal
+    # Те же правила, что у ProductModel.validate_name / validate_price
+    name: str = Field(min_length=1)
+    price: Decimal = Field(ge=0)
 
 
 class GetProductSchema(CreateProductSchema):
@@ -30,3 +31,19 @@ class GetProductSchema(CreateProductSchema):
 
 class ProductResponse(BaseModel):
     products: List[GetProductSchema]
+    next_cursor: str | None = None
+
+
+class BulkCreatedProduct(BaseModel):
+    index: int
+    id: int
+
+
+class BulkProductError(BaseModel):
+    index: int
+    errors: List[Any]
+
+
+class BulkCreateProductResponse(BaseModel):
+    created: List[BulkCreatedProduct]
+    errors: List[BulkProductError]
@@ -0,0 +1,36 @@
+"""
+Запуск Product несколькими воркерами gunicorn.
+
+Приложение импортируется в мастер-процессе и прогревается до fork
+(warm_up): воркеры наследуют настройки, маршруты и схему OpenAPI.
+Движок БД процесса сбрасывает пул после fork без закрытия соединений
+мастера (product_repository.engine).
+
+Кэш продуктов хранится в памяти каждого воркера и не видит записей
+других воркеров, поэтому при нескольких воркерах он выключается
+(PRODUCT_CACHE_ENABLED=False). Явное PRODUCT_CACHE_ENABLED=True включает
+его, допуская устаревшие ответы и ETag до PRODUCT_CACHE_TTL секунд.
+
+Запуск: gunicorn -c python:product.web.gunicorn_conf
+Число воркеров - WEB_CONCURRENCY, адрес - BIND.
+"""
+
+import os
+
+from common.workers import default_bind, default_workers
+
+wsgi_app = "product.web.main:app"
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = default_bind()
+workers = default_workers()
+preload_app = True
+
+# Конфигурация читается до загрузки приложения в мастер-процессе
+if workers > 1:
+    os.environ.setdefault("PRODUCT_CACHE_ENABLED", "False")
+
+
+def when_ready(server):
+    from product.web.main import warm_up
+
+    warm_up()
@@ -1,20 +1,44 @@
-from pathlib import Path
+from contextlib import asynccontextmanager
 
-import yaml
 from fastapi import FastAPI
 
+from common.instrumentation import ASGIInstrumentation
+from product.product_repository.engine import dispose_engine
 from product.settings.app_settings import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    dispose_engine()
+    if settings.PRODUCT_ASYNC_DB:
+        # Асинхронный стек SQLAlchemy загружается только в этом режиме
+        from product.product_repository.async_unit_of_work import (
+            dispose_async_engine,
+        )
+
+        await dispose_async_engine()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=True,
     openapi_url="/openapi/products.json",
     docs_url="/docs/product",
+    lifespan=lifespan,
 )
+app.add_middleware(ASGIInstrumentation, service="product")
+
+
+def warm_up() -> None:
+    """
+    Прогрев мастер-процесса перед fork воркеров: настройки и маршруты уже
+    загружены импортом, схема OpenAPI строится один раз и наследуется
+    воркерами. Соединения мастера закрываются, воркеры открывают свои.
+    """
+    app.openapi()
+    dispose_engine()
 
 
-# oas_doc = yaml.safe_load((Path(__file__).payrent / "../openapi.yaml").read_text())
-#
-# app.openapi = lambda: oas_doc
 from product.web.api import api
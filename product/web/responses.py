@@ -0,0 +1,46 @@
+"""
+Быстрый JSON-ответ для доверенных данных репозитория.
+
+FastJSONResponse кодирует содержимое через orjson, а без него через
+стандартный json. Ответ не проходит повторную валидацию response_model,
+поэтому используется только для данных, уже приведенных к схеме ответа.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_stdlib(content: Any) -> bytes:
+    """Запасной кодировщик на стандартном json."""
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def dumps(content: Any) -> bytes:
+    """Кодирует content в JSON, Decimal как строку, даты в ISO 8601."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return dumps_stdlib(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)